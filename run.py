@@ -2,8 +2,13 @@
 Entry point for the automated trading system.
 """
 import asyncio
-from trading_system.run import run
+import time
 
 if __name__ == '__main__':
+    # Wall-clock time of importing the trading system, reported at startup
+    # (torch/stable_baselines3 are deferred until the models load)
+    start = time.perf_counter()
+    from trading_system.run import run
+    import_sec = time.perf_counter() - start
     # Launch the trading system event loop
-    asyncio.run(run())
\ No newline at end of file
+    asyncio.run(run(import_sec=import_sec))
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-tick AlphaModel latency across model variants and inference modes.
+
+Feeds the same synthetic (or historical) feature stream through AlphaModel
+for each variant (float eager state_dict, frozen TorchScript, int8
+dynamically quantized TorchScript) in windowed and streaming mode, and
+reports per-tick latency percentiles plus the largest probability
+difference from the float eager windowed model.
+
+Usage:
+    python scripts/benchmark_alpha_inference.py --ticks 5000
+    python scripts/benchmark_alpha_inference.py --model-path models/alpha_model.pth --data-path historical_data.csv
+    python scripts/benchmark_alpha_inference.py --variants eager,int8 --modes windowed
+"""
+import os
+import sys
+import time
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import argparse
+
+import numpy as np
+import pandas as pd
+import torch
+
+from trading_system.config import Config
+from trading_system.feature_engineering import FeatureEngineer
+from trading_system.alpha_model import AlphaModel, LSTMAlphaNet, export_torchscript
+
+
+def synthetic_ticks(n, seed=0):
+    """
+    Random-walk ES-like ticks for benchmarking without historical data.
+    """
+    rng = np.random.default_rng(seed)
+    mid = 4400 + np.cumsum(rng.choice([-0.25, 0.0, 0.25], size=n))
+    return pd.DataFrame({
+        'timestamp': np.arange(n, dtype=float),
+        'best_bid': mid - 0.125,
+        'best_ask': mid + 0.125,
+        'bid_size': rng.integers(1, 20, size=n),
+        'ask_size': rng.integers(1, 20, size=n),
+        'last_price': mid,
+    })
+
+
+def time_predictions(model, feature_dicts):
+    """
+    Returns (latencies in microseconds, probabilities) for each tick.
+    """
+    latencies = np.empty(len(feature_dicts))
+    probas = np.empty(len(feature_dicts))
+    for i, features in enumerate(feature_dicts):
+        start = time.perf_counter()
+        probas[i] = model.predict(features)
+        latencies[i] = (time.perf_counter() - start) * 1e6
+    return latencies, probas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark AlphaModel per-tick inference latency.")
+    parser.add_argument('--model-path', type=str, default=None,
+                        help="Trained alpha model (.pth). A randomly initialized model is used if omitted.")
+    parser.add_argument('--data-path', type=str, default=None,
+                        help="Historical tick CSV. Synthetic ticks are used if omitted.")
+    parser.add_argument('--ticks', type=int, default=5000,
+                        help="Number of ticks to replay.")
+    parser.add_argument('--resync-interval', type=int, default=None,
+                        help="Streaming re-sync interval in ticks (default: config value).")
+    parser.add_argument('--threads', type=int, default=1,
+                        help="torch intra-op threads.")
+    parser.add_argument('--variants', type=str, default='eager,torchscript,int8',
+                        help="Comma-separated model variants: eager, torchscript, int8.")
+    parser.add_argument('--modes', type=str, default='windowed,streaming',
+                        help="Comma-separated inference modes: windowed, streaming.")
+    args = parser.parse_args()
+
+    torch.set_num_threads(args.threads)
+    config = Config()
+    if args.resync_interval is not None:
+        config.alpha_resync_interval = args.resync_interval
+
+    net = LSTMAlphaNet(len(AlphaModel.FEATURE_NAMES), config.hidden_size, config.num_layers)
+    if args.model_path is not None:
+        net.load_state_dict(torch.load(args.model_path, map_location=torch.device('cpu')))
+    # Write every variant to a scratch directory so AlphaModel loads it as in production
+    tmp_dir = tempfile.mkdtemp()
+    artifacts = {'eager': ('state_dict', os.path.join(tmp_dir, 'alpha_model.pth'))}
+    torch.save(net.state_dict(), artifacts['eager'][1])
+    variants = args.variants.split(',')
+    if 'torchscript' in variants:
+        artifacts['torchscript'] = ('torchscript', os.path.join(tmp_dir, 'alpha_model.ts.pt'))
+        export_torchscript(net, artifacts['torchscript'][1])
+    if 'int8' in variants:
+        artifacts['int8'] = ('torchscript', os.path.join(tmp_dir, 'alpha_model.int8.pt'))
+        export_torchscript(net, artifacts['int8'][1], quantize=True)
+
+    df = pd.read_csv(args.data_path).head(args.ticks) if args.data_path else synthetic_ticks(args.ticks)
+    features = FeatureEngineer(config).compute_features_batch(df)
+    matrix = np.column_stack([features[name] for name in AlphaModel.FEATURE_NAMES])
+    feature_dicts = [dict(zip(AlphaModel.FEATURE_NAMES, row)) for row in matrix.tolist()]
+    warm = config.sequence_length - 1
+
+    # Float eager windowed inference is the accuracy reference
+    config.alpha_model_format, config.alpha_model_path = artifacts['eager']
+    config.alpha_streaming = False
+    reference = time_predictions(AlphaModel(config), feature_dicts)[1][warm:]
+
+    results = {}
+    for variant in variants:
+        config.alpha_model_format, config.alpha_model_path = artifacts[variant]
+        for mode in args.modes.split(','):
+            config.alpha_streaming = mode == 'streaming'
+            latencies, probas = time_predictions(AlphaModel(config), feature_dicts)
+            results[f'{variant}/{mode}'] = (latencies[warm:], np.abs(probas[warm:] - reference).max())
+
+    baseline = results.get('eager/windowed', next(iter(results.values())))[0].mean()
+    print(f"{'variant/mode':<22} {'mean_us':>9} {'p50_us':>9} {'p99_us':>9} {'max_us':>9} {'speedup':>8} {'max_drift':>10}")
+    for name, (latencies, drift) in results.items():
+        print(f"{name:<22} {latencies.mean():9.1f} {np.percentile(latencies, 50):9.1f} "
+              f"{np.percentile(latencies, 99):9.1f} {latencies.max():9.1f} "
+              f"{baseline / latencies.mean():7.1f}x {drift:10.5f}")
+    print(f"max_drift: largest |p - p_eager_windowed| over the run "
+          f"(streaming tolerance {config.alpha_streaming_tolerance}, resync every {config.alpha_resync_interval} ticks)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-call latency of DQN.predict against the NumPy Q-network path.
+
+Loads a trained DQN (or creates a randomly initialized one with the
+decision model's state size), runs both on the same random states, and
+reports latency percentiles, the speedup and any action mismatches.
+
+Usage:
+    python scripts/benchmark_rl_inference.py --calls 20000
+    python scripts/benchmark_rl_inference.py --model-path models/rl_model.zip
+"""
+import os
+import sys
+import time
+import tempfile
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import argparse
+
+import numpy as np
+import torch
+
+from trading_system.config import Config
+from trading_system.feature_engineering import FEATURE_NAMES
+from trading_system.q_network import load_dqn_policy
+
+
+def random_dqn(path, state_size):
+    """
+    Saves an untrained DQN with a flat Box(state_size) observation to path.
+    """
+    import gymnasium as gym
+    from stable_baselines3 import DQN
+
+    class FlatEnv(gym.Env):
+        observation_space = gym.spaces.Box(-np.inf, np.inf, (state_size,), np.float32)
+        action_space = gym.spaces.Discrete(3)
+
+        def reset(self, seed=None, options=None):
+            return np.zeros(state_size, np.float32), {}
+
+        def step(self, action):
+            return np.zeros(state_size, np.float32), 0.0, False, False, {}
+
+    DQN('MlpPolicy', FlatEnv(), seed=0).save(path)
+
+
+def time_predictions(model, states):
+    """
+    Returns (latencies in microseconds, actions) for each state.
+    """
+    latencies = np.empty(len(states))
+    actions = np.empty(len(states), dtype=np.int64)
+    for i, state in enumerate(states):
+        start = time.perf_counter()
+        action, _ = model.predict(state, deterministic=True)
+        latencies[i] = (time.perf_counter() - start) * 1e6
+        actions[i] = int(action)
+    return latencies, actions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark RL decision model inference latency.")
+    parser.add_argument('--model-path', type=str, default=None,
+                        help="Trained DQN (.zip). A randomly initialized model is used if omitted.")
+    parser.add_argument('--calls', type=int, default=20000,
+                        help="Number of predictions per backend.")
+    parser.add_argument('--threads', type=int, default=1,
+                        help="torch intra-op threads for the SB3 backend.")
+    args = parser.parse_args()
+
+    torch.set_num_threads(args.threads)
+    config = Config()
+    model_path = args.model_path
+    if model_path is None:
+        model_path = os.path.join(tempfile.mkdtemp(), 'rl_model.zip')
+        random_dqn(model_path, config.rl_window_size * len(FEATURE_NAMES))
+
+    models = {backend: load_dqn_policy(model_path, backend) for backend in ('sb3', 'numpy')}
+    state_size = models['numpy'].input.size
+    states = np.random.default_rng(0).normal(size=(args.calls, state_size)).astype(np.float32)
+
+    results = {}
+    for backend, model in models.items():
+        # Warm up first-call overheads before timing
+        time_predictions(model, states[:100])
+        results[backend] = time_predictions(model, states)
+
+    mismatches = int((results['numpy'][1] != results['sb3'][1]).sum())
+    baseline = results['sb3'][0].mean()
+    print(f"{'backend':<8} {'mean_us':>9} {'p50_us':>9} {'p99_us':>9} {'max_us':>9} {'speedup':>8}")
+    for backend, (latencies, _) in results.items():
+        print(f"{backend:<8} {latencies.mean():9.1f} {np.percentile(latencies, 50):9.1f} "
+              f"{np.percentile(latencies, 99):9.1f} {latencies.max():9.1f} {baseline / latencies.mean():7.1f}x")
+    print(f"state size {state_size}, {args.calls} calls, action mismatches: {mismatches}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark ZmqDataIngestion throughput over a local TCP socket.
+
+Publishes synthetic binary ticks from a thread as fast as possible and
+reports how many ticks per second the ingestion receives, decodes and
+hands to a no-op callback, plus its batching counters.
+
+Usage:
+    python scripts/benchmark_zmq_ingestion.py --ticks 100000
+    python scripts/benchmark_zmq_ingestion.py --ticks 1000000 --batch 10
+"""
+import os
+import sys
+import time
+import threading
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import argparse
+import asyncio
+
+import zmq
+
+from trading_system.data_ingestion import ZmqDataIngestion
+from trading_system.tick_format import TICK_SIZE
+from publish_ticks import pack_records, synthetic_ticks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ZeroMQ tick ingestion throughput.")
+    parser.add_argument('--ticks', type=int, default=100_000,
+                        help="Number of ticks to publish.")
+    parser.add_argument('--batch', type=int, default=1,
+                        help="Ticks per message.")
+    parser.add_argument('--max-batch', type=int, default=1024,
+                        help="Messages drained per wakeup (config.zmq_max_batch).")
+    args = parser.parse_args()
+
+    payload = pack_records(synthetic_ticks(args.ticks, seed=0))
+    step = args.batch * TICK_SIZE
+    messages = [payload[lo:lo + step] for lo in range(0, len(payload), step)]
+
+    context = zmq.Context.instance()
+    pub = context.socket(zmq.XPUB)
+    pub.setsockopt(zmq.SNDHWM, 0)
+    port = pub.bind_to_random_port('tcp://127.0.0.1')
+
+    def publish():
+        pub.recv()  # wait for the subscription
+        for message in messages:
+            pub.send(message)
+
+    class BenchConfig:
+        zmq_endpoint = f'tcp://127.0.0.1:{port}'
+        zmq_max_batch = args.max_batch
+
+    ingestion = ZmqDataIngestion(BenchConfig())
+    timing = {'received': 0}
+
+    async def on_tick(tick):
+        timing['received'] += 1
+        if timing['received'] == args.ticks:
+            timing['end'] = time.perf_counter()
+            ingestion.stop()
+
+    publisher = threading.Thread(target=publish)
+    publisher.start()
+    ingestion.connect()
+    timing['start'] = time.perf_counter()
+    asyncio.run(asyncio.wait_for(ingestion.start(on_tick), timeout=600))
+    publisher.join()
+    pub.close(linger=0)
+
+    elapsed = timing['end'] - timing['start']
+    print(f"Received {ingestion.ticks} ticks in {ingestion.messages} messages over {elapsed:.2f}s "
+          f"({ingestion.ticks / elapsed:,.0f} ticks/sec)")
+    print(f"Batches: {ingestion.batches}, largest {ingestion.max_batch_seen} ticks, "
+          f"malformed frames {ingestion.bad_frames}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Offline order throughput load test against the simulated broker.
+
+Submits market orders through OrderGateway to a SimulatedBroker while a
+synthetic price feed ticks, keeping up to --max-open orders working, and
+reports submission throughput, the time submit() blocks the caller, and
+submit-to-fill latency.
+
+Usage:
+    python scripts/load_test_orders.py --orders 50000
+    python scripts/load_test_orders.py --orders 10000 --latency 0.02 --slippage 0.25 --partial-fill-units 1
+"""
+import os
+import sys
+import logging
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import argparse
+import asyncio
+import time
+
+import numpy as np
+
+from trading_system.latency import LatencyHistogram
+from trading_system.order_gateway import Contract, OrderGateway, SimulatedBroker
+
+
+async def load_test(args):
+    broker = SimulatedBroker(latency=args.latency, slippage=args.slippage,
+                             partial_fill_units=args.partial_fill_units)
+    gateway = OrderGateway(broker, Contract('ES'))
+    slot_free = asyncio.Event()
+    gateway.on_done = lambda trade: slot_free.set()
+    rng = np.random.default_rng(args.seed)
+    prices = (4400 + np.cumsum(rng.choice([-0.25, 0.0, 0.25], args.orders))).tolist()
+    submit_ns = LatencyHistogram()
+    clock = time.perf_counter_ns
+    interval = 1.0 / args.rate if args.rate > 0 else 0.0
+    start = time.perf_counter()
+    for i in range(args.orders):
+        gateway.update_market({'last_price': prices[i], 'timestamp': float(i)})
+        while len(gateway.open_orders()) >= args.max_open:
+            slot_free.clear()
+            await slot_free.wait()
+        t0 = clock()
+        gateway.submit('BUY' if i % 2 == 0 else 'SELL', args.quantity)
+        submit_ns.record(clock() - t0)
+        if interval:
+            await asyncio.sleep(interval)
+        elif i % 100 == 99:
+            # Let acknowledgements and fills be delivered
+            await asyncio.sleep(0)
+    submitted = time.perf_counter() - start
+    while gateway.open_orders():
+        slot_free.clear()
+        await slot_free.wait()
+    elapsed = time.perf_counter() - start
+    return gateway, submit_ns, submitted, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test order submission against the simulated broker.")
+    parser.add_argument('--orders', type=int, default=50000,
+                        help="Number of orders to submit.")
+    parser.add_argument('--quantity', type=int, default=1,
+                        help="Units per order.")
+    parser.add_argument('--rate', type=float, default=0.0,
+                        help="Orders per second (0 = as fast as possible).")
+    parser.add_argument('--max-open', type=int, default=1000,
+                        help="Maximum working orders before submission waits.")
+    parser.add_argument('--latency', type=float, default=0.005,
+                        help="Simulated seconds from submission to fill.")
+    parser.add_argument('--slippage', type=float, default=0.0,
+                        help="Simulated adverse slippage in price points.")
+    parser.add_argument('--partial-fill-units', type=int, default=None,
+                        help="Units per simulated partial fill (default: fill at once).")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="Random seed for the price feed.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
+    gateway, submit_ns, submitted, elapsed = asyncio.run(load_test(args))
+    stats = gateway.stats()
+    submit = submit_ns.summary()
+    logging.info(f"Submitted {args.orders} orders in {submitted:.2f}s ({args.orders / submitted:.0f} orders/sec), "
+                 f"all filled after {elapsed:.2f}s")
+    logging.info(f"submit() blocking: p50 {submit['p50'] / 1e3:.1f}us, p99 {submit['p99'] / 1e3:.1f}us")
+    logging.info(f"Fill latency: p50 {stats['fill_latency_p50_ms']:.2f}ms, p99 {stats['fill_latency_p99_ms']:.2f}ms "
+                 f"(simulated {args.latency * 1e3:.1f}ms)")
+    logging.info(f"Orders filled {stats['filled']}, cancelled {stats['cancelled']}, fills {stats['fills']}, "
+                 f"net position {stats['position']}")
+
+
+if __name__ == '__main__':
+    main()
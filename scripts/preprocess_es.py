@@ -6,11 +6,29 @@ Reads an input CSV with columns like Date, Time, Open, High, Low, Last, Volume,
 and outputs a CSV with columns:
     timestamp,best_bid,best_ask,bid_size,ask_size,last_price
 
+Optionally also writes the same columns as a columnar tick store (one .npy
+file per column, partitioned by trading date, plus a manifest) that the
+training scripts and backtester can memory-map directly. A trading date's
+session opens at --session-open-hour (17, the ES Globex open in CT, by
+default; give the hour in the time zone of the raw Date/Time columns) on
+the previous evening.
+
+The input is streamed in chunks of --chunk-mb megabytes, so memory use
+does not grow with the file size; --workers converts chunks in parallel
+while keeping the output in file order.
+
 Usage:
     python scripts/preprocess_es.py --input es.csv --output historical_data.csv
+    python scripts/preprocess_es.py --input es.csv --output historical_data.csv --store-dir data/es_store
+    python scripts/preprocess_es.py --input es.csv --output historical_data.csv --workers 8
 """
+import os
+import sys
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import argparse
-import pandas as pd
+
+from trading_system.preprocess import preprocess_file
+from trading_system.tick_store import SESSION_OPEN_HOUR
 
 def main():
     parser = argparse.ArgumentParser(description="Preprocess ES CSV to standard training format.")
@@ -26,41 +44,44 @@ def main():
         default="historical_data.csv",
         help="Path to the output processed CSV file"
     )
+    parser.add_argument(
+        "--store-dir",
+        type=str,
+        default=None,
+        help="Also write a date-partitioned columnar tick store to this directory"
+    )
+    parser.add_argument(
+        "--session-open-hour",
+        type=int,
+        default=SESSION_OPEN_HOUR,
+        help="Hour the session of the next trading date opens (0 partitions by calendar date)"
+    )
+    parser.add_argument(
+        "--chunk-mb",
+        type=int,
+        default=64,
+        help="Size of the raw input chunks processed at a time, in megabytes"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes converting chunks in parallel"
+    )
     args = parser.parse_args()
 
-    # Load raw data
-    df = pd.read_csv(args.input)
-    # Strip whitespace from column names
-    df.columns = df.columns.str.strip()
-
-    # Combine Date and Time into a timestamp (seconds since epoch)
-    if "Date" not in df.columns or "Time" not in df.columns:
-        raise KeyError("Input CSV must contain 'Date' and 'Time' columns")
-    dt = pd.to_datetime(df["Date"].astype(str) + " " + df["Time"].astype(str),
-                        format="%Y/%m/%d %H:%M:%S")
-    # Convert to Unix timestamp in seconds
-    df["timestamp"] = dt.astype("int64") / 1e9
-
-    # Rename columns to match training script expectations
-    rename_map = {
-        "Low": "best_bid",
-        "High": "best_ask",
-        "BidVolume": "bid_size",
-        "AskVolume": "ask_size",
-        "Last": "last_price",
-    }
-    for src, dst in rename_map.items():
-        if src not in df.columns:
-            raise KeyError(f"Expected column '{src}' not found in input CSV")
-    df = df.rename(columns=rename_map)
-
-    # Select and reorder columns
-    out_cols = ["timestamp", "best_bid", "best_ask", "bid_size", "ask_size", "last_price"]
-    processed = df[out_cols].copy()
-
-    # Save processed data
-    processed.to_csv(args.output, index=False)
+    stats = preprocess_file(
+        args.input,
+        output_path=args.output,
+        store_dir=args.store_dir,
+        chunk_bytes=args.chunk_mb << 20,
+        workers=args.workers,
+        session_open_hour=args.session_open_hour,
+    )
     print(f"Processed data saved to {args.output}")
+    if args.store_dir:
+        print(f"Tick store with {stats['partitions']} daily partitions saved to {args.store_dir}")
+    print(f"Processed {stats['rows']} rows in {stats['elapsed_sec']:.2f}s ({stats['rows_per_sec']:.0f} rows/sec)")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Local stand-in market data feed: publishes binary ticks on a ZeroMQ PUB socket.
+
+Replays historical ticks (CSV file or tick store) or, without --data-path,
+a synthetic random walk. Publishing starts once a subscriber has connected.
+With --symbols, every message is prefixed with its symbol's topic and each
+symbol gets its own stream (an independent random walk when synthetic).
+
+Usage:
+    python scripts/publish_ticks.py --endpoint tcp://127.0.0.1:5556 --rate 1000
+    python scripts/publish_ticks.py --data-path historical_data.csv --rate 0
+    python scripts/publish_ticks.py --symbols ES,NQ,RTY,YM --rate 1000
+"""
+import os
+import sys
+import logging
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import argparse
+import time
+
+import numpy as np
+import zmq
+
+from trading_system.tick_format import TICK_FIELDS, TICK_STRUCT, symbol_topic
+
+
+def synthetic_ticks(count, seed=None):
+    """
+    Random-walk ES-like ticks as a dict of column arrays.
+    """
+    rng = np.random.default_rng(seed)
+    mid = 4400 + np.cumsum(rng.choice([-0.25, 0.0, 0.25], count))
+    return {
+        'timestamp': time.time() + np.arange(count) * 1e-3,
+        'best_bid': mid - 0.125,
+        'best_ask': mid + 0.125,
+        'bid_size': rng.integers(1, 50, count),
+        'ask_size': rng.integers(1, 50, count),
+        'last_price': mid + rng.choice([-0.125, 0.125], count),
+        'last_size': rng.integers(1, 20, count),
+    }
+
+
+def pack_records(columns):
+    """
+    Encodes column arrays into one bytes object of back-to-back tick records.
+    """
+    count = len(columns['timestamp'])
+    dtype = np.dtype([
+        ('timestamp', '<f8'), ('best_bid', '<f8'), ('best_ask', '<f8'), ('bid_size', '<u4'),
+        ('ask_size', '<u4'), ('last_price', '<f8'), ('last_size', '<u4'),
+    ])
+    assert dtype.itemsize == TICK_STRUCT.size
+    records = np.zeros(count, dtype=dtype)
+    for name in TICK_FIELDS:
+        if name in columns:
+            records[name] = columns[name]
+    return records.tobytes()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publish binary ticks on a ZeroMQ PUB socket.")
+    parser.add_argument('--endpoint', type=str, default='tcp://127.0.0.1:5556',
+                        help="Endpoint to bind the publisher to.")
+    parser.add_argument('--data-path', type=str, default=None,
+                        help="Historical ticks to replay (CSV file or tick store directory).")
+    parser.add_argument('--start-date', type=str, default=None,
+                        help="First trading date to replay (YYYY-MM-DD, inclusive).")
+    parser.add_argument('--end-date', type=str, default=None,
+                        help="Last trading date to replay (YYYY-MM-DD, inclusive).")
+    parser.add_argument('--count', type=int, default=1_000_000,
+                        help="Number of synthetic ticks when no --data-path is given.")
+    parser.add_argument('--rate', type=float, default=1000.0,
+                        help="Ticks per second (0 = as fast as possible).")
+    parser.add_argument('--batch', type=int, default=1,
+                        help="Ticks per message.")
+    parser.add_argument('--topic', type=str, default='',
+                        help="Topic prefix prepended to every message.")
+    parser.add_argument('--symbols', type=str, default=None,
+                        help="Comma-separated symbols to publish as separate topic-prefixed streams.")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="Random seed for synthetic ticks.")
+    parser.add_argument('-v', '--verbose', action='store_true', default=False,
+                        help="Enable verbose logging")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(asctime)s %(levelname)s: %(message)s')
+    if args.data_path:
+        from trading_system.backtest import load_ticks
+        columns = load_ticks(args.data_path, args.start_date, args.end_date)
+    else:
+        columns = synthetic_ticks(args.count, args.seed)
+    count = len(columns['timestamp'])
+    # (topic, payload) per stream; one untagged stream without --symbols
+    if args.symbols:
+        streams = []
+        for i, symbol in enumerate(args.symbols.split(',')):
+            if not args.data_path:
+                seed = None if args.seed is None else args.seed + i
+                columns = synthetic_ticks(args.count, seed)
+            streams.append((symbol_topic(symbol), pack_records(columns)))
+    else:
+        streams = [(args.topic.encode(), pack_records(columns))]
+
+    context = zmq.Context.instance()
+    # XPUB behaves like PUB but reports subscriptions, so we can wait for one
+    socket = context.socket(zmq.XPUB)
+    socket.setsockopt(zmq.SNDHWM, 0)
+    socket.bind(args.endpoint)
+    logging.info(f"Waiting for a subscriber on {args.endpoint}...")
+    socket.recv()
+
+    logging.info(f"Publishing {count} ticks x {len(streams)} streams ({args.batch} per message)...")
+    size = TICK_STRUCT.size
+    interval = args.batch / args.rate if args.rate > 0 else 0.0
+    start = time.perf_counter()
+    next_send = start
+    for lo in range(0, count, args.batch):
+        if interval:
+            delay = next_send - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            next_send += interval
+        for topic, payload in streams:
+            socket.send(topic + payload[lo * size:min(lo + args.batch, count) * size])
+    elapsed = time.perf_counter() - start
+    total = count * len(streams)
+    logging.info(f"Published {total} ticks in {elapsed:.2f}s ({total / elapsed:.0f} ticks/sec)")
+    # Give queued messages time to flush before closing
+    socket.close(linger=5000)
+    context.term()
+
+
+if __name__ == '__main__':
+    main()
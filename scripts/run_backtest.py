@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Replay historical ticks through the live trading pipeline.
+
+Streams a processed tick file (CSV or .npy structured array) through
+FeatureEngineer -> AlphaModel -> DecisionModel/PositionModel -> ExecutionModule
+without sleeping between ticks, writes a fill/PnL ledger and prints summary
+statistics and replay throughput.
+
+Usage:
+    python scripts/run_backtest.py --data-path historical_data.csv --ledger-path ledger.csv
+"""
+import os
+import sys
+import asyncio
+import logging
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import argparse
+
+from trading_system.config import Config
+from trading_system.backtest import Backtester, load_ticks, iter_ticks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay historical ticks through the trading pipeline.")
+    parser.add_argument('--data-path', type=str, required=True,
+                        help="Path to historical tick data (CSV, .npy or tick store directory).")
+    parser.add_argument('--start-date', type=str, default=None,
+                        help="First trading date to replay (YYYY-MM-DD, inclusive).")
+    parser.add_argument('--end-date', type=str, default=None,
+                        help="Last trading date to replay (YYYY-MM-DD, inclusive).")
+    parser.add_argument('--ledger-path', type=str, default='backtest_ledger.csv',
+                        help="Output path for the fill/PnL ledger CSV.")
+    parser.add_argument('--model-path', type=str, default=None,
+                        help="Alpha model path (defaults to config.alpha_model_path).")
+    parser.add_argument('--streaming', action='store_true', default=False,
+                        help="Use streaming (stateful) alpha inference for faster replay.")
+    parser.add_argument('--show-fills', action='store_true', default=False,
+                        help="Print each fill as it happens (slower).")
+    parser.add_argument('--journal-dir', type=str, default=None,
+                        help="Write a binary journal of every decision and fill to this directory.")
+    parser.add_argument('--latency-path', type=str, default=None,
+                        help="Time each pipeline stage and write latency percentiles to this file "
+                             "(.json for JSON, otherwise Prometheus text format).")
+    parser.add_argument('--rolling-features', type=str, default=None,
+                        help="Comma-separated rolling features the alpha model was trained with.")
+    parser.add_argument('-v', '--verbose', action='store_true', default=False,
+                        help="Enable verbose logging")
+    args = parser.parse_args()
+
+    config = Config()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(asctime)s %(levelname)s: %(message)s')
+    if args.model_path:
+        config.alpha_model_path = args.model_path
+    if args.streaming:
+        config.alpha_streaming = True
+    if args.latency_path:
+        config.latency_tracking = True
+        config.latency_snapshot_path = args.latency_path
+    config.print_fills = args.show_fills
+    if args.journal_dir:
+        config.journal_dir = args.journal_dir
+    if args.rolling_features:
+        config.rolling_features = args.rolling_features.split(',')
+
+    columns = load_ticks(args.data_path, args.start_date, args.end_date, config.session_open_hour)
+    logging.info(f"Loaded {len(columns['timestamp'])} ticks from {args.data_path}")
+    backtester = Backtester(config)
+
+    summary = asyncio.run(backtester.run(iter_ticks(columns)))
+    backtester.pipeline.close()
+
+    backtester.write_ledger(args.ledger_path)
+    logging.info(f"Ledger written to {args.ledger_path}")
+    for key, value in summary.items():
+        logging.info(f"{key}: {value:.4f}" if isinstance(value, float) else f"{key}: {value}")
+    if args.latency_path:
+        latency = backtester.pipeline.latency
+        latency.write_snapshot(args.latency_path)
+        for stage, stats in latency.snapshot().items():
+            if stats['count']:
+                logging.info(
+                    f"latency {stage}: p50 {stats['p50'] / 1e3:.1f}us, p99 {stats['p99'] / 1e3:.1f}us, "
+                    f"p99.9 {stats['p999'] / 1e3:.1f}us, max {stats['max'] / 1e3:.1f}us"
+                )
+        logging.info(f"Latency snapshot written to {args.latency_path}")
+    if args.journal_dir:
+        logging.info(f"Journal written to {args.journal_dir} ({backtester.pipeline.journal.stats()['records']} records)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Sweep decision and execution thresholds over historical data on all cores.
+
+Features and alpha predictions are computed once; each parameter set is then
+evaluated with the vectorized execution simulator in a process pool that
+reads the arrays from shared memory. Results are ranked by Sharpe ratio.
+
+Usage:
+    python scripts/sweep_params.py --data-path historical_data.csv \\
+        --grid alpha_threshold_up=0.55,0.6,0.65 --grid profit_target=0.25,0.5,1.0
+    python scripts/sweep_params.py --data-path historical_data.csv --random 500 \\
+        --range profit_target=0.25:2.0 --range max_positions=1:3 --grid stop_loss=none,0.25,0.5
+"""
+import os
+import sys
+import logging
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import argparse
+
+import pandas as pd
+
+from trading_system.config import Config
+from trading_system.tick_store import load_tick_frame
+from trading_system.sweep import SWEEP_PARAMS, precompute_market, parameter_grid, random_search, run_sweep
+
+
+def parse_value(text):
+    text = text.strip()
+    if text.lower() == 'none':
+        return None
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def parse_assignments(items, parse):
+    space = {}
+    for item in items or []:
+        name, _, values = item.partition('=')
+        if name not in SWEEP_PARAMS:
+            raise SystemExit(f"Unknown sweep parameter '{name}'; choose from {SWEEP_PARAMS}")
+        space[name] = parse(values)
+    return space
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parallel parameter sweep over Config thresholds.")
+    parser.add_argument('--data-path', type=str, required=True,
+                        help="Path to historical tick data (CSV file or tick store directory).")
+    parser.add_argument('--start-date', type=str, default=None,
+                        help="First trading date to use (YYYY-MM-DD, inclusive).")
+    parser.add_argument('--end-date', type=str, default=None,
+                        help="Last trading date to use (YYYY-MM-DD, inclusive).")
+    parser.add_argument('--model-path', type=str, default=None,
+                        help="Alpha model path (defaults to config.alpha_model_path).")
+    parser.add_argument('--grid', action='append',
+                        help="name=v1,v2,... values to combine (repeatable).")
+    parser.add_argument('--range', action='append',
+                        help="name=low:high range for random search (repeatable).")
+    parser.add_argument('--random', type=int, default=0,
+                        help="Number of random samples; 0 evaluates the full grid.")
+    parser.add_argument('--seed', type=int, default=0, help="Random search seed.")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes (default: all cores).")
+    parser.add_argument('--output', type=str, default='sweep_results.csv',
+                        help="Output path for the ranked results table.")
+    parser.add_argument('--top', type=int, default=10, help="Rows of the ranking to print.")
+    parser.add_argument('-v', '--verbose', action='store_true', default=False,
+                        help="Enable verbose logging")
+    args = parser.parse_args()
+
+    config = Config()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
+                        format='%(asctime)s %(levelname)s: %(message)s')
+    if args.model_path:
+        config.alpha_model_path = args.model_path
+
+    grid = parse_assignments(args.grid, lambda values: [parse_value(v) for v in values.split(',')])
+    ranges = parse_assignments(args.range, lambda values: tuple(parse_value(v) for v in values.split(':')))
+    if args.random:
+        param_sets = random_search({**grid, **ranges}, args.random, seed=args.seed)
+    else:
+        if ranges:
+            raise SystemExit("--range requires --random")
+        param_sets = parameter_grid(grid)
+    if not param_sets or not param_sets[0]:
+        raise SystemExit("Nothing to sweep: pass --grid and/or --random with --range")
+
+    df = load_tick_frame(args.data_path, args.start_date, args.end_date,
+                         session_open_hour=config.session_open_hour)
+    df = df.sort_values(by='timestamp').reset_index(drop=True)
+    logging.info(f"Precomputing features and alpha predictions for {len(df)} ticks...")
+    arrays = precompute_market(df, config)
+
+    logging.info(f"Evaluating {len(param_sets)} parameter sets...")
+    results = run_sweep(arrays, param_sets, workers=args.workers)
+    results.to_csv(args.output, index=False)
+    logging.info(f"Sweep finished in {results.attrs['elapsed_sec']:.2f}s "
+                 f"({results.attrs['evals_per_sec']:.1f} evaluations/sec); results saved to {args.output}")
+    with pd.option_context('display.width', 200, 'display.max_columns', None):
+        print(results.head(args.top).to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -8,27 +8,68 @@ import sys
 import logging
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import argparse
+import time
 
-import pandas as pd
 import torch
 import torch.nn as nn
-from torch.utils.data import DataLoader, TensorDataset
+from torch.utils.data import DataLoader
 
 from trading_system.config import Config
-from trading_system.feature_engineering import FeatureEngineer
-from trading_system.alpha_model import LSTMAlphaNet, AlphaModel
+from trading_system.feature_cache import alpha_training_arrays, open_feature_cache
+from trading_system.feature_engineering import feature_names
+from trading_system.alpha_model import LSTMAlphaNet, export_torchscript, save_feature_spec
+from trading_system.streaming_dataset import ShardedWindowDataset
+from trading_system.training import (
+    EarlyStopping, MetricsLog, chronological_split, evaluate, load_checkpoint, rng_state, save_checkpoint,
+    set_rng_state,
+)
 
 def main():
     parser = argparse.ArgumentParser(description="Train alpha LSTM model.")
     parser.add_argument('--data-path', type=str, required=True,
-                        help="Path to historical tick data CSV file.")
+                        help="Path to historical tick data (CSV file or tick store directory).")
+    parser.add_argument('--start-date', type=str, default=None,
+                        help="First trading date to use (YYYY-MM-DD, inclusive).")
+    parser.add_argument('--end-date', type=str, default=None,
+                        help="Last trading date to use (YYYY-MM-DD, inclusive).")
     parser.add_argument('--model-output-path', type=str, default=None,
                         help="Output path for the trained model file.")
+    parser.add_argument('--export-torchscript', action='store_true', default=False,
+                        help="Also export a frozen TorchScript module (<model>.ts.pt).")
+    parser.add_argument('--quantize', action='store_true', default=False,
+                        help="Also export a dynamically int8-quantized TorchScript module (<model>.int8.pt).")
+    parser.add_argument('--no-cache', action='store_true', default=False,
+                        help="Recompute features and labels instead of using the feature cache.")
+    parser.add_argument('--rolling-features', type=str, default=None,
+                        help="Comma-separated rolling features to add to the model input "
+                             "(e.g. ema_gap,volatility,vwap_gap,ofi,realized_range).")
+    parser.add_argument('--num-workers', type=int, default=0,
+                        help="DataLoader worker processes streaming training batches.")
+    parser.add_argument('--shard-size', type=int, default=None,
+                        help="Windows per shuffled shard (default: config.train_shard_size).")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="Random seed for shard order, shuffling and model initialization.")
+    parser.add_argument('--num-epochs', type=int, default=None,
+                        help="Maximum number of epochs (default: config.num_epochs).")
+    parser.add_argument('--validation-fraction', type=float, default=None,
+                        help="Most recent fraction of windows held out for validation "
+                             "(default: config.validation_fraction; 0 disables early stopping).")
+    parser.add_argument('--patience', type=int, default=None,
+                        help="Epochs without validation improvement before stopping "
+                             "(default: config.early_stopping_patience).")
+    parser.add_argument('--checkpoint-path', type=str, default=None,
+                        help="Checkpoint file (default: <model>.ckpt).")
+    parser.add_argument('--resume', action='store_true', default=False,
+                        help="Continue training from the checkpoint.")
+    parser.add_argument('--metrics-path', type=str, default=None,
+                        help="JSON-lines file of per-epoch metrics (default: <model>.metrics.jsonl).")
     parser.add_argument('-v', '--verbose', action='store_true', default=False,
                         help="Enable verbose logging")
     args = parser.parse_args()
 
     config = Config()
+    if args.rolling_features:
+        config.rolling_features = args.rolling_features.split(',')
     logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO,
                         format='%(asctime)s %(levelname)s: %(message)s')
     logging.debug(f"Data path: {args.data_path}, Model output path: {args.model_output_path or config.alpha_model_path}")
@@ -36,43 +77,41 @@ def main():
     model_path = args.model_output_path or config.alpha_model_path
     os.makedirs(os.path.dirname(model_path), exist_ok=True)
 
-    # Load and sort historical data
-    df = pd.read_csv(args.data_path)
-    df = df.sort_values(by='timestamp').reset_index(drop=True)
+    # Features for all ticks at once and the label of each window, reused
+    # from the feature cache when the data and feature settings are unchanged
+    start = time.perf_counter()
+    names = feature_names(config)
+    cache = open_feature_cache(config, enabled=not args.no_cache)
+    feature_matrix, labels = alpha_training_arrays(config, args.data_path, args.start_date, args.end_date, cache)
+    logging.info(f"Features: {', '.join(names)} ({time.perf_counter() - start:.2f}s)")
 
-    # Compute features for each tick
-    fe = FeatureEngineer(config)
-    features_list = []
-    for _, row in df.iterrows():
-        tick = row.to_dict()
-        fe.update(tick)
-        features_list.append(fe.compute_features())
-
-    # Determine shift based on prediction horizon
-    n_shift = int(config.prediction_horizon / config.data_feed_interval)
+    # Chronological validation split: the most recent windows validate, and the
+    # windows whose labels look ahead into the validation period are dropped
     seq_len = config.sequence_length
+    n_shift = int(config.prediction_horizon / config.data_feed_interval)
+    validation_fraction = config.validation_fraction if args.validation_fraction is None else args.validation_fraction
+    train_stop, validation_start = chronological_split(len(labels), validation_fraction, gap=n_shift)
+    validation_features = feature_matrix[validation_start:]
+    validation_labels = labels[validation_start:]
 
-    # Build sequences and labels
-    X_seq, y_seq = [], []
-    for t in range(seq_len - 1, len(df) - n_shift):
-        seq = [
-            [features_list[j].get(name, 0.0) for name in AlphaModel.FEATURE_NAMES]
-            for j in range(t - seq_len + 1, t + 1)
-        ]
-        current_price = df.loc[t, 'last_price']
-        future_price = df.loc[t + n_shift, 'last_price']
-        label = 1.0 if future_price > current_price else 0.0
-        X_seq.append(seq)
-        y_seq.append(label)
-
-    # Convert to tensors and create DataLoader
-    X_tensor = torch.tensor(X_seq, dtype=torch.float32)
-    y_tensor = torch.tensor(y_seq, dtype=torch.float32)
-    dataset = TensorDataset(X_tensor, y_tensor)
-    loader = DataLoader(dataset, batch_size=config.batch_size, shuffle=True)
+    # Stream shuffled batches of windows shard by shard from the (memory-mapped)
+    # feature matrix, so memory use does not grow with the dataset
+    torch.manual_seed(args.seed)
+    dataset = ShardedWindowDataset(
+        feature_matrix[:train_stop + seq_len - 1], labels[:train_stop], seq_len, config.batch_size,
+        shard_size=args.shard_size or config.train_shard_size,
+        seed=args.seed,
+        pin_memory=True,
+    )
+    logging.info(f"Built {len(dataset)} training sequences of length {seq_len} "
+                 f"in {dataset.num_shards} shards, {len(validation_labels)} validation sequences")
+    loader_kwargs = {'num_workers': args.num_workers}
+    if args.num_workers > 0:
+        loader_kwargs['prefetch_factor'] = dataset.prefetch
+    loader = DataLoader(dataset, batch_size=None, **loader_kwargs)
 
     # Initialize model, loss, and optimizer
-    input_size = len(AlphaModel.FEATURE_NAMES)
+    input_size = len(names)
     model = LSTMAlphaNet(
         input_size=input_size,
         hidden_size=config.hidden_size,
@@ -80,10 +119,52 @@ def main():
     )
     criterion = nn.BCEWithLogitsLoss()
     optimizer = torch.optim.Adam(model.parameters(), lr=config.learning_rate)
+    patience = config.early_stopping_patience if args.patience is None else args.patience
+    stopper = EarlyStopping(patience, config.early_stopping_min_delta)
+    num_epochs = args.num_epochs or config.num_epochs
+
+    # Checkpoints and per-epoch metrics live next to the model by default
+    base_path = os.path.splitext(model_path)[0]
+    checkpoint_path = args.checkpoint_path or base_path + '.ckpt'
+    metrics = MetricsLog(args.metrics_path or base_path + '.metrics.jsonl')
+    # Settings a checkpoint must match to be resumed
+    run_spec = {
+        'feature_names': names,
+        'sequence_length': seq_len,
+        'windows': len(labels),
+        'train_stop': train_stop,
+        'validation_start': validation_start,
+        'seed': args.seed,
+    }
+    start_epoch = 0
+    stopped = False
+    if args.resume and os.path.exists(checkpoint_path):
+        checkpoint = load_checkpoint(checkpoint_path)
+        if checkpoint['run_spec'] != run_spec:
+            raise ValueError(f"Checkpoint {checkpoint_path} was written for different data or settings: "
+                             f"{checkpoint['run_spec']}")
+        model.load_state_dict(checkpoint['model'])
+        optimizer.load_state_dict(checkpoint['optimizer'])
+        stopper.load_state_dict(checkpoint['early_stopping'])
+        set_rng_state(checkpoint['rng'])
+        start_epoch = checkpoint['epochs_done']
+        stopped = checkpoint['stopped']
+        # Epochs logged after the checkpoint are trained (and logged) again
+        metrics.truncate(start_epoch)
+        logging.info(f"Resumed from {checkpoint_path} after epoch {start_epoch}")
+    else:
+        if args.resume:
+            logging.warning(f"No checkpoint at {checkpoint_path}, starting from scratch")
+        if os.path.exists(metrics.path):
+            os.remove(metrics.path)
 
     # Training loop
     logging.info("Training LSTM model...")
-    for epoch in range(config.num_epochs):
+    for epoch in range(start_epoch, num_epochs):
+        if stopped:
+            break
+        dataset.set_epoch(epoch)
+        epoch_start = time.perf_counter()
         total_loss = 0.0
         for batch_x, batch_y in loader:
             optimizer.zero_grad()
@@ -92,12 +173,64 @@ def main():
             loss.backward()
             optimizer.step()
             total_loss += loss.item() * batch_x.size(0)
-        avg_loss = total_loss / len(loader.dataset)
-        logging.info(f"Epoch {epoch+1}/{config.num_epochs}, Loss: {avg_loss:.4f}")
+        train_seconds = time.perf_counter() - epoch_start
+        avg_loss = total_loss / len(dataset)
+        record = {
+            'epoch': epoch + 1,
+            'train_loss': avg_loss,
+            'train_samples': len(dataset),
+            'train_seconds': train_seconds,
+            'samples_per_sec': len(dataset) / train_seconds,
+        }
+        message = (f"Epoch {epoch+1}/{num_epochs}, Loss: {avg_loss:.4f}, "
+                   f"{len(dataset) / train_seconds:.0f} samples/sec ({train_seconds:.1f}s)")
+        if len(validation_labels):
+            validation_begin = time.perf_counter()
+            val_loss, val_accuracy = evaluate(model, validation_features, validation_labels, seq_len)
+            improved = stopper.update(val_loss, epoch + 1)
+            stopped = stopper.should_stop
+            record.update(val_loss=val_loss, val_accuracy=val_accuracy,
+                          val_seconds=time.perf_counter() - validation_begin)
+            message += f", Val loss: {val_loss:.4f}, Val accuracy: {val_accuracy:.3f}"
+        else:
+            improved = True
+        record.update(best=improved, early_stop=stopped)
+        logging.info(message)
+        # The saved model is always the best one so far
+        if improved:
+            torch.save(model.state_dict(), model_path)
+        metrics.write(**record)
+        if (epoch + 1) % config.checkpoint_interval == 0 or stopped or epoch + 1 == num_epochs:
+            save_checkpoint(checkpoint_path, {
+                'model': model.state_dict(),
+                'optimizer': optimizer.state_dict(),
+                'early_stopping': stopper.state_dict(),
+                'rng': rng_state(),
+                'epochs_done': epoch + 1,
+                'stopped': stopped,
+                'run_spec': run_spec,
+            })
+        if stopped:
+            logging.info(f"Early stopping: no validation improvement for {stopper.bad_epochs} epochs "
+                         f"(best {stopper.best_loss:.4f} after epoch {stopper.best_epoch})")
 
-    # Save trained model
-    torch.save(model.state_dict(), model_path)
+    # Save trained model (the best epoch when validating)
+    if len(validation_labels) and os.path.exists(model_path):
+        model.load_state_dict(torch.load(model_path))
+    else:
+        torch.save(model.state_dict(), model_path)
+    save_feature_spec(model_path, config)
     logging.info(f"Model saved to {model_path}")
 
+    # Export inference artifacts (load with config.alpha_model_format = 'torchscript')
+    if args.export_torchscript:
+        export_torchscript(model, base_path + '.ts.pt')
+        save_feature_spec(base_path + '.ts.pt', config)
+        logging.info(f"TorchScript model saved to {base_path}.ts.pt")
+    if args.quantize:
+        export_torchscript(model, base_path + '.int8.pt', quantize=True)
+        save_feature_spec(base_path + '.int8.pt', config)
+        logging.info(f"Quantized TorchScript model saved to {base_path}.int8.pt")
+
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -9,22 +9,36 @@ import logging
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import argparse
 
-import pandas as pd
 from stable_baselines3 import DQN
-from stable_baselines3.common.vec_env import DummyVecEnv
 
 from trading_system.config import Config
-from trading_system.rl_env import TradingEnv
+from trading_system.feature_cache import open_feature_cache, rl_env_arrays
+from trading_system.vec_env import ThroughputCallback, make_trading_vec_env
 
 
 def main():
     parser = argparse.ArgumentParser(description="Train position management RL agent using DQN.")
     parser.add_argument('--data-path', type=str, required=True,
-                        help="Path to historical tick data CSV file.")
+                        help="Path to historical tick data (CSV file or tick store directory).")
+    parser.add_argument('--start-date', type=str, default=None,
+                        help="First trading date to use (YYYY-MM-DD, inclusive).")
+    parser.add_argument('--end-date', type=str, default=None,
+                        help="Last trading date to use (YYYY-MM-DD, inclusive).")
     parser.add_argument('--model-output-path', type=str, default=None,
                         help="Output path for the trained RL model (zip format).")
     parser.add_argument('--total-timesteps', type=int, default=100000,
                         help="Total timesteps for training the RL agent.")
+    parser.add_argument('--num-envs', type=int, default=1,
+                        help="Number of environments stepped in parallel.")
+    parser.add_argument('--vec-backend', choices=['native', 'subproc'], default='native',
+                        help="'native' steps all environments in one process; 'subproc' shards them "
+                             "across worker processes that share the market data.")
+    parser.add_argument('--num-workers', type=int, default=None,
+                        help="Worker processes for the subproc backend (default: one per CPU).")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="Random seed for environment start offsets and the agent.")
+    parser.add_argument('--no-cache', action='store_true', default=False,
+                        help="Recompute the features instead of using the feature cache.")
     parser.add_argument('-v', '--verbose', action='store_true', default=False,
                         help="Enable verbose logging")
     args = parser.parse_args()
@@ -36,17 +50,22 @@ def main():
     model_path = args.model_output_path or config.position_rl_model_path
     os.makedirs(os.path.dirname(model_path), exist_ok=True)
 
-    # Load historical data
-    df = pd.read_csv(args.data_path)
+    # Live model features of the historical data (from the feature cache when unchanged)
+    cache = open_feature_cache(config, enabled=not args.no_cache)
+    env_arrays = rl_env_arrays(config, args.data_path, args.start_date, args.end_date, cache)
 
     # Initialize environment for position management RL
-    env = TradingEnv(
-        df,
+    vec_env = make_trading_vec_env(
+        env_arrays,
+        num_envs=args.num_envs,
+        backend=args.vec_backend,
+        num_workers=args.num_workers,
+        seed=args.seed,
         window_size=config.position_rl_window_size,
         fee=config.rl_fee,
-        risk_lambda=config.rl_risk_lambda
+        risk_lambda=config.rl_risk_lambda,
+        max_position=config.max_positions
     )
-    vec_env = DummyVecEnv([lambda: env])
 
     # Initialize DQN agent
     model = DQN(
@@ -59,11 +78,16 @@ def main():
         train_freq=4,
         exploration_fraction=0.1,
         exploration_final_eps=0.01,
+        seed=args.seed,
         verbose=1
     )
 
     logging.info(f"Training position RL agent for {args.total_timesteps} timesteps...")
-    model.learn(total_timesteps=args.total_timesteps)
+    throughput = ThroughputCallback()
+    try:
+        model.learn(total_timesteps=args.total_timesteps, callback=throughput)
+    finally:
+        vec_env.close()
 
     # Save the trained model
     model.save(model_path)
@@ -0,0 +1,116 @@
+import pytest
+import numpy as np
+import torch
+from trading_system.alpha_model import AlphaModel, LSTMAlphaNet
+
+class DummyConfig:
+    sequence_length = 10
+    hidden_size = 8
+    num_layers = 2
+
+def make_model_config(tmp_path, **overrides):
+    torch.manual_seed(0)
+    net = LSTMAlphaNet(input_size=len(AlphaModel.FEATURE_NAMES), hidden_size=8, num_layers=2)
+    path = tmp_path / 'alpha.pth'
+    torch.save(net.state_dict(), path)
+    cfg = DummyConfig()
+    cfg.alpha_model_path = str(path)
+    for key, value in overrides.items():
+        setattr(cfg, key, value)
+    return cfg
+
+def feature_stream(n, seed=0):
+    rng = np.random.default_rng(seed)
+    for row in rng.normal(size=(n, len(AlphaModel.FEATURE_NAMES))):
+        yield dict(zip(AlphaModel.FEATURE_NAMES, row.tolist()))
+
+def test_missing_model_raises(tmp_path):
+    cfg = DummyConfig()
+    cfg.alpha_model_path = str(tmp_path / 'missing.pth')
+    with pytest.raises(FileNotFoundError):
+        AlphaModel(cfg)
+
+def test_warmup_returns_neutral(tmp_path):
+    model = AlphaModel(make_model_config(tmp_path))
+    for features in list(feature_stream(9)):
+        assert model.predict(features) == 0.5
+
+def test_streaming_resync_every_tick_matches_windowed(tmp_path):
+    windowed = AlphaModel(make_model_config(tmp_path))
+    streaming = AlphaModel(make_model_config(tmp_path, alpha_streaming=True, alpha_resync_interval=0))
+    for features in feature_stream(30):
+        assert streaming.predict(features) == pytest.approx(windowed.predict(features), abs=1e-6)
+
+def test_streaming_stays_within_tolerance(tmp_path):
+    windowed = AlphaModel(make_model_config(tmp_path))
+    streaming = AlphaModel(make_model_config(tmp_path, alpha_streaming=True, alpha_resync_interval=10))
+    for features in feature_stream(100):
+        p_window = windowed.predict(features)
+        p_stream = streaming.predict(features)
+        assert abs(p_stream - p_window) < streaming.streaming_tolerance
+    assert 0.0 < streaming.max_drift < streaming.streaming_tolerance
+
+def test_shared_buffer_matches_private_buffer(tmp_path):
+    from trading_system.feature_buffer import FeatureRingBuffer
+    private = AlphaModel(make_model_config(tmp_path))
+    shared_buffer = FeatureRingBuffer(16)
+    shared = AlphaModel(make_model_config(tmp_path, alpha_streaming=True), shared_buffer)
+    for i, features in enumerate(feature_stream(40)):
+        shared_buffer.append(features)
+        p_private = private.predict(features)
+        # Skipped ticks must force the streaming state to re-sync
+        if i % 7 == 0 and i < 30:
+            continue
+        assert shared.predict(features) == pytest.approx(p_private, abs=shared.streaming_tolerance)
+
+def test_predict_windows_matches_predict(tmp_path):
+    from trading_system.windowing import sliding_windows
+    model = AlphaModel(make_model_config(tmp_path))
+    stream = list(feature_stream(25))
+    online = [model.predict(features) for features in stream][9:]
+    matrix = np.array([[f[name] for name in AlphaModel.FEATURE_NAMES] for f in stream], dtype=np.float32)
+    batched = model.predict_windows(sliding_windows(matrix, 10), batch_size=4)
+    np.testing.assert_allclose(batched, online, atol=1e-6)
+
+@pytest.mark.parametrize('quantize, tolerance', [(False, 1e-6), (True, 0.02)])
+def test_torchscript_export_matches_eager(tmp_path, quantize, tolerance):
+    from trading_system.alpha_model import export_torchscript
+    eager_cfg = make_model_config(tmp_path)
+    net = LSTMAlphaNet(input_size=len(AlphaModel.FEATURE_NAMES), hidden_size=8, num_layers=2)
+    net.load_state_dict(torch.load(eager_cfg.alpha_model_path))
+    export_torchscript(net, str(tmp_path / 'alpha.ts.pt'), quantize=quantize)
+    for streaming in (False, True):
+        eager = AlphaModel(make_model_config(tmp_path, alpha_streaming=streaming))
+        scripted = AlphaModel(make_model_config(
+            tmp_path, alpha_model_format='torchscript', alpha_model_path=str(tmp_path / 'alpha.ts.pt'),
+            alpha_streaming=streaming,
+        ))
+        for features in feature_stream(40):
+            assert scripted.predict(features) == pytest.approx(eager.predict(features), abs=tolerance)
+
+def test_unknown_model_format(tmp_path):
+    with pytest.raises(ValueError):
+        AlphaModel(make_model_config(tmp_path, alpha_model_format='onnx'))
+
+def test_feature_spec_mismatch_raises(tmp_path):
+    from trading_system.alpha_model import save_feature_spec
+    # Trained with a rolling feature: a config without it, or with another window, is rejected
+    trained = make_model_config(tmp_path, rolling_features=['ema_gap'], rolling_window=5.0)
+    net = LSTMAlphaNet(input_size=len(AlphaModel.FEATURE_NAMES) + 1, hidden_size=8, num_layers=2)
+    torch.save(net.state_dict(), trained.alpha_model_path)
+    save_feature_spec(trained.alpha_model_path, trained)
+    AlphaModel(trained)
+    for overrides in ({'rolling_features': None}, {'rolling_window': 10.0}):
+        cfg = DummyConfig()
+        cfg.alpha_model_path = trained.alpha_model_path
+        cfg.rolling_features = ['ema_gap']
+        cfg.rolling_window = 5.0
+        for key, value in overrides.items():
+            setattr(cfg, key, value)
+        with pytest.raises(ValueError, match='retrain'):
+            AlphaModel(cfg)
+
+def test_input_size_mismatch_without_spec_raises(tmp_path):
+    cfg = make_model_config(tmp_path, rolling_features=['ema_gap', 'ofi'])
+    with pytest.raises(ValueError, match='expects 4 input features, but the config computes 6'):
+        AlphaModel(cfg)
@@ -0,0 +1,63 @@
+import pytest
+import asyncio
+import numpy as np
+import pandas as pd
+import torch
+from trading_system.config import Config
+from trading_system.alpha_model import AlphaModel, LSTMAlphaNet
+from trading_system.backtest import Backtester, load_ticks, iter_ticks, TICK_COLUMNS
+
+def make_columns(n=200):
+    t = np.arange(n, dtype=float)
+    price = 4400 + np.sin(t / 5.0)
+    return {
+        'timestamp': t,
+        'best_bid': price - 0.125,
+        'best_ask': price + 0.125,
+        'bid_size': np.full(n, 5),
+        'ask_size': np.full(n, 7),
+        'last_price': price,
+    }
+
+@pytest.fixture
+def config(tmp_path):
+    cfg = Config()
+    cfg.alpha_model_path = str(tmp_path / 'alpha.pth')
+    net = LSTMAlphaNet(len(AlphaModel.FEATURE_NAMES), cfg.hidden_size, cfg.num_layers)
+    torch.save(net.state_dict(), cfg.alpha_model_path)
+    return cfg
+
+def test_load_ticks_csv_and_npy(tmp_path):
+    columns = make_columns(10)
+    df = pd.DataFrame(columns).iloc[::-1]
+    df.to_csv(tmp_path / 'ticks.csv', index=False)
+    loaded = load_ticks(str(tmp_path / 'ticks.csv'))
+    np.testing.assert_array_equal(loaded['timestamp'], columns['timestamp'])
+    records = np.zeros(10, dtype=[(name, 'f8') for name in TICK_COLUMNS])
+    for name in TICK_COLUMNS:
+        records[name] = columns[name]
+    np.save(tmp_path / 'ticks.npy', records)
+    loaded = load_ticks(str(tmp_path / 'ticks.npy'))
+    np.testing.assert_array_equal(loaded['last_price'], columns['last_price'])
+
+def test_load_ticks_missing_column(tmp_path):
+    pd.DataFrame({'timestamp': [0.0]}).to_csv(tmp_path / 'bad.csv', index=False)
+    with pytest.raises(KeyError):
+        load_ticks(str(tmp_path / 'bad.csv'))
+
+def test_backtest_records_fills_and_pnl(config, tmp_path):
+    backtester = Backtester(config)
+    # Buy on every 30th tick, hold otherwise
+    signals = iter([0.9 if i % 30 == 0 else 0.5 for i in range(200)])
+    backtester.pipeline.alpha_model.predict = lambda features: next(signals)
+    summary = asyncio.run(backtester.run(iter_ticks(make_columns())))
+    exits = [fill for fill in backtester.ledger if fill['action'] == 'EXIT']
+    assert summary['ticks'] == 200
+    assert summary['trades'] == len(exits) > 0
+    assert summary['fills'] == len(backtester.ledger)
+    assert summary['total_pnl'] == pytest.approx(sum(fill['pnl'] for fill in exits))
+    assert summary['total_pnl'] == pytest.approx(backtester.execution_module.realized_pnl)
+    assert summary['ticks_per_sec'] > 0
+    backtester.write_ledger(str(tmp_path / 'ledger.csv'))
+    ledger = pd.read_csv(tmp_path / 'ledger.csv')
+    assert len(ledger) == len(backtester.ledger)
@@ -8,4 +8,4 @@ def test_config_defaults():
     assert cfg.alpha_threshold_up == 0.6
     assert cfg.alpha_threshold_down == 0.4
     assert cfg.profit_target == 0.5
-    assert cfg.stop_loss == 0.25
+    assert cfg.stop_loss is None
@@ -29,3 +29,101 @@ def test_data_ingestion_ticks():
         assert 'ask_size' in tick and isinstance(tick['ask_size'], int)
         assert 'last_price' in tick
         assert 'last_size' in tick
+
+def test_tick_format_round_trip():
+    from trading_system.tick_format import TICK_SIZE, decode_ticks, encode_ticks
+    ticks = [
+        {'timestamp': 1.5 + i, 'best_bid': 4400.0, 'best_ask': 4400.25, 'bid_size': 3 + i,
+         'ask_size': 9, 'last_price': 4400.25, 'last_size': 2}
+        for i in range(3)
+    ]
+    data = encode_ticks(ticks)
+    assert len(data) == 3 * TICK_SIZE
+    assert decode_ticks(data) == ticks
+    assert isinstance(decode_ticks(data)[0]['bid_size'], int)
+    with pytest.raises(ValueError):
+        decode_ticks(data[:-1])
+
+def test_symbol_topic_round_trip():
+    from trading_system.tick_format import encode_tick, split_symbol_topic, symbol_topic
+    tick = {'timestamp': 1.0, 'best_bid': 4400.0, 'best_ask': 4400.25, 'bid_size': 0,
+            'ask_size': 9, 'last_price': 4400.25, 'last_size': 0}
+    # Records may contain NUL bytes; only the first one ends the symbol
+    assert split_symbol_topic(symbol_topic('RTY') + encode_tick(tick)) == ('RTY', encode_tick(tick))
+    # NUL termination keeps 'ES' from matching 'ESM' subscriptions
+    assert not symbol_topic('ESM').startswith(symbol_topic('ES'))
+
+def test_simulated_ingestion_tags_symbol():
+    di = DataIngestion(DummyConfig(), symbol='NQ')
+    ticks = []
+
+    async def cb(tick):
+        ticks.append(tick)
+        if len(ticks) >= 2:
+            raise asyncio.CancelledError()
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(di.start(cb))
+    assert all(tick['symbol'] == 'NQ' for tick in ticks)
+
+def make_wire_tick(i):
+    from trading_system.tick_format import encode_tick
+    return encode_tick({'timestamp': float(i), 'best_bid': 4400.0, 'best_ask': 4400.25, 'bid_size': 1,
+                        'ask_size': 2, 'last_price': 4400.0, 'last_size': 1})
+
+def run_zmq_feed(messages, n_ticks, symbols=None):
+    # Publishes messages to a ZmqDataIngestion until it has received n_ticks ticks
+    zmq = pytest.importorskip('zmq')
+    import threading
+    from trading_system.data_ingestion import ZmqDataIngestion
+
+    context = zmq.Context.instance()
+    pub = context.socket(zmq.XPUB)
+    pub.setsockopt(zmq.SNDHWM, 0)
+    port = pub.bind_to_random_port('tcp://127.0.0.1')
+
+    def publish():
+        for _ in symbols or [None]:
+            pub.recv()  # wait for the subscriptions
+        for message in messages:
+            pub.send(message)
+
+    class ZmqConfig:
+        zmq_endpoint = f'tcp://127.0.0.1:{port}'
+
+    ingestion = ZmqDataIngestion(ZmqConfig(), symbols)
+    received = []
+
+    async def on_tick(tick):
+        received.append(tick)
+        if len(received) == n_ticks:
+            ingestion.stop()
+
+    publisher = threading.Thread(target=publish)
+    publisher.start()
+    ingestion.connect()
+    asyncio.run(asyncio.wait_for(ingestion.start(on_tick), timeout=60))
+    publisher.join()
+    pub.close(linger=0)
+    return ingestion, received
+
+def test_zmq_ingestion_drains_batches():
+    # Throughput is measured by scripts/benchmark_zmq_ingestion.py, not asserted here
+    n_ticks = 20_000
+    ingestion, received = run_zmq_feed([make_wire_tick(i) for i in range(n_ticks)], n_ticks)
+    assert [tick['timestamp'] for tick in received] == [float(i) for i in range(n_ticks)]
+    assert ingestion.batches < ingestion.messages == n_ticks
+    assert ingestion.bad_frames == 0
+
+def test_zmq_ingestion_skips_malformed_frames():
+    messages = [make_wire_tick(0), make_wire_tick(1)[:-3], make_wire_tick(2) + b'x', make_wire_tick(3)]
+    ingestion, received = run_zmq_feed(messages, 2)
+    assert [tick['timestamp'] for tick in received] == [0.0, 3.0]
+    assert ingestion.bad_frames == 2
+
+def test_zmq_symbol_ingestion_skips_malformed_frames():
+    from trading_system.tick_format import symbol_topic
+    messages = [symbol_topic('ES') + make_wire_tick(0), symbol_topic('NQ') + b'short',
+                symbol_topic('NQ') + make_wire_tick(1)]
+    ingestion, received = run_zmq_feed(messages, 2, symbols=['ES', 'NQ'])
+    assert [(tick['symbol'], tick['timestamp']) for tick in received] == [('ES', 0.0), ('NQ', 1.0)]
+    assert ingestion.bad_frames == 1
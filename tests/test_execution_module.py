@@ -8,6 +8,7 @@ class DummyConfig:
     stop_loss = 0.5
     max_positions = 2
     use_position_rl = False
+    print_fills = True
 
 def make_tick(price, timestamp):
     return {'last_price': price, 'timestamp': timestamp}
@@ -56,3 +57,26 @@ def test_short_entry_and_time_exit(loop, capsys):
     assert exec_mod.position == 0
     captured = capsys.readouterr()
     assert 'Exited SHORT position of 1 units on time at 199.00' in captured.out
+
+def test_long_stop_loss_exit(loop, capsys):
+    cfg = DummyConfig()
+    exec_mod = ExecutionModule(cfg)
+    loop.run_until_complete(exec_mod.execute({'action': 'BUY'}, make_tick(100.0, 0.0)))
+    loop.run_until_complete(exec_mod.execute({'action': 'HOLD'}, make_tick(99.6, 1.0)))
+    assert exec_mod.position == 1
+    loop.run_until_complete(exec_mod.execute({'action': 'HOLD'}, make_tick(99.5, 2.0)))
+    assert exec_mod.position == 0
+    assert exec_mod.realized_pnl == pytest.approx(-0.5)
+    captured = capsys.readouterr()
+    assert 'Exited LONG position of 1 units on stop loss at 99.50' in captured.out
+
+def test_short_stop_loss_exit_reports_fill(loop):
+    cfg = DummyConfig()
+    fills = []
+    exec_mod = ExecutionModule(cfg, on_fill=fills.append)
+    loop.run_until_complete(exec_mod.execute({'action': 'SELL'}, make_tick(200.0, 0.0)))
+    loop.run_until_complete(exec_mod.execute({'action': 'HOLD'}, make_tick(200.5, 1.0)))
+    assert exec_mod.position == 0
+    assert [f['action'] for f in fills] == ['ENTRY', 'EXIT']
+    assert fills[-1]['reason'] == 'stop'
+    assert fills[-1]['pnl'] == pytest.approx(-0.5)
@@ -0,0 +1,64 @@
+import pytest
+import asyncio
+import numpy as np
+from trading_system.execution_module import ExecutionModule
+from trading_system.execution_sim import (
+    simulate_execution, encode_actions, signals_from_predictions, EXIT_REASONS, EXIT_OPEN
+)
+
+class DummyConfig:
+    prediction_horizon = 10.0
+    profit_target = 1.0
+    stop_loss = 0.5
+    max_positions = 2
+    use_position_rl = False
+
+def run_event_driven(prices, timestamps, actions, cfg):
+    fills = []
+    exec_mod = ExecutionModule(cfg, on_fill=fills.append)
+
+    async def replay():
+        for price, ts, action in zip(prices.tolist(), timestamps.tolist(), actions):
+            await exec_mod.execute({'action': action}, {'last_price': price, 'timestamp': ts})
+
+    asyncio.run(replay())
+    return [f for f in fills if f['action'] == 'EXIT'], exec_mod
+
+def random_market(seed, n=3000):
+    rng = np.random.default_rng(seed)
+    prices = 4400 + np.cumsum(rng.choice([-0.25, 0.0, 0.25], size=n))
+    timestamps = np.cumsum(rng.exponential(1.0, size=n))
+    actions = rng.choice(['BUY', 'SELL', 'HOLD'], size=n, p=[0.1, 0.1, 0.8])
+    return prices, timestamps, actions
+
+@pytest.mark.parametrize('seed,max_positions,stop_loss', [
+    (0, 2, 0.5), (1, 1, 0.5), (2, 3, None), (3, 2, 0.25),
+])
+def test_parity_with_execution_module(seed, max_positions, stop_loss, capsys):
+    cfg = DummyConfig()
+    cfg.max_positions = max_positions
+    cfg.stop_loss = stop_loss
+    prices, timestamps, actions = random_market(seed)
+    exits, exec_mod = run_event_driven(prices, timestamps, actions, cfg)
+    result = simulate_execution(prices, timestamps, actions, cfg, chunk_size=97)
+    closed = result['reason'] != EXIT_OPEN
+    assert closed.sum() == len(exits)
+    np.testing.assert_array_equal(result['exit_time'][closed], [f['timestamp'] for f in exits])
+    np.testing.assert_array_equal(result['pnl'][closed], [f['pnl'] for f in exits])
+    np.testing.assert_array_equal(result['units'][closed], [f['units'] for f in exits])
+    assert [EXIT_REASONS[r] for r in result['reason'][closed]] == [f['reason'] for f in exits]
+    assert result['total_pnl'] == pytest.approx(exec_mod.realized_pnl)
+    # Any still-open trade matches the module's open position
+    if not closed.all():
+        assert result['side'][-1] * result['units'][-1] == exec_mod.position
+
+def test_encode_and_threshold_signals():
+    np.testing.assert_array_equal(encode_actions(['BUY', 'HOLD', 'SELL']), [1, 0, -1])
+    np.testing.assert_array_equal(signals_from_predictions([0.7, 0.5, 0.3], 0.6, 0.4), [1, 0, -1])
+
+def test_empty_and_no_signal_inputs():
+    cfg = DummyConfig()
+    result = simulate_execution(np.array([]), np.array([]), np.array([], dtype=np.int8), cfg)
+    assert len(result['pnl']) == 0
+    result = simulate_execution(np.ones(5), np.arange(5.0), ['HOLD'] * 5, cfg)
+    assert result['total_pnl'] == 0.0
@@ -0,0 +1,36 @@
+import pytest
+import numpy as np
+from trading_system.feature_buffer import FeatureRingBuffer
+
+def make_features(value):
+    return {'mid_price': value, 'spread': value + 0.5, 'bid_ask_ratio': 1.0, 'recent_return': 0.0}
+
+def test_window_is_chronological_after_wrap():
+    buf = FeatureRingBuffer(4)
+    for i in range(11):
+        buf.append(make_features(float(i)))
+    assert len(buf) == 4
+    assert buf.count == 11
+    np.testing.assert_array_equal(buf.window(4)[:, 0], [7.0, 8.0, 9.0, 10.0])
+    np.testing.assert_array_equal(buf.window(2)[:, 1], [9.5, 10.5])
+    assert buf.latest()[0] == 10.0
+
+def test_window_is_contiguous_view():
+    buf = FeatureRingBuffer(3)
+    for i in range(5):
+        buf.append(make_features(float(i)))
+    window = buf.window(3)
+    assert window.flags['C_CONTIGUOUS']
+    assert np.shares_memory(window, buf.data)
+    assert window.dtype == np.float32
+
+def test_missing_features_default_to_zero():
+    buf = FeatureRingBuffer(2)
+    buf.append({'mid_price': 1.0})
+    np.testing.assert_array_equal(buf.latest(), [1.0, 0.0, 0.0, 0.0])
+
+def test_window_longer_than_history_raises():
+    buf = FeatureRingBuffer(3)
+    buf.append(make_features(1.0))
+    with pytest.raises(ValueError):
+        buf.window(2)
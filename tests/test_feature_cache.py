@@ -0,0 +1,103 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from trading_system.config import Config
+from trading_system.feature_cache import FeatureCache, alpha_training_arrays, rl_env_arrays
+from trading_system.tick_store import TickStoreWriter
+
+def write_ticks(path, n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    mid = 4400 + 0.25 * rng.integers(-1, 2, size=n).cumsum()
+    df = pd.DataFrame({
+        'timestamp': 1.7e9 + np.arange(n, dtype=float),
+        'best_bid': mid - 0.125,
+        'best_ask': mid + 0.125,
+        'bid_size': rng.integers(1, 20, size=n),
+        'ask_size': rng.integers(1, 20, size=n),
+        'last_price': mid,
+    })
+    df.to_csv(path, index=False)
+    return df
+
+def small_config():
+    config = Config()
+    config.sequence_length = 10
+    config.prediction_horizon = 5
+    return config
+
+def test_hit_skips_compute_and_params_change_key(tmp_path):
+    cache = FeatureCache(str(tmp_path / 'cache'))
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {'x': np.arange(5.0)}, {'note': 'a'}
+    arrays, meta = cache.fetch('demo', 'data', {'window': 3}, compute)
+    again, _ = cache.fetch('demo', 'data', {'window': 3}, compute)
+    assert len(calls) == 1 and (cache.hits, cache.misses) == (1, 1)
+    assert isinstance(again['x'], np.memmap) and meta['note'] == 'a'
+    np.testing.assert_array_equal(again['x'], np.arange(5.0))
+    cache.fetch('demo', 'data', {'window': 4}, compute)
+    cache.fetch('demo', 'other data', {'window': 3}, compute)
+    assert len(calls) == 3
+
+def test_alpha_arrays_match_uncached_and_follow_data(tmp_path):
+    path = str(tmp_path / 'ticks.csv')
+    write_ticks(path)
+    config = small_config()
+    cache = FeatureCache(str(tmp_path / 'cache'))
+    features, labels = alpha_training_arrays(config, path)
+    for _ in range(2):
+        cached_features, cached_labels = alpha_training_arrays(config, path, cache=cache)
+        np.testing.assert_array_equal(cached_features, features)
+        np.testing.assert_array_equal(cached_labels, labels)
+    assert (cache.hits, cache.misses) == (1, 1)
+    # Feature set and windowing parameters are part of the key
+    config.sequence_length = 12
+    assert len(alpha_training_arrays(config, path, cache=cache)[1]) == len(labels) - 2
+    assert cache.misses == 2
+    # New content at the same path is rehashed
+    write_ticks(path, seed=1)
+    os.utime(path, ns=(1, 1))
+    changed, _ = alpha_training_arrays(config, path, cache=cache)
+    assert cache.misses == 3 and not np.array_equal(changed, features)
+
+def test_tick_store_fingerprint_covers_selected_dates(tmp_path):
+    df = write_ticks(str(tmp_path / 'ticks.csv'), n=200)
+    writer = TickStoreWriter(str(tmp_path / 'store'))
+    dates = np.where(np.arange(200) < 100, '2024-01-02', '2024-01-03')
+    writer.append({name: df[name].to_numpy() for name in df.columns}, dates)
+    writer.close()
+    cache = FeatureCache(str(tmp_path / 'cache'))
+    store = str(tmp_path / 'store')
+    first = cache.data_fingerprint(store, '2024-01-02', '2024-01-02')
+    assert first == cache.data_fingerprint(store, '2024-01-02', '2024-01-02')
+    assert first != cache.data_fingerprint(store)
+    config = small_config()
+    env_arrays = rl_env_arrays(config, store, '2024-01-02', '2024-01-02', cache)
+    assert len(env_arrays['price']) == 100 and env_arrays['features'].shape == (100, 4)
+    np.testing.assert_array_equal(rl_env_arrays(config, store, '2024-01-02', '2024-01-02', cache)['features'],
+                                  env_arrays['features'])
+    assert cache.hits == 1
+    # Same features as the alpha model is trained on
+    config.rolling_features = ['ofi']
+    features, _ = alpha_training_arrays(config, store, '2024-01-02', '2024-01-02')
+    np.testing.assert_array_equal(rl_env_arrays(config, store, '2024-01-02', '2024-01-02', cache)['features'], features)
+    assert cache.misses == 2
+
+def test_size_eviction_removes_least_recently_used(tmp_path):
+    entry_bytes = 8000
+    cache = FeatureCache(str(tmp_path / 'cache'), max_bytes=int(2.5 * entry_bytes))
+    keys = []
+    for i in range(3):
+        keys.append(cache.key('demo', str(i), {}))
+        cache.store(keys[-1], {'x': np.full(1000, float(i))})
+        # Distinct last-used times
+        os.utime(os.path.join(cache.root, keys[-1], 'meta.json'), (i, i))
+        if i == 1:
+            # Touching entry 0 makes entry 1 the least recently used
+            cache.load(keys[0])
+    assert cache.load(keys[1]) is None
+    assert cache.load(keys[0]) is not None and cache.load(keys[2]) is not None
+    assert cache.size() <= cache.max_bytes
@@ -36,3 +36,60 @@ def test_compute_features_multiple_ticks():
     fe.update(tick2)
     f = fe.compute_features()
     assert f['recent_return'] == pytest.approx((110 - 100) / 100)
+
+def test_compute_features_batch_matches_streaming():
+    import numpy as np
+    rng = np.random.default_rng(0)
+    n = 100
+    data = {
+        'best_bid': 4400 + rng.normal(size=n).cumsum(),
+        'best_ask': 4400.25 + rng.normal(size=n).cumsum(),
+        'bid_size': rng.integers(0, 20, size=n),
+        'ask_size': rng.integers(0, 20, size=n),
+        'last_price': 4400 + rng.normal(size=n).cumsum(),
+    }
+    data['last_price'][10] = 0.0
+    fe = FeatureEngineer(DummyConfig())
+    batch = fe.compute_features_batch(data)
+    stream = FeatureEngineer(DummyConfig())
+    for i in range(n):
+        stream.update({k: v[i].item() for k, v in data.items()})
+        f = stream.compute_features()
+        for name, value in f.items():
+            assert batch[name][i] == value
+
+def test_rolling_features_batch_matches_streaming():
+    import numpy as np
+    from trading_system.feature_engineering import ROLLING_FEATURE_NAMES
+    rng = np.random.default_rng(1)
+    n = 500
+    mid = 4400 + 0.25 * rng.integers(-1, 2, size=n).cumsum()
+    data = {
+        'timestamp': 1.7e9 + np.cumsum(rng.exponential(0.5, size=n)),
+        'best_bid': mid - 0.125,
+        'best_ask': mid + 0.125,
+        'bid_size': rng.integers(1, 20, size=n),
+        'ask_size': rng.integers(1, 20, size=n),
+        'last_price': mid + 0.125 * rng.choice([-1, 1], size=n),
+        'last_size': rng.integers(0, 4, size=n),
+    }
+
+    class RollingConfig(DummyConfig):
+        rolling_features = ROLLING_FEATURE_NAMES
+        rolling_window = 3.0
+    batch = FeatureEngineer(RollingConfig()).compute_features_batch(data)
+    stream = FeatureEngineer(RollingConfig())
+    assert stream.feature_names[-len(ROLLING_FEATURE_NAMES):] == ROLLING_FEATURE_NAMES
+    for i in range(n):
+        stream.update({k: v[i].item() for k, v in data.items()})
+        f = stream.compute_features()
+        assert list(f) == stream.feature_names
+        for name in ROLLING_FEATURE_NAMES:
+            assert f[name] == pytest.approx(batch[name][i], rel=1e-9, abs=1e-10)
+    assert np.any(batch['ofi'] != 0) and np.all(batch['realized_range'] >= 0)
+
+def test_unknown_rolling_feature_rejected():
+    class BadConfig(DummyConfig):
+        rolling_features = ['momentum']
+    with pytest.raises(ValueError):
+        FeatureEngineer(BadConfig())
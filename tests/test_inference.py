@@ -0,0 +1,142 @@
+import pytest
+import asyncio
+import threading
+import time
+import torch
+from trading_system.config import Config
+from trading_system.alpha_model import AlphaModel, LSTMAlphaNet
+from trading_system.inference import STALE, InferenceExecutor
+from trading_system.pipeline import TradingPipeline
+from trading_system.tick_queue import TickQueue
+
+def make_tick(i):
+    price = 4400 + 0.25 * (i % 9)
+    return {'timestamp': float(i), 'best_bid': price - 0.25, 'best_ask': price + 0.25,
+            'bid_size': 5, 'ask_size': 7, 'last_price': price}
+
+def test_loop_keeps_running_during_inference():
+    executor = InferenceExecutor()
+    heartbeats = []
+
+    def slow_model(x):
+        time.sleep(0.05)
+        return threading.current_thread().name, x * 2
+
+    async def heartbeat():
+        while True:
+            heartbeats.append(time.perf_counter())
+            await asyncio.sleep(0.005)
+
+    async def main():
+        beat = asyncio.ensure_future(heartbeat())
+        result = await executor.run(slow_model, 21)
+        beat.cancel()
+        return result
+    thread_name, value = asyncio.run(main())
+    executor.close()
+    assert value == 42
+    assert thread_name.startswith('inference')
+    # The event loop was not blocked by the forward pass
+    assert len(heartbeats) >= 5
+
+def test_in_flight_limit():
+    executor = InferenceExecutor(max_in_flight=2)
+
+    async def main():
+        return await asyncio.gather(*[executor.run(time.sleep, 0.01) for _ in range(6)])
+    asyncio.run(main())
+    executor.close()
+    assert executor.stats()['max_in_flight'] == 2
+    assert executor.completed == 6
+
+def test_stale_requests_are_skipped_not_dropped():
+    executor = InferenceExecutor()
+    calls = []
+    newer = {'tick': False}
+
+    def model():
+        calls.append(1)
+        newer['tick'] = True  # a newer tick arrives while the model runs
+        return 'BUY'
+
+    async def main():
+        first = await executor.run(model, is_stale=lambda: newer['tick'])
+        second = await executor.run(model, is_stale=lambda: newer['tick'])
+        return first, second
+    first, second = asyncio.run(main())
+    executor.close()
+    # Started work is kept; a request made stale before it starts is skipped
+    assert first == 'BUY' and second is STALE
+    assert len(calls) == 1
+    assert executor.stale == 1
+
+def test_pipeline_offloaded_matches_inline(tmp_path):
+    config = Config()
+    config.alpha_model_path = str(tmp_path / 'alpha.pth')
+    config.sequence_length = 5
+    net = LSTMAlphaNet(len(AlphaModel.FEATURE_NAMES), config.hidden_size, config.num_layers)
+    torch.save(net.state_dict(), config.alpha_model_path)
+    inline = TradingPipeline(config)
+    config.inference_executor = True
+    config.latency_tracking = True
+    config.latency_snapshot_path = None
+    offloaded = TradingPipeline(config)
+    predictions = {id(inline): [], id(offloaded): []}
+    for pipeline in (inline, offloaded):
+        predict = pipeline.alpha_model.predict
+        pipeline.alpha_model.predict = lambda f, p=predict, out=predictions[id(pipeline)]: out.append(p(f)) or out[-1]
+
+    async def run(pipeline):
+        for i in range(30):
+            await pipeline.on_tick(make_tick(i))
+    asyncio.run(run(inline))
+    asyncio.run(run(offloaded))
+    offloaded.close()
+    assert predictions[id(offloaded)] == pytest.approx(predictions[id(inline)])
+    assert offloaded.inference.completed == 30
+    assert offloaded.latency.snapshot()['inference']['count'] == 30
+
+def test_fast_feed_still_enters_and_exits(tmp_path):
+    config = Config()
+    config.alpha_model_path = str(tmp_path / 'alpha.pth')
+    config.sequence_length = 5
+    config.inference_executor = True
+    config.prediction_horizon = 20
+    net = LSTMAlphaNet(len(AlphaModel.FEATURE_NAMES), config.hidden_size, config.num_layers)
+    torch.save(net.state_dict(), config.alpha_model_path)
+    pipeline = TradingPipeline(config)
+    # Inference is several feed intervals long, so newer ticks always arrive meanwhile
+    signal = {'proba': 0.5}
+
+    def slow_predict(features):
+        time.sleep(0.005)
+        return signal['proba']
+    pipeline.alpha_model.predict = slow_predict
+    execution = pipeline.execution_module
+    fills = []
+    execution.on_fill = fills.append
+    execution.position, execution.entry_price, execution.entry_time = 1, 4400.0, 0.0
+    queue = TickQueue(1000, 'drop_oldest')
+    pipeline.is_stale = lambda: len(queue) > 0
+
+    async def feed(start, count):
+        for i in range(start, start + count):
+            await queue.put(make_tick(i))
+            await asyncio.sleep(0.001)
+
+    async def main():
+        consumer = asyncio.ensure_future(queue.consume(pipeline.on_tick))
+        # Open position on a HOLD signal: an exit fires despite the backlog
+        await feed(1, 100)
+        exited = execution.position == 0
+        # BUY signal: entries are not starved either
+        signal['proba'] = 0.9
+        await feed(101, 100)
+        consumer.cancel()
+        return exited
+    exited = asyncio.run(main())
+    pipeline.close()
+    assert exited
+    assert fills[0]['action'] == 'EXIT'
+    assert any(fill['action'] == 'ENTRY' for fill in fills[1:])
+    assert pipeline.stale_ticks > 0 and pipeline.inference.completed > 0
@@ -0,0 +1,93 @@
+import asyncio
+import os
+import time
+import numpy as np
+import torch
+from trading_system.config import Config
+from trading_system.alpha_model import AlphaModel, LSTMAlphaNet
+from trading_system.journal import DECISION, FILL, TradeJournal, journal_frame, read_journal
+from trading_system.pipeline import TradingPipeline
+
+def make_tick(i):
+    price = 4400 + 0.25 * (i % 9)
+    return {'timestamp': float(i), 'best_bid': price - 0.25, 'best_ask': price + 0.25,
+            'bid_size': 5, 'ask_size': 7, 'last_price': price}
+
+def test_round_trip_with_rotation(tmp_path):
+    # Long interval so the writer thread stays idle and the test controls flushes
+    journal = TradeJournal(str(tmp_path), feature_names=['a', 'b'], session='s', rotate_bytes=1000,
+                           flush_interval=60.0)
+    for i in range(100):
+        journal.record_decision(float(i), [i, -i], 0.25, 'BUY' if i % 2 else 'HOLD', i % 3, 4400.0 + i)
+        if i % 10 == 9:
+            journal.flush()
+    journal.record_fill({'timestamp': 100.0, 'action': 'EXIT', 'side': 'LONG', 'units': 2, 'price': 4501.0,
+                         'position': 0, 'reason': 'stop', 'pnl': -0.5, 'realized_pnl': 1.5}, b'ES')
+    journal.close()
+    assert len(os.listdir(tmp_path)) == journal.files_written > 1
+    records, header = read_journal(str(tmp_path), session='s')
+    assert header['feature_names'] == ['a', 'b']
+    assert len(records) == journal.records_written == 101
+    np.testing.assert_array_equal(records['timestamp'], np.arange(101.0))
+    np.testing.assert_array_equal(records['features'][:100, 1], -np.arange(100.0))
+    frame = journal_frame(str(tmp_path))
+    assert list(frame['kind'][:2]) == ['decision', 'decision']
+    assert list(frame['action'][:2]) == ['HOLD', 'BUY']
+    last = frame.iloc[-1]
+    assert (last['kind'], last['action'], last['reason'], last['symbol']) == ('fill', 'EXIT', 'stop', 'ES')
+    assert last['pnl'] == -0.5 and np.isnan(last['prediction'])
+
+def test_write_error_is_logged_and_writer_keeps_draining(tmp_path, caplog):
+    journal = TradeJournal(str(tmp_path), feature_names=['a'], session='s', flush_interval=0.01)
+
+    class FullDisk:
+        def write(self, data):
+            raise OSError(28, 'No space left on device')
+
+        def close(self):
+            pass
+    journal.file = FullDisk()
+    journal.record_decision(1.0, [1.0], 0.5, 'HOLD', 0, 4400.0)
+    deadline = time.monotonic() + 5
+    while journal.write_errors == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    journal.record_decision(2.0, [2.0], 0.5, 'BUY', 0, 4400.0)
+    while journal.records_written == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert journal.thread.is_alive()
+    journal.close()
+    stats = journal.stats()
+    assert (stats['write_errors'], stats['records_dropped'], stats['records']) == (1, 1, 1)
+    assert 'Trade journal write failed' in caplog.text
+    records, _ = read_journal(str(tmp_path), session='s')
+    np.testing.assert_array_equal(records['timestamp'], [2.0])
+
+def test_pipeline_journals_decisions_and_fills(tmp_path):
+    config = Config()
+    config.alpha_model_path = str(tmp_path / 'alpha.pth')
+    config.sequence_length = 5
+    config.alpha_threshold_up = 0.5
+    config.alpha_threshold_down = 0.5
+    config.journal_dir = str(tmp_path / 'journal')
+    net = LSTMAlphaNet(len(AlphaModel.FEATURE_NAMES), config.hidden_size, config.num_layers)
+    torch.save(net.state_dict(), config.alpha_model_path)
+    pipeline = TradingPipeline(config)
+    fills = []
+    pipeline.execution_module.on_fill = fills.append
+
+    async def main():
+        for i in range(50):
+            await pipeline.on_tick(make_tick(i))
+    asyncio.run(main())
+    pipeline.close()
+    records, header = read_journal(config.journal_dir)
+    decisions = records[records['kind'] == DECISION]
+    assert len(decisions) == 50
+    assert header['feature_names'] == AlphaModel.FEATURE_NAMES
+    np.testing.assert_allclose(decisions['features'][-1], pipeline.feature_buffer.window(1)[0])
+    assert decisions['position'][-1] == pipeline.execution_module.position
+    # Neutral prediction until the window is full
+    assert np.all(decisions['prediction'][:config.sequence_length - 1] == 0.5)
+    journaled_fills = records[records['kind'] == FILL]
+    assert len(fills) > 0 and len(journaled_fills) == len(fills)
+    np.testing.assert_array_equal(journaled_fills['price'], [fill['price'] for fill in fills])
@@ -0,0 +1,86 @@
+import pytest
+import asyncio
+import json
+import numpy as np
+import torch
+from trading_system.config import Config
+from trading_system.alpha_model import AlphaModel, LSTMAlphaNet
+from trading_system.latency import LatencyHistogram, LatencyRecorder, bucket_index, bucket_upper_bound
+from trading_system.pipeline import TradingPipeline
+
+def make_tick(i):
+    price = 4400 + 0.25 * (i % 9)
+    return {'timestamp': float(i), 'best_bid': price - 0.25, 'best_ask': price + 0.25,
+            'bid_size': 5, 'ask_size': 7, 'last_price': price}
+
+def test_buckets_cover_values():
+    for value in list(range(5000)) + [10**6, 10**9 + 7, 2**62]:
+        index = bucket_index(value)
+        assert bucket_upper_bound(index) >= value
+        assert index == 0 or bucket_upper_bound(index - 1) < value
+        # Bucket width stays within 1/8 of its values
+        assert bucket_upper_bound(index) - value <= value / 8
+
+def test_histogram_quantiles():
+    hist = LatencyHistogram()
+    values = np.random.default_rng(0).integers(1000, 10**6, 20000)
+    for value in values:
+        hist.record(int(value))
+    stats = hist.summary()
+    assert stats['count'] == 20000
+    assert stats['max'] == values.max()
+    for name, q in [('p50', 50), ('p99', 99), ('p999', 99.9)]:
+        exact = np.percentile(values, q)
+        assert exact * 0.95 <= stats[name] <= exact * 1.15
+    hist.reset()
+    assert hist.summary()['p99'] == 0
+
+def test_snapshot_formats(tmp_path):
+    recorder = LatencyRecorder(['alpha', 'total'], snapshot_interval=0.0)
+    recorder.histograms['alpha'].record(2000)
+    prom_path = str(tmp_path / 'latency.prom')
+    recorder.snapshot_path = prom_path
+    recorder.maybe_snapshot(recorder.next_snapshot_ns)
+    text = open(prom_path).read()
+    assert 'trading_stage_latency_seconds{stage="alpha",quantile="0.99"} 0.000002000' in text
+    assert 'trading_stage_latency_seconds_count{stage="total"} 0' in text
+    recorder.write_snapshot(str(tmp_path / 'latency.json'))
+    data = json.load(open(tmp_path / 'latency.json'))
+    assert data['stages']['alpha']['count'] == 1
+    assert data['stages']['alpha']['max'] == pytest.approx(2e-6)
+    # Gauges such as the tick queue counters are added to both formats
+    recorder.gauges['tick_queue'] = lambda: {'depth': 3, 'dropped': 7}
+    assert 'trading_tick_queue{stat="dropped"} 7' in recorder.to_prometheus()
+    recorder.write_snapshot(str(tmp_path / 'latency.json'))
+    assert json.load(open(tmp_path / 'latency.json'))['tick_queue'] == {'depth': 3, 'dropped': 7}
+
+@pytest.mark.parametrize('enabled', [False, True])
+def test_pipeline_latency_tracking(tmp_path, monkeypatch, enabled):
+    config = Config()
+    config.alpha_model_path = str(tmp_path / 'alpha.pth')
+    config.sequence_length = 5
+    config.latency_tracking = enabled
+    config.latency_snapshot_path = str(tmp_path / 'latency.prom')
+    net = LSTMAlphaNet(len(AlphaModel.FEATURE_NAMES), config.hidden_size, config.num_layers)
+    torch.save(net.state_dict(), config.alpha_model_path)
+    if not enabled:
+        # Switched off, no stage is timed and no recorder is built
+        def fail(*args, **kwargs):
+            raise AssertionError('latency instrumentation used while disabled')
+        monkeypatch.setattr(TradingPipeline, '_lap', fail)
+        monkeypatch.setattr('trading_system.pipeline.LatencyRecorder', fail)
+    pipeline = TradingPipeline(config)
+
+    async def run():
+        for i in range(20):
+            await pipeline.on_tick(make_tick(i))
+    asyncio.run(run())
+    if not enabled:
+        assert pipeline.latency is None
+        assert not (tmp_path / 'latency.prom').exists()
+        return
+    stats = pipeline.latency.snapshot()
+    assert stats['total']['count'] == 20
+    assert stats['alpha']['count'] == stats['decision']['count'] == 20
+    assert stats['position']['count'] == 0
+    assert stats['total']['max'] >= stats['alpha']['max'] > 0
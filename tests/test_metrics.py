@@ -0,0 +1,24 @@
+import pytest
+import numpy as np
+from trading_system.metrics import max_drawdown, sharpe_ratio, trade_stats
+
+def test_max_drawdown():
+    assert max_drawdown([]) == 0.0
+    assert max_drawdown([1.0, 2.0, -1.5, -1.0, 3.0]) == pytest.approx(2.5)
+    assert max_drawdown([-1.0, 0.5]) == pytest.approx(1.0)
+
+def test_sharpe_per_trade_and_daily():
+    pnl = [1.0, -0.5, 2.0, 0.5]
+    assert sharpe_ratio(pnl) == pytest.approx(np.mean(pnl) / np.std(pnl, ddof=1))
+    # Two trades per day over two days -> annualized daily Sharpe
+    times = [0.0, 100.0, 86400.0, 86500.0]
+    daily = np.array([0.5, 2.5])
+    assert sharpe_ratio(pnl, times) == pytest.approx(daily.mean() / daily.std(ddof=1) * np.sqrt(252))
+    assert sharpe_ratio([1.0]) == 0.0
+
+def test_trade_stats():
+    stats = trade_stats([1.0, -1.0, 2.0])
+    assert stats['trades'] == 3
+    assert stats['total_pnl'] == pytest.approx(2.0)
+    assert stats['win_rate'] == pytest.approx(2 / 3)
+    assert trade_stats([])['trades'] == 0
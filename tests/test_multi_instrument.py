@@ -0,0 +1,120 @@
+import pytest
+import asyncio
+import torch
+from trading_system.config import Config
+from trading_system.alpha_model import AlphaModel, LSTMAlphaNet
+from trading_system.multi_instrument import MultiInstrumentPipeline
+from trading_system.pipeline import TradingPipeline
+
+SYMBOLS = ['ES', 'NQ', 'RTY', 'YM']
+
+def make_tick(i, symbol, offset=0):
+    price = 4400 + 0.25 * ((i * (offset + 1)) % 9) + offset
+    return {'symbol': symbol, 'timestamp': float(i), 'best_bid': price - 0.25, 'best_ask': price + 0.25,
+            'bid_size': 5 + offset, 'ask_size': 7, 'last_price': price}
+
+def make_config(tmp_path):
+    config = Config()
+    config.alpha_model_path = str(tmp_path / 'alpha.pth')
+    config.sequence_length = 5
+    # Trade on any prediction so decisions depend on the exact probabilities
+    config.alpha_threshold_up = 0.5
+    config.alpha_threshold_down = 0.5
+    torch.manual_seed(0)
+    net = LSTMAlphaNet(len(AlphaModel.FEATURE_NAMES), config.hidden_size, config.num_layers)
+    torch.save(net.state_dict(), config.alpha_model_path)
+    return config
+
+def record_predictions(decision_model):
+    # Wraps decide() to capture the probabilities it receives
+    predictions = []
+    decide = decision_model.decide
+
+    def recording_decide(prediction, features, account=None):
+        predictions.append(prediction)
+        return decide(prediction, features, account)
+    decision_model.decide = recording_decide
+    return predictions
+
+def test_single_symbol_matches_trading_pipeline(tmp_path):
+    config = make_config(tmp_path)
+    single = TradingPipeline(config)
+    multi = MultiInstrumentPipeline(config, ['ES'], time_slice=0)
+    ticks = [make_tick(i, 'ES') for i in range(60)]
+
+    async def main(pipeline):
+        for tick in ticks:
+            await pipeline.on_tick(tick)
+    asyncio.run(main(single))
+    asyncio.run(main(multi))
+    execution = multi.instruments['ES'].execution_module
+    assert execution.position == single.execution_module.position
+    assert execution.realized_pnl == single.execution_module.realized_pnl
+    assert multi.batches == 60 - config.sequence_length + 1
+
+def test_batched_predictions_routed_per_symbol(tmp_path):
+    config = make_config(tmp_path)
+    multi = MultiInstrumentPipeline(config, SYMBOLS, time_slice=0.01)
+    recorded = {s: record_predictions(multi.instruments[s].decision_model) for s in SYMBOLS}
+    references = {s: AlphaModel(config) for s in SYMBOLS}
+    expected = {s: [] for s in SYMBOLS}
+    n_rounds = 20
+
+    async def main():
+        for i in range(n_rounds):
+            for offset, symbol in enumerate(SYMBOLS):
+                tick = make_tick(i, symbol, offset)
+                await multi.on_tick(tick)
+                features = dict(multi.instruments[symbol].features.compute_features())
+                expected[symbol].append(references[symbol].predict(features))
+            # The time slice elapses once per round
+            await asyncio.sleep(0.03)
+    asyncio.run(main())
+    for symbol in SYMBOLS:
+        assert recorded[symbol] == pytest.approx(expected[symbol], abs=1e-6)
+    # One forward pass per round once every window is full, batched over all symbols
+    assert multi.batches == n_rounds - config.sequence_length + 1
+    assert multi.stats()['max_batch'] == len(SYMBOLS)
+
+def test_background_load_warms_up_features(tmp_path):
+    config = make_config(tmp_path)
+    multi = MultiInstrumentPipeline(config, SYMBOLS, time_slice=0, load_models=False)
+
+    async def main():
+        for symbol in SYMBOLS:
+            await multi.on_tick(make_tick(0, symbol))
+        await multi.load_models_async()
+        for symbol in SYMBOLS:
+            await multi.on_tick(make_tick(1, symbol))
+    asyncio.run(main())
+    assert multi.warmup_ticks == len(SYMBOLS)
+    assert all(len(multi.instruments[s].feature_buffer) == 2 for s in SYMBOLS)
+    assert 'first_inference' in multi.startup_timings
+
+def test_failed_flush_stops_consume(tmp_path):
+    from trading_system.tick_queue import TickQueue
+    config = make_config(tmp_path)
+    multi = MultiInstrumentPipeline(config, SYMBOLS, time_slice=0.001)
+
+    async def broken_flush():
+        raise RuntimeError('broker down')
+    multi.flush = broken_flush
+    queue = TickQueue(100, 'block')
+
+    async def feed():
+        for i in range(3):
+            await queue.put(make_tick(i, 'ES'))
+            await asyncio.sleep(0.02)
+
+    async def main():
+        await asyncio.wait_for(asyncio.gather(feed(), queue.consume(multi.on_tick)), timeout=5)
+    with pytest.raises(RuntimeError, match='broker down'):
+        asyncio.run(main())
+    assert multi.flush_error is None
+
+@pytest.mark.parametrize('option', ['latency_tracking', 'inference_executor'])
+def test_unsupported_options_are_rejected(tmp_path, option):
+    config = make_config(tmp_path)
+    setattr(config, option, True)
+    with pytest.raises(ValueError, match=option):
+        MultiInstrumentPipeline(config, SYMBOLS, load_models=False)
@@ -0,0 +1,153 @@
+import pytest
+import asyncio
+from trading_system.execution_module import ExecutionModule
+from trading_system.order_gateway import (
+    CANCELLED, FILLED, PARTIAL, PENDING, Contract, OrderGateway, SimulatedBroker,
+)
+
+class DummyConfig:
+    prediction_horizon = 10.0
+    profit_target = 1.0
+    stop_loss = 0.5
+    max_positions = 2
+    use_position_rl = False
+    print_fills = True
+
+def make_tick(price, timestamp):
+    return {'last_price': price, 'timestamp': timestamp}
+
+def make_gateway(**broker_kwargs):
+    gateway = OrderGateway(SimulatedBroker(**broker_kwargs), Contract('ES'))
+    gateway.update_market(make_tick(100.0, 0.0))
+    return gateway
+
+def test_submit_does_not_wait_for_fill():
+    async def main():
+        gateway = make_gateway(latency=0.01, slippage=0.25)
+        trade = gateway.submit('BUY', 1)
+        order_id = trade.order.orderId
+        # Returned at once, before acknowledgement or fill
+        assert gateway.states[order_id] == PENDING and gateway.position == 0
+        await asyncio.sleep(0.05)
+        return gateway, trade
+    gateway, trade = asyncio.run(main())
+    assert gateway.states[trade.order.orderId] == FILLED
+    assert gateway.by_state[FILLED] == {trade.order.orderId}
+    assert not gateway.open_orders()
+    assert gateway.position == 1
+    # Slippage is adverse to the order
+    assert trade.orderStatus.avgFillPrice == 100.25
+    assert gateway.fill_latency.count == 1
+
+def test_partial_fills_update_position_per_fill():
+    states = []
+
+    async def main():
+        gateway = make_gateway(latency=0.005, partial_fill_units=1)
+        gateway.on_fill = lambda trade, fill: states.append((gateway.states[trade.order.orderId], gateway.position))
+        trade = gateway.submit('SELL', 3)
+        await asyncio.sleep(0.1)
+        return gateway, trade
+    gateway, trade = asyncio.run(main())
+    assert [fill.execution.shares for fill in trade.fills] == [1, 1, 1]
+    # on_fill runs before the state is updated from the fill
+    assert [position for _, position in states] == [-1, -2, -3]
+    assert [state for state, _ in states] == [PENDING, PARTIAL, PARTIAL]
+    assert gateway.states[trade.order.orderId] == FILLED
+
+def test_cancel_working_order():
+    done = []
+
+    async def main():
+        gateway = make_gateway(latency=1.0)
+        gateway.on_done = done.append
+        trade = gateway.submit('BUY', 2)
+        await asyncio.sleep(0)
+        gateway.cancel_all()
+        return gateway, trade
+    gateway, trade = asyncio.run(main())
+    assert gateway.states[trade.order.orderId] == CANCELLED
+    assert done == [trade]
+    assert gateway.position == 0
+
+def test_filled_status_before_executions_is_not_final():
+    class StatusFirstBroker(SimulatedBroker):
+        # IB may report 'Filled' before the execution details
+        def _fill(self, trade):
+            handlers = self.execDetailsEvent.handlers
+            self.execDetailsEvent.handlers = []
+            super()._fill(trade)
+            self.execDetailsEvent.handlers = handlers
+            self.orderStatusEvent.emit(trade)
+            self.pending_exec = (trade, trade.fills[-1])
+
+    async def main():
+        broker = StatusFirstBroker(latency=0.0)
+        gateway = OrderGateway(broker, Contract('ES'))
+        gateway.update_market(make_tick(100.0, 0.0))
+        trade = gateway.submit('BUY', 1)
+        await asyncio.sleep(0.01)
+        assert gateway.states[trade.order.orderId] == PARTIAL
+        broker.execDetailsEvent.emit(*broker.pending_exec)
+        return gateway, trade
+    gateway, trade = asyncio.run(main())
+    assert gateway.states[trade.order.orderId] == FILLED
+    assert gateway.position == 1
+
+def test_execution_module_positions_follow_fills(capsys):
+    fills = []
+
+    async def main():
+        gateway = make_gateway(latency=0.005, slippage=0.25)
+        exec_mod = ExecutionModule(DummyConfig(), on_fill=fills.append, gateway=gateway)
+        await exec_mod.execute({'action': 'BUY'}, make_tick(100.0, 0.0))
+        # Order working: no position yet and further decisions are ignored
+        assert exec_mod.position == 0
+        await exec_mod.execute({'action': 'BUY'}, make_tick(100.0, 0.1))
+        await asyncio.sleep(0.02)
+        assert exec_mod.position == 1
+        assert exec_mod.entry_price == 100.25
+        assert exec_mod.entry_time == 0.0
+        # Profit target reached: the exit is submitted and filled at 101.5 - 0.25
+        await exec_mod.execute({'action': 'HOLD'}, make_tick(101.5, 1.0))
+        await asyncio.sleep(0.02)
+        return exec_mod, gateway
+    exec_mod, gateway = asyncio.run(main())
+    assert exec_mod.position == 0 and gateway.position == 0
+    assert exec_mod.realized_pnl == pytest.approx(1.0)
+    assert [(f['action'], f['price']) for f in fills] == [('ENTRY', 100.25), ('EXIT', 101.25)]
+    assert gateway.submitted == 2
+    assert 'Exited LONG position of 1 units for profit at 101.25' in capsys.readouterr().out
+
+def test_unfilled_order_times_out_and_exit_is_retried():
+    fills = []
+
+    async def main():
+        gateway = make_gateway(latency=0.005)
+        config = DummyConfig()
+        config.order_timeout = 2.0
+        exec_mod = ExecutionModule(config, on_fill=fills.append, gateway=gateway)
+        await exec_mod.execute({'action': 'BUY'}, make_tick(100.0, 0.0))
+        await asyncio.sleep(0.02)
+        assert exec_mod.position == 1
+        # The broker stops filling: the time exit is submitted but never completes
+        gateway.broker.latency = 3600.0
+        await exec_mod.execute({'action': 'HOLD'}, make_tick(100.0, 10.0))
+        stuck = exec_mod.working['order_id']
+        await exec_mod.execute({'action': 'HOLD'}, make_tick(100.0, 11.0))
+        assert exec_mod.working['order_id'] == stuck
+        # Past the timeout: cancelled, and the exit is submitted again on the same tick
+        await exec_mod.execute({'action': 'HOLD'}, make_tick(100.0, 12.0))
+        assert gateway.states[stuck] == CANCELLED
+        assert exec_mod.working['action'] == 'EXIT' and exec_mod.working['order_id'] != stuck
+        # Once the broker recovers the retried exit completes
+        gateway.broker.latency = 0.005
+        await exec_mod.execute({'action': 'HOLD'}, make_tick(100.0, 14.0))
+        await exec_mod.execute({'action': 'HOLD'}, make_tick(100.0, 14.1))
+        await asyncio.sleep(0.02)
+        return exec_mod, gateway
+    exec_mod, gateway = asyncio.run(main())
+    assert exec_mod.timed_out_orders == 2
+    assert exec_mod.position == 0 and gateway.position == 0
+    assert [f['action'] for f in fills] == ['ENTRY', 'EXIT']
+    assert gateway.submitted == 4
@@ -0,0 +1,47 @@
+import pytest
+import numpy as np
+import pandas as pd
+from trading_system.preprocess import parse_timestamps, preprocess_file
+from trading_system.tick_store import TickStore
+
+RAW_HEADER = "Date, Time, Open, High, Low, Last, Volume, NumberOfTrades, BidVolume, AskVolume\n"
+
+def write_raw(path, n):
+    start = pd.Timestamp('2024-01-02 22:00:00')
+    with open(path, 'w') as f:
+        f.write(RAW_HEADER)
+        for i in range(n):
+            t = start + pd.Timedelta(seconds=37 * i)
+            price = 4400 + (i % 7) * 0.25
+            f.write(f"{t:%Y/%m/%d}, {t:%H:%M:%S},{price},{price + 0.25},{price - 0.25},{price},3,1,{i % 5},{i % 3}\n")
+
+def test_parse_timestamps_matches_to_datetime():
+    dates = np.array(['2024/01/02', '2024/02/29', ' 2023/12/31', '1999/07/04'])
+    times = np.array([' 09:30:00', '23:59:59', ' 00:00:01.250', '12:00:00'])
+    expected = pd.to_datetime(np.char.strip(dates) + ' ' + np.char.strip(times), format='mixed')
+    expected = expected.to_numpy().astype('datetime64[ns]').astype('int64') / 1e9
+    np.testing.assert_allclose(parse_timestamps(dates, times), expected)
+
+def test_parse_timestamps_rejects_other_formats():
+    with pytest.raises(ValueError):
+        parse_timestamps(np.array(['01/02/2024']), np.array(['09:30:00']))
+    with pytest.raises(ValueError):
+        parse_timestamps(np.array(['2024/01/02']), np.array(['9:30']))
+
+def test_chunked_and_parallel_output_match(tmp_path):
+    raw = tmp_path / 'raw.csv'
+    write_raw(raw, 5000)
+    whole = preprocess_file(str(raw), str(tmp_path / 'whole.csv'))
+    chunked = preprocess_file(str(raw), str(tmp_path / 'chunked.csv'), chunk_bytes=4096, workers=2,
+                              store_dir=str(tmp_path / 'store'))
+    assert whole['rows'] == chunked['rows'] == 5000
+    assert (tmp_path / 'whole.csv').read_bytes() == (tmp_path / 'chunked.csv').read_bytes()
+    df = pd.read_csv(tmp_path / 'whole.csv')
+    assert list(df.columns) == ['timestamp', 'best_bid', 'best_ask', 'bid_size', 'ask_size', 'last_price']
+    assert df['timestamp'].iloc[0] == pd.Timestamp('2024-01-02 22:00:00', tz='UTC').timestamp()
+    assert np.all(np.diff(df['timestamp']) == 37)
+    # Store partitions are trading dates: ticks from 17:00 belong to the next day's session
+    store = TickStore(str(tmp_path / 'store'))
+    assert store.dates() == ['2024-01-03', '2024-01-04', '2024-01-05']
+    assert store.session_open_hour == 17
+    np.testing.assert_array_equal(store.load()['timestamp'], df['timestamp'].to_numpy())
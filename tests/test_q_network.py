@@ -0,0 +1,70 @@
+import pytest
+import numpy as np
+import torch
+import gymnasium as gym
+from stable_baselines3 import DQN
+from trading_system.decision_model import DecisionModel
+from trading_system.feature_buffer import FeatureRingBuffer
+from trading_system.q_network import QNetworkPolicy, load_dqn_policy
+
+# Window of 5 feature vectors plus the account channels
+OBS_SIZE = 5 * 4 + 3
+
+class FlatEnv(gym.Env):
+    observation_space = gym.spaces.Box(-np.inf, np.inf, (OBS_SIZE,), np.float32)
+    action_space = gym.spaces.Discrete(3)
+
+    def reset(self, seed=None, options=None):
+        return np.zeros(OBS_SIZE, np.float32), {}
+
+    def step(self, action):
+        return np.zeros(OBS_SIZE, np.float32), 0.0, False, False, {}
+
+class DummyConfig:
+    alpha_threshold_up = 0.6
+    alpha_threshold_down = 0.4
+    use_rl = True
+    rl_window_size = 5
+
+def save_dqn(path, **policy_kwargs):
+    model = DQN('MlpPolicy', FlatEnv(), policy_kwargs=policy_kwargs, seed=0)
+    model.save(path)
+    return DQN.load(path)
+
+@pytest.mark.parametrize('policy_kwargs', [{}, {'net_arch': [32, 16, 8], 'activation_fn': torch.nn.Tanh}])
+def test_actions_match_dqn_predict(tmp_path, policy_kwargs):
+    path = str(tmp_path / 'dqn.zip')
+    model = save_dqn(path, **policy_kwargs)
+    policy = QNetworkPolicy.load(path)
+    assert policy.observation_shape == (OBS_SIZE,)
+    states = np.random.default_rng(0).normal(size=(2000, OBS_SIZE)).astype(np.float32)
+    expected = [int(model.predict(state, deterministic=True)[0]) for state in states]
+    assert [policy.predict(state)[0] for state in states] == expected
+    with torch.no_grad():
+        q_ref = model.q_net(torch.from_numpy(states[:1])).numpy()[0]
+    np.testing.assert_allclose(policy.q_values(states[0]), q_ref, rtol=1e-5, atol=1e-6)
+
+def test_unknown_backend(tmp_path):
+    path = str(tmp_path / 'dqn.zip')
+    save_dqn(path)
+    with pytest.raises(ValueError):
+        load_dqn_policy(path, backend='onnx')
+
+def test_decision_model_backends_agree(tmp_path):
+    config = DummyConfig()
+    config.rl_model_path = str(tmp_path / 'dqn.zip')
+    save_dqn(config.rl_model_path)
+    decisions = {}
+    for backend in ('numpy', 'sb3'):
+        config.rl_inference_backend = backend
+        buffer = FeatureRingBuffer(config.rl_window_size)
+        model = DecisionModel(config, buffer)
+        model.warmup()
+        rng = np.random.default_rng(1)
+        actions = []
+        for _ in range(200):
+            features = dict(zip(buffer.feature_names, rng.normal(size=len(buffer.feature_names))))
+            buffer.append(features)
+            actions.append(model.decide(0.5, features)['action'])
+        decisions[backend] = actions
+    assert decisions['numpy'] == decisions['sb3']
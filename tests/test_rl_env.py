@@ -1,8 +1,11 @@
 import pytest
-pytest.skip("Skipping RL environment tests due to numpy segmentation fault issues", allow_module_level=True)
 import pandas as pd
 import numpy as np
-from trading_system.rl_env import TradingEnv
+from trading_system.config import Config
+from trading_system.decision_model import DecisionModel
+from trading_system.feature_engineering import FEATURE_NAMES, FeatureEngineer
+from trading_system.observation import build_observation
+from trading_system.rl_env import TradingEnv, compute_env_arrays
 
 def create_df(n_rows):
     return pd.DataFrame({
@@ -10,6 +13,19 @@ def create_df(n_rows):
         'best_ask': np.arange(n_rows, dtype=float) + 1,
         'bid_size': np.ones(n_rows, dtype=int),
         'ask_size': np.ones(n_rows, dtype=int),
+        'last_price': np.arange(n_rows, dtype=float),
+    })
+
+def random_df(n_rows, seed=0):
+    rng = np.random.default_rng(seed)
+    bid = 4400 + np.cumsum(rng.choice([-0.25, 0.0, 0.25], n_rows))
+    return pd.DataFrame({
+        'timestamp': 1.7e9 + 0.25 * np.arange(n_rows),
+        'best_bid': bid,
+        'best_ask': bid + rng.choice([0.25, 0.5], n_rows),
+        'bid_size': rng.integers(0, 50, n_rows),
+        'ask_size': rng.integers(0, 50, n_rows),
+        'last_price': bid + 0.25,
     })
 
 def test_reset_and_step():
@@ -17,7 +33,7 @@ def test_reset_and_step():
     env = TradingEnv(df, window_size=2, fee=0.0, risk_lambda=0.0)
     obs = env.reset()
     assert isinstance(obs, np.ndarray)
-    assert obs.shape == (2 * 3 + 3,)
+    assert obs.shape == (2 * len(FEATURE_NAMES) + 3,)
 
     obs2, reward, done, info = env.step(1)
     assert isinstance(obs2, np.ndarray)
@@ -28,10 +44,171 @@ def test_reset_and_step():
 
 def test_buy_and_sell_rewards():
     df = create_df(4)
-    env = TradingEnv(df, window_size=2, fee=0.0, risk_lambda=0.0)
+    env = TradingEnv(df, window_size=2, fee=0.5, risk_lambda=0.25)
     env.reset()
+    # Mid price rises by 1 per tick; the new position is marked to the next tick
     obs, reward, done, _ = env.step(2)
     assert env.position == 1
-    assert reward == pytest.approx(0.0)
+    assert reward == pytest.approx(1.0 - 0.5 - 0.25)
+    assert obs[-3] == pytest.approx(1.0)
     obs, reward, done, _ = env.step(0)
-    assert env.position == 0
\ No newline at end of file
+    assert env.position == 0
+    assert reward == pytest.approx(-0.5)
+    # Cash holds the realized 1.0 gain
+    assert env.cash == pytest.approx(1.0)
+
+def test_position_is_clipped():
+    env = TradingEnv(create_df(10), window_size=2, max_position=1)
+    env.reset()
+    env.step(2)
+    _, _, _, _ = env.step(2)
+    assert env.position == 1
+
+def test_observation_window():
+    df = random_df(100)
+    data = compute_env_arrays(df)
+    env = TradingEnv(df, window_size=5)
+    env.reset()
+    for _ in range(10):
+        obs, _, _, _ = env.step(1)
+    t = env.current_step
+    window = data['features'][t - 4:t + 1].astype(np.float64)
+    std = window.std(axis=0)
+    expected = (window - window.mean(axis=0)) / np.where(std > 0, std, 1.0)
+    np.testing.assert_allclose(obs[:-3], expected.reshape(-1), rtol=1e-6, atol=1e-6)
+    # Only the window's ticks enter the observation: later data does not change it
+    truncated = TradingEnv(df.iloc[:t + 2], window_size=5)
+    truncated.reset()
+    for _ in range(10):
+        truncated_obs, _, _, _ = truncated.step(1)
+    np.testing.assert_array_equal(truncated_obs, obs)
+
+def test_vec_env_matches_single_env():
+    pytest.importorskip('stable_baselines3')
+    from trading_system.vec_env import VecTradingEnv
+    df = random_df(500)
+    env = TradingEnv(df, window_size=10, fee=0.1, risk_lambda=0.01, max_position=2)
+    venv = VecTradingEnv(df, num_envs=3, window_size=10, fee=0.1, risk_lambda=0.01, max_position=2, seed=0)
+    obs = env.reset()
+    venv.reset()
+    venv.current_step[:] = env.current_step
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        action = rng.integers(0, 3)
+        obs, reward, _, _ = env.step(action)
+        vobs, vrewards, vdones, _ = venv.step(np.full(3, action))
+        np.testing.assert_allclose(vobs, np.tile(obs, (3, 1)), rtol=1e-6)
+        np.testing.assert_allclose(vrewards, reward, rtol=1e-5, atol=1e-6)
+        assert not vdones.any()
+
+def test_vec_env_truncates_and_resets():
+    pytest.importorskip('stable_baselines3')
+    from trading_system.vec_env import VecTradingEnv
+    venv = VecTradingEnv(random_df(200), num_envs=4, window_size=5, episode_length=7, seed=3)
+    venv.reset()
+    for _ in range(6):
+        _, _, dones, _ = venv.step(np.full(4, 2))
+        assert not dones.any()
+    obs, _, dones, infos = venv.step(np.full(4, 2))
+    assert dones.all()
+    assert all(info['TimeLimit.truncated'] for info in infos)
+    assert infos[0]['terminal_observation'][-3] == pytest.approx(1.0)
+    # Auto-reset environments start flat
+    np.testing.assert_array_equal(obs[:, -3], 0.0)
+    assert (venv.episode_steps == 0).all()
+    # Attributes are shared by all environments
+    venv.set_attr('episode_length', 9, indices=range(4))
+    assert venv.get_attr('episode_length') == [9] * 4
+    with pytest.raises(ValueError):
+        venv.set_attr('episode_length', 3, indices=[0])
+
+def test_subproc_env_matches_native_shards():
+    pytest.importorskip('stable_baselines3')
+    from trading_system.vec_env import SubprocTradingEnv, VecTradingEnv
+    df = random_df(300)
+    kwargs = dict(window_size=5, fee=0.1, episode_length=20)
+    venv = SubprocTradingEnv(df, num_envs=4, num_workers=2, seed=7, **kwargs)
+    try:
+        shards = [VecTradingEnv(df, num_envs=2, seed=7 + i, **kwargs) for i in range(2)]
+        obs = venv.reset()
+        np.testing.assert_array_equal(obs, np.concatenate([shard.reset() for shard in shards]))
+        assert venv.get_attr('window_size') == [5] * 4
+        # Attributes are set per shard, never for part of one
+        venv.set_attr('fee', 0.2, indices=[2, 3])
+        assert venv.get_attr('fee') == [0.1, 0.1, 0.2, 0.2]
+        with pytest.raises(ValueError):
+            venv.set_attr('fee', 0.3, indices=[1, 2])
+        venv.set_attr('fee', 0.1)
+        rng = np.random.default_rng(0)
+        for _ in range(50):
+            actions = rng.integers(0, 3, 4)
+            obs, rewards, dones, infos = venv.step(actions)
+            expected = [shard.step(actions[2 * i:2 * i + 2]) for i, shard in enumerate(shards)]
+            np.testing.assert_array_equal(obs, np.concatenate([e[0] for e in expected]))
+            np.testing.assert_array_equal(rewards, np.concatenate([e[1] for e in expected]))
+            np.testing.assert_array_equal(dones, np.concatenate([e[2] for e in expected]))
+            assert len(infos) == 4
+    finally:
+        venv.close()
+
+def test_throughput_callback_reports():
+    pytest.importorskip('stable_baselines3')
+    from stable_baselines3 import DQN
+    from trading_system.vec_env import ThroughputCallback, VecTradingEnv
+    venv = VecTradingEnv(random_df(300), num_envs=4, window_size=5, seed=0)
+    model = DQN('MlpPolicy', venv, learning_starts=1000, seed=0)
+    callback = ThroughputCallback(report_every=100)
+    model.learn(total_timesteps=400, callback=callback)
+    assert callback.steps_per_sec > 0
+    assert callback.elapsed_sec > 0
+
+def test_live_models_observe_like_the_env():
+    config = Config()
+    config.rolling_features = ['volatility', 'ofi']
+    config.max_positions = 2
+    df = random_df(80)
+    env = TradingEnv(df, window_size=6, max_position=config.max_positions, config=config)
+    env.reset()
+    for action in [2, 2, 1, 0]:
+        obs, _, _, _ = env.step(action)
+    config.use_rl = True
+    config.rl_window_size = 6
+    engineer = FeatureEngineer(config)
+    model = DecisionModel(config, rl_model=object())
+    for tick in df.iloc[:env.current_step + 1].to_dict('records'):
+        engineer.update(tick)
+        model.buffer.append(engineer.compute_features())
+
+    class Account:
+        position = int(env.position)
+        entry_price = float(env.entry_price)
+        realized_pnl = float(env.cash + env.position * env.entry_price)
+    np.testing.assert_allclose(model.observation(Account), obs, rtol=1e-5, atol=1e-5)
+
+def test_dqn_trained_in_vec_env_drives_decision_model(tmp_path):
+    pytest.importorskip('stable_baselines3')
+    from stable_baselines3 import DQN
+    from trading_system.vec_env import VecTradingEnv
+    config = Config()
+    config.use_rl = True
+    config.rl_window_size = 10
+    config.rl_model_path = str(tmp_path / 'rl_model.zip')
+    df = random_df(400)
+    venv = VecTradingEnv(df, num_envs=2, window_size=config.rl_window_size,
+                         max_position=config.max_positions, seed=0, config=config)
+    agent = DQN('MlpPolicy', venv, learning_starts=50, seed=0)
+    agent.learn(total_timesteps=200)
+    agent.save(config.rl_model_path)
+    for backend in ('numpy', 'sb3'):
+        config.rl_inference_backend = backend
+        model = DecisionModel(config)
+        model.warmup()
+        engineer = FeatureEngineer(config)
+        actions = set()
+        for tick in df.iloc[:50].to_dict('records'):
+            engineer.update(tick)
+            actions.add(model.decide(0.5, engineer.compute_features())['action'])
+        assert actions <= {'BUY', 'SELL', 'HOLD'}
+    config.rl_window_size = 12
+    with pytest.raises(ValueError, match='retrain'):
+        DecisionModel(config)
@@ -0,0 +1,77 @@
+import math
+import numpy as np
+import pytest
+from trading_system import rolling
+
+def make_series(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    # Irregular spacing with repeated timestamps
+    times = np.cumsum(rng.choice([0.0, 0.1, 0.25, 1.0, 3.0], size=n)) + 1000.0
+    values = 4400 + rng.normal(size=n).cumsum()
+    return times, values
+
+def brute_force(times, values, window, reduce):
+    out = []
+    for i, t in enumerate(times):
+        inside = [values[j] for j in range(i + 1) if times[j] > t - window]
+        out.append(reduce(inside))
+    return np.array(out)
+
+def stream(operator, *columns):
+    return np.array([operator.update(*row) for row in zip(*[np.asarray(c).tolist() for c in columns])])
+
+@pytest.mark.parametrize('window', [0.5, 2.0, 10.0])
+def test_sum_min_max_match_brute_force(window):
+    times, values = make_series()
+    expected_sum = brute_force(times, values, window, sum)
+    np.testing.assert_allclose(stream(rolling.RollingSum(window), times, values), expected_sum, rtol=1e-12)
+    np.testing.assert_allclose(rolling.rolling_sum(times, values, window), expected_sum, rtol=1e-12)
+    for operator, batch, reduce in ((rolling.RollingMax, rolling.rolling_max, max),
+                                    (rolling.RollingMin, rolling.rolling_min, min)):
+        expected = brute_force(times, values, window, reduce)
+        np.testing.assert_array_equal(stream(operator(window), times, values), expected)
+        np.testing.assert_array_equal(batch(times, values, window), expected)
+
+def test_std_and_vwap_match_brute_force():
+    times, values = make_series()
+    volumes = np.random.default_rng(1).integers(0, 5, size=len(values)).astype(float)
+    expected_std = brute_force(times, values, 5.0, np.std)
+    np.testing.assert_allclose(stream(rolling.RollingStd(5.0), times, values), expected_std, atol=1e-9)
+    np.testing.assert_allclose(rolling.rolling_std(times, values, 5.0), expected_std, atol=1e-9)
+    pairs = list(zip(values, volumes))
+
+    def vwap(items):
+        volume = sum(v for _, v in items)
+        return sum(p * v for p, v in items) / volume if volume else math.nan
+    expected_vwap = brute_force(times, pairs, 5.0, vwap)
+    np.testing.assert_allclose(stream(rolling.RollingVWAP(5.0), times, values, volumes), expected_vwap, rtol=1e-12)
+    np.testing.assert_allclose(rolling.rolling_vwap(times, values, volumes, 5.0), expected_vwap, rtol=1e-12)
+
+def test_running_sum_refresh_bounds_drift():
+    operator = rolling.RollingSum(1.0)
+    for i in range(3 * rolling.REFRESH_EVICTIONS):
+        total = operator.update(i * 0.1, 1e8 if i % 2 else 1e-8)
+    assert len(operator) == 10
+    assert total == pytest.approx(5 * 1e8 + 5 * 1e-8, rel=1e-15)
+
+def test_ema_decays_with_elapsed_time():
+    ema = rolling.EMA(2.0)
+    assert ema.update(0.0, 10.0) == 10.0
+    assert ema.update(2.0, 20.0) == pytest.approx(20.0 - 10.0 * math.exp(-1.0))
+    times, values = make_series()
+    np.testing.assert_array_equal(rolling.ema(times, values, 3.0), stream(rolling.EMA(3.0), times, values))
+
+def test_order_flow_imbalance():
+    ofi = rolling.OrderFlowImbalance()
+    assert ofi.update(100.0, 100.25, 10, 12) == 0.0
+    # Bid size grows at the same price: +5
+    assert ofi.update(100.0, 100.25, 15, 12) == 5.0
+    # Bid ticks up (new size 3), ask ticks up (old ask size 12 removed from selling pressure)
+    assert ofi.update(100.25, 100.5, 3, 8) == 3 + 12
+    bid = [100.0, 100.0, 100.25, 100.0]
+    ask = [100.25, 100.25, 100.5, 100.25]
+    bid_size = [10, 15, 3, 7]
+    ask_size = [12, 12, 8, 9]
+    stream_ofi = rolling.OrderFlowImbalance()
+    expected = [stream_ofi.update(*row) for row in zip(bid, ask, bid_size, ask_size)]
+    np.testing.assert_array_equal(rolling.order_flow_imbalance(bid, ask, bid_size, ask_size), expected)
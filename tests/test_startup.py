@@ -0,0 +1,88 @@
+import asyncio
+import os
+import subprocess
+import sys
+import torch
+from trading_system.config import Config
+from trading_system.alpha_model import AlphaModel, LSTMAlphaNet
+from trading_system.pipeline import TradingPipeline
+from trading_system.run import format_startup_report
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+# Generous wall-clock budget for importing trading_system.run, raised on
+# machines where importing numpy alone is slow
+IMPORT_BUDGET_SEC = 1.0
+IMPORT_BUDGET_BASELINES = 10
+
+def make_tick(i):
+    price = 4400 + 0.25 * (i % 9)
+    return {'timestamp': float(i), 'best_bid': price - 0.25, 'best_ask': price + 0.25,
+            'bid_size': 5, 'ask_size': 7, 'last_price': price}
+
+def make_config(tmp_path):
+    config = Config()
+    config.alpha_model_path = str(tmp_path / 'alpha.pth')
+    config.sequence_length = 5
+    net = LSTMAlphaNet(len(AlphaModel.FEATURE_NAMES), config.hidden_size, config.num_layers)
+    torch.save(net.state_dict(), config.alpha_model_path)
+    return config
+
+def test_minimal_import_is_fast_and_skips_heavy_deps():
+    # numpy (which run.py needs anyway) is timed first as a baseline for the machine's speed
+    code = (
+        "import sys, time\n"
+        "start = time.perf_counter()\n"
+        "import numpy\n"
+        "baseline = time.perf_counter() - start\n"
+        "start = time.perf_counter()\n"
+        "import trading_system.run\n"
+        "elapsed = time.perf_counter() - start\n"
+        "heavy = [m for m in ('torch', 'stable_baselines3', 'zmq') if m in sys.modules]\n"
+        "print(elapsed, baseline, ','.join(heavy))\n"
+    )
+    # Best of a few runs to ignore a cold filesystem cache
+    timings = []
+    for _ in range(3):
+        out = subprocess.run([sys.executable, '-c', code], cwd=REPO_ROOT, check=True,
+                             capture_output=True, text=True).stdout.split()
+        assert len(out) == 2, f"heavy modules imported: {out[2]}"
+        timings.append((float(out[0]), float(out[1])))
+    elapsed, baseline = min(timings)
+    # ~0.15s here; importing torch alone takes over 1.5s
+    assert elapsed < max(IMPORT_BUDGET_SEC, IMPORT_BUDGET_BASELINES * baseline), timings
+
+def test_pipeline_warms_up_features_until_models_load(tmp_path):
+    config = make_config(tmp_path)
+    pipeline = TradingPipeline(config, load_models=False)
+    assert pipeline.alpha_model is None
+
+    async def main():
+        for i in range(3):
+            await pipeline.on_tick(make_tick(i))
+        await pipeline.load_models_async()
+        for i in range(3, 10):
+            await pipeline.on_tick(make_tick(i))
+    asyncio.run(main())
+    assert pipeline.warmup_ticks == 3
+    assert pipeline.models_ready
+    # The feature history includes the warm-up ticks
+    assert pipeline.feature_buffer.count == 10
+    assert set(pipeline.startup_timings) == {
+        'alpha_import', 'alpha_load', 'decision_load', 'position_load', 'first_inference'}
+    assert 'first inference' in format_startup_report(pipeline.startup_timings, warmup_ticks=3)
+
+def test_background_load_matches_eager_pipeline(tmp_path):
+    config = make_config(tmp_path)
+    eager = TradingPipeline(config)
+    lazy = TradingPipeline(config, load_models=False)
+    lazy.load_models()
+    ticks = [make_tick(i) for i in range(40)]
+
+    async def main(pipeline):
+        for tick in ticks:
+            await pipeline.on_tick(tick)
+    asyncio.run(main(eager))
+    asyncio.run(main(lazy))
+    assert lazy.execution_module.position == eager.execution_module.position
+    assert lazy.execution_module.entry_price == eager.execution_module.entry_price
+    assert lazy.execution_module.realized_pnl == eager.execution_module.realized_pnl
@@ -0,0 +1,58 @@
+import pickle
+import numpy as np
+import pytest
+from torch.utils.data import DataLoader
+from trading_system.streaming_dataset import ShardedWindowDataset
+
+def make_data(tmp_path, n_rows=1000, sequence_length=5):
+    # Feature value = row index, so a window identifies its start row
+    features = np.repeat(np.arange(n_rows, dtype=np.float32)[:, None], 3, axis=1)
+    labels = (np.arange(n_rows - sequence_length + 1) % 7).astype(np.float32)
+    np.save(tmp_path / 'features.npy', features)
+    np.save(tmp_path / 'labels.npy', labels)
+    return np.load(tmp_path / 'features.npy', mmap_mode='r'), np.load(tmp_path / 'labels.npy', mmap_mode='r')
+
+def collect(loader):
+    starts, labels = [], []
+    for x, y in loader:
+        x = x.numpy()
+        # Every window is a run of consecutive rows
+        np.testing.assert_array_equal(x[:, :, 0] - x[:, :1, 0], np.broadcast_to(np.arange(x.shape[1]), x.shape[:2]))
+        starts.extend(x[:, 0, 0].astype(int).tolist())
+        labels.extend(y.numpy().tolist())
+    return np.array(starts), np.array(labels)
+
+@pytest.mark.parametrize('num_workers', [0, 2])
+def test_every_window_once_per_epoch(tmp_path, num_workers):
+    features, labels = make_data(tmp_path)
+    dataset = ShardedWindowDataset(features, labels, 5, batch_size=32, shard_size=100, seed=3)
+    assert dataset.shard_size == 96 and dataset.num_shards == 11
+    kwargs = {'num_workers': num_workers, 'prefetch_factor': dataset.prefetch} if num_workers else {}
+    loader = DataLoader(dataset, batch_size=None, **kwargs)
+    starts, batch_labels = collect(loader)
+    assert sorted(starts.tolist()) == list(range(len(labels)))
+    np.testing.assert_array_equal(batch_labels, labels[starts])
+    dataset.set_epoch(1)
+    next_starts, _ = collect(loader)
+    assert sorted(next_starts.tolist()) == list(range(len(labels)))
+    assert not np.array_equal(starts, next_starts)
+
+def test_batches_reuse_preallocated_buffers(tmp_path):
+    features, labels = make_data(tmp_path)
+    dataset = ShardedWindowDataset(features, labels, 5, batch_size=64, shard_size=256)
+    pointers = {x.data_ptr() for x, _ in dataset}
+    assert len(pointers) == dataset.prefetch + 2
+
+def test_memmaps_are_reopened_not_copied(tmp_path):
+    features, labels = make_data(tmp_path)
+    # Validation-style slice that does not start at the beginning of the file
+    dataset = ShardedWindowDataset(features[500:], labels[500:], 5, batch_size=16)
+    state = pickle.dumps(dataset)
+    assert len(state) < 2000
+    restored = pickle.loads(state)
+    np.testing.assert_array_equal(restored.features, features[500:])
+    np.testing.assert_array_equal(restored.labels, labels[500:])
+
+def test_features_must_cover_labels():
+    with pytest.raises(ValueError):
+        ShardedWindowDataset(np.zeros((10, 3), dtype=np.float32), np.zeros(8, dtype=np.float32), 5, batch_size=4)
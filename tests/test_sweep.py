@@ -0,0 +1,46 @@
+import pytest
+import numpy as np
+from trading_system.shared_arrays import SharedArrays
+from trading_system.sweep import parameter_grid, random_search, evaluate_params, run_sweep
+
+def make_arrays(n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        'prices': 4400 + np.cumsum(rng.choice([-0.25, 0.0, 0.25], size=n)),
+        'timestamps': np.arange(n, dtype=float),
+        'predictions': rng.uniform(0.3, 0.7, size=n).astype(np.float32),
+    }
+
+def test_parameter_grid_and_random_search():
+    grid = parameter_grid({'profit_target': [0.25, 0.5], 'max_positions': [1, 2, 3]})
+    assert len(grid) == 6
+    assert {'profit_target': 0.5, 'max_positions': 3} in grid
+    samples = random_search({'profit_target': (0.25, 1.0), 'max_positions': (1, 3), 'stop_loss': [None, 0.5]}, 20, seed=1)
+    assert len(samples) == 20
+    assert all(0.25 <= s['profit_target'] <= 1.0 for s in samples)
+    assert all(isinstance(s['max_positions'], int) and 1 <= s['max_positions'] <= 3 for s in samples)
+    assert samples == random_search({'profit_target': (0.25, 1.0), 'max_positions': (1, 3), 'stop_loss': [None, 0.5]}, 20, seed=1)
+
+def test_shared_arrays_roundtrip():
+    arrays = make_arrays(100)
+    shared = SharedArrays.create(arrays)
+    try:
+        attached = SharedArrays.attach(shared.spec)
+        for name, values in arrays.items():
+            np.testing.assert_array_equal(attached.arrays[name], values)
+        assert not attached.arrays['prices'].flags.writeable
+        attached.close()
+    finally:
+        shared.unlink()
+
+def test_parallel_sweep_matches_serial():
+    arrays = make_arrays()
+    param_sets = parameter_grid({'alpha_threshold_up': [0.6, 0.65], 'profit_target': [0.25, 0.5], 'stop_loss': [None, 0.25]})
+    serial = run_sweep(arrays, param_sets, workers=1)
+    parallel = run_sweep(arrays, param_sets, workers=2)
+    assert len(serial) == len(param_sets)
+    assert serial.equals(parallel)
+    assert serial['sharpe'].is_monotonic_decreasing
+    row = evaluate_params(param_sets[0], arrays)
+    assert row['trades'] > 0
+    assert {'sharpe', 'total_pnl', 'trades', 'max_drawdown'} <= set(row)
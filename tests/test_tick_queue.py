@@ -0,0 +1,105 @@
+import pytest
+import asyncio
+from trading_system.tick_queue import TickQueue
+
+def make_tick(i, last_size=1):
+    return {'timestamp': float(i), 'best_bid': 4400.0 + i, 'best_ask': 4400.25 + i,
+            'bid_size': i, 'ask_size': 1, 'last_price': 4400.0 + i, 'last_size': last_size}
+
+def drain(queue):
+    ticks = []
+    while len(queue):
+        ticks.append(asyncio.run(queue.get())[1])
+    return ticks
+
+def test_drop_oldest_keeps_newest():
+    queue = TickQueue(maxsize=3, policy='drop_oldest')
+    for i in range(5):
+        asyncio.run(queue.put(make_tick(i)))
+    assert [tick['timestamp'] for tick in drain(queue)] == [2.0, 3.0, 4.0]
+    assert queue.dropped == 2
+    assert queue.max_depth == 3
+
+def test_conflate_merges_book_and_volume():
+    queue = TickQueue(maxsize=1, policy='conflate')
+    for i in range(4):
+        asyncio.run(queue.put(make_tick(i, last_size=i + 1)))
+    ticks = drain(queue)
+    assert len(ticks) == 1
+    assert ticks[0]['best_bid'] == 4403.0 and ticks[0]['bid_size'] == 3
+    assert ticks[0]['last_size'] == 1 + 2 + 3 + 4
+    assert queue.conflated == 3
+
+def test_conflate_per_symbol():
+    queue = TickQueue(maxsize=2, policy='conflate')
+    for i in range(6):
+        tick = make_tick(i)
+        tick['symbol'] = 'ES' if i % 2 == 0 else 'NQ'
+        asyncio.run(queue.put(tick))
+    ticks = drain(queue)
+    # Each symbol keeps its own latest book and summed volume
+    assert [(tick['symbol'], tick['timestamp'], tick['last_size']) for tick in ticks] == [
+        ('ES', 4.0, 3), ('NQ', 5.0, 3)]
+    # Conflating into a symbol with nothing queued falls back to dropping the oldest
+    for i, symbol in enumerate(['ES', 'NQ', 'RTY']):
+        tick = make_tick(i)
+        tick['symbol'] = symbol
+        asyncio.run(queue.put(tick))
+    assert [tick['symbol'] for tick in drain(queue)] == ['NQ', 'RTY']
+    assert queue.dropped == 1
+
+def test_invalid_policy():
+    with pytest.raises(ValueError):
+        TickQueue(policy='lifo')
+
+async def run_feed(policy, n_ticks=200, maxsize=2):
+    # Feed faster than the consumer: one tick every 1ms, 5ms per decision
+    queue = TickQueue(maxsize=maxsize, policy=policy)
+    seen = []
+
+    async def feed():
+        for i in range(n_ticks):
+            await queue.put(make_tick(i))
+            await asyncio.sleep(0.001)
+
+    async def slow_strategy(tick):
+        seen.append(tick['timestamp'])
+        await asyncio.sleep(0.005)
+
+    consumer = asyncio.ensure_future(queue.consume(slow_strategy))
+    start = asyncio.get_running_loop().time()
+    await feed()
+    feed_time = asyncio.get_running_loop().time() - start
+    consumer.cancel()
+    return queue, seen, feed_time
+
+def test_block_policy_slows_feed():
+    queue, seen, feed_time = asyncio.run(run_feed('block', n_ticks=40))
+    # Every tick is processed but the feed is held back by the strategy
+    assert queue.dropped == queue.conflated == 0
+    assert feed_time >= 40 * 0.004
+
+def test_conflation_keeps_decisions_fresh():
+    queue, seen, _ = asyncio.run(run_feed('conflate'))
+    stats = queue.stats()
+    assert stats['conflated'] > 0
+    assert stats['enqueued'] == 200
+    assert seen == sorted(seen)
+    # Decisions lag by about one processing time, not a growing backlog
+    assert stats['age_p99_ms'] < 50
+
+def test_queue_stats_are_reported(capsys):
+    from trading_system.run import format_queue_report, report_queue
+    queue = TickQueue(2, 'drop_oldest')
+
+    async def main():
+        for i in range(5):
+            await queue.put(make_tick(i))
+        reporter = asyncio.ensure_future(report_queue(queue, 0.01))
+        await asyncio.sleep(0.025)
+        reporter.cancel()
+    asyncio.run(main())
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) >= 2
+    assert lines[0] == format_queue_report(queue.stats())
+    assert 'depth 2 (max 2)' in lines[0] and 'dropped 3' in lines[0]
@@ -0,0 +1,63 @@
+import pytest
+import numpy as np
+import pandas as pd
+from trading_system.tick_store import TickStore, TickStoreWriter, is_tick_store, load_tick_frame, trading_dates
+
+DAY = 86400.0
+
+def make_columns(n, start):
+    t = start + np.arange(n, dtype=float) * 3600.0
+    return {
+        'timestamp': t,
+        'best_bid': 4400 + np.arange(n) * 0.25,
+        'best_ask': 4400.25 + np.arange(n) * 0.25,
+        'bid_size': np.arange(n, dtype=np.int64),
+        'ask_size': np.ones(n, dtype=np.int64),
+        'last_price': 4400 + np.arange(n) * 0.25,
+    }
+
+def dates_for(timestamps):
+    return np.asarray(timestamps).astype('datetime64[s]').astype('datetime64[D]').astype(str)
+
+def test_write_and_load_by_date_range(tmp_path):
+    columns = make_columns(72, 1704153600.0)  # 2024-01-02 00:00 UTC, 3 days hourly
+    writer = TickStoreWriter(str(tmp_path))
+    # Appended in chunks that split a day
+    for lo, hi in [(0, 30), (30, 50), (50, 72)]:
+        writer.append({k: v[lo:hi] for k, v in columns.items()}, dates_for(columns['timestamp'][lo:hi]))
+    manifest = writer.close()
+    assert [p['rows'] for p in manifest['partitions']] == [24, 24, 24]
+    assert is_tick_store(str(tmp_path))
+
+    store = TickStore(str(tmp_path))
+    assert store.dates() == ['2024-01-02', '2024-01-03', '2024-01-04']
+    single = store.load('2024-01-03', '2024-01-03', columns=['timestamp', 'bid_size'])
+    assert set(single) == {'timestamp', 'bid_size'}
+    assert isinstance(single['timestamp'], np.memmap)
+    np.testing.assert_array_equal(single['bid_size'], columns['bid_size'][24:48])
+    both = store.load(start='2024-01-03')
+    np.testing.assert_array_equal(both['last_price'], columns['last_price'][24:])
+    assert len(store.load(start='2025-01-01')['timestamp']) == 0
+    with pytest.raises(KeyError):
+        store.load(columns=['volume'])
+
+def test_load_tick_frame_csv_and_store_agree(tmp_path):
+    columns = make_columns(72, 1704153600.0)
+    pd.DataFrame(columns).to_csv(tmp_path / 'ticks.csv', index=False)
+    writer = TickStoreWriter(str(tmp_path / 'store'))
+    writer.append(columns, trading_dates(columns['timestamp']))
+    writer.close()
+    from_csv = load_tick_frame(str(tmp_path / 'ticks.csv'), '2024-01-03', '2024-01-04')
+    from_store = load_tick_frame(str(tmp_path / 'store'), '2024-01-03', '2024-01-04')
+    assert len(from_csv) == 48
+    # 2024-01-03 opens at 17:00 on 2024-01-02
+    assert from_csv['timestamp'].iloc[0] == 1704153600.0 + 17 * 3600
+    pd.testing.assert_frame_equal(from_csv, from_store)
+    calendar = load_tick_frame(str(tmp_path / 'ticks.csv'), '2024-01-03', '2024-01-04', session_open_hour=None)
+    assert calendar['timestamp'].iloc[0] == 1704153600.0 + DAY
+
+def test_trading_dates_roll_at_session_open():
+    evening = 1704153600.0 + np.array([16 * 3600 + 3599, 17 * 3600, 23 * 3600])  # 2024-01-02
+    assert list(trading_dates(evening)) == ['2024-01-02', '2024-01-03', '2024-01-03']
+    assert list(trading_dates(evening, session_open_hour=18)) == ['2024-01-02', '2024-01-02', '2024-01-03']
+    assert list(trading_dates(evening, session_open_hour=None)) == ['2024-01-02'] * 3
@@ -0,0 +1,89 @@
+import os
+import subprocess
+import sys
+import numpy as np
+import pandas as pd
+import pytest
+import torch
+from trading_system.alpha_model import LSTMAlphaNet
+from trading_system.training import (
+    EarlyStopping, MetricsLog, chronological_split, evaluate, load_checkpoint, read_metrics, rng_state,
+    save_checkpoint, set_rng_state,
+)
+
+SCRIPT = os.path.join(os.path.dirname(__file__), '..', 'scripts', 'train_alpha_model.py')
+
+def test_chronological_split_leaves_gap():
+    assert chronological_split(100, 0.2, gap=5) == (75, 80)
+    assert chronological_split(100, 0.0, gap=5) == (100, 100)
+    with pytest.raises(ValueError):
+        chronological_split(10, 0.5, gap=5)
+
+def test_early_stopping_patience_and_state():
+    stopper = EarlyStopping(patience=2, min_delta=0.01)
+    assert stopper.update(1.0, 1)
+    assert not stopper.update(0.995, 2)
+    restored = EarlyStopping(patience=2, min_delta=0.01)
+    restored.load_state_dict(stopper.state_dict())
+    assert not restored.should_stop
+    assert not restored.update(1.2, 3)
+    assert restored.should_stop and restored.best_epoch == 1
+
+def test_evaluate_matches_full_batch():
+    torch.manual_seed(0)
+    model = LSTMAlphaNet(4, 8, 1)
+    features = np.random.default_rng(0).normal(size=(40, 4)).astype(np.float32)
+    labels = (np.arange(30) % 2).astype(np.float32)
+    loss, accuracy = evaluate(model, features, labels, 5, batch_size=7)
+    windows = torch.from_numpy(np.stack([features[k:k + 5] for k in range(30)]))
+    logits = model(windows)
+    expected = torch.nn.functional.binary_cross_entropy_with_logits(logits, torch.from_numpy(labels))
+    assert loss == pytest.approx(expected.item(), rel=1e-5)
+    assert accuracy == ((logits > 0).float().numpy() == labels).mean()
+    assert model.training
+
+def test_checkpoint_restores_rng_and_metrics_append(tmp_path):
+    path = str(tmp_path / 'run.ckpt')
+    save_checkpoint(path, {'rng': rng_state(), 'epochs_done': 2})
+    expected = (np.random.rand(), torch.rand(1).item())
+    set_rng_state(load_checkpoint(path)['rng'])
+    assert (np.random.rand(), torch.rand(1).item()) == expected
+    log = MetricsLog(str(tmp_path / 'metrics.jsonl'))
+    log.write(epoch=1, val_loss=0.5)
+    log.write(epoch=2, val_loss=0.4)
+    assert [record['epoch'] for record in read_metrics(log.path)] == [1, 2]
+    # Resuming from a checkpoint after epoch 1 drops the epochs that will be repeated
+    log.truncate(1)
+    log.write(epoch=2, val_loss=0.45)
+    assert [(r['epoch'], r['val_loss']) for r in read_metrics(log.path)] == [(1, 0.5), (2, 0.45)]
+
+def test_resumed_training_matches_uninterrupted(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 260
+    mid = 4400 + 0.25 * rng.integers(-1, 2, size=n).cumsum()
+    pd.DataFrame({
+        'timestamp': 1.7e9 + np.arange(n, dtype=float),
+        'best_bid': mid - 0.125, 'best_ask': mid + 0.125,
+        'bid_size': rng.integers(1, 20, size=n), 'ask_size': rng.integers(1, 20, size=n),
+        'last_price': mid,
+    }).to_csv(tmp_path / 'ticks.csv', index=False)
+
+    def train(model, *extra):
+        subprocess.run(
+            [sys.executable, os.path.abspath(SCRIPT), '--data-path', 'ticks.csv', '--model-output-path',
+             f'models/{model}.pth', '--no-cache', '--patience', '100', *extra],
+            cwd=tmp_path, check=True, capture_output=True,
+        )
+        return torch.load(tmp_path / 'models' / f'{model}.pth')
+
+    full = train('full', '--num-epochs', '3', '--validation-fraction', '0')
+    train('resumed', '--num-epochs', '2', '--validation-fraction', '0')
+    resumed = train('resumed', '--num-epochs', '3', '--validation-fraction', '0', '--resume')
+    for name in full:
+        assert torch.equal(full[name], resumed[name]), name
+    records = read_metrics(tmp_path / 'models' / 'resumed.metrics.jsonl')
+    assert [record['epoch'] for record in records] == [1, 2, 3]
+    assert all(record['samples_per_sec'] > 0 for record in records)
+    assert load_checkpoint(tmp_path / 'models' / 'resumed.ckpt')['epochs_done'] == 3
+    # The input features are saved next to the weights for AlphaModel to check
+    assert os.path.exists(tmp_path / 'models' / 'resumed.pth.features.json')
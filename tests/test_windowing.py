@@ -0,0 +1,46 @@
+import pytest
+import numpy as np
+from trading_system.windowing import sliding_windows, horizon_labels, build_sequences, WindowDataset
+
+def reference_sequences(features, prices, seq_len, n_shift):
+    X_seq, y_seq = [], []
+    for t in range(seq_len - 1, len(prices) - n_shift):
+        X_seq.append(features[t - seq_len + 1:t + 1].tolist())
+        y_seq.append(1.0 if prices[t + n_shift] > prices[t] else 0.0)
+    return np.array(X_seq, dtype=np.float32).reshape(-1, seq_len, features.shape[1]), np.array(y_seq, dtype=np.float32)
+
+def test_build_sequences_matches_loop():
+    rng = np.random.default_rng(0)
+    features = rng.normal(size=(40, 4)).astype(np.float32)
+    prices = rng.normal(size=40).cumsum()
+    seq_len, n_shift = 5, 3
+    windows, labels = build_sequences(features, prices, seq_len, n_shift)
+    X_ref, y_ref = reference_sequences(features, prices, seq_len, n_shift)
+    np.testing.assert_array_equal(windows, X_ref)
+    np.testing.assert_array_equal(labels, y_ref)
+
+def test_sliding_windows_is_a_view():
+    features = np.arange(20, dtype=np.float32).reshape(10, 2)
+    windows = sliding_windows(features, 4)
+    assert windows.shape == (7, 4, 2)
+    assert np.shares_memory(windows, features)
+    np.testing.assert_array_equal(windows[2], features[2:6])
+
+def test_short_inputs_give_empty_sequences():
+    features = np.zeros((3, 4), dtype=np.float32)
+    windows, labels = build_sequences(features, np.arange(3.0), 5, 2)
+    assert windows.shape == (0, 5, 4)
+    assert len(labels) == 0
+    assert len(horizon_labels(np.arange(3.0), 5)) == 0
+
+def test_window_dataset_batch_indexing():
+    features = np.arange(20, dtype=np.float32).reshape(10, 2)
+    windows, labels = build_sequences(features, np.arange(10.0), 3, 1)
+    dataset = WindowDataset(windows, labels)
+    assert len(dataset) == 7
+    batch_x, batch_y = dataset[[0, 4]]
+    assert batch_x.shape == (2, 3, 2)
+    np.testing.assert_array_equal(batch_x[1], features[4:7])
+    np.testing.assert_array_equal(batch_y, [1.0, 1.0])
+    with pytest.raises(ValueError):
+        WindowDataset(windows, labels[:-1])
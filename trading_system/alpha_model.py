@@ -2,10 +2,17 @@
 Alpha (price prediction) model interface.
 """
 import os
-from collections import deque
+import json
+import logging
+from typing import Optional, Tuple  # noqa: F401 (TorchScript type comments)
+
+import numpy as np
 import torch
 import torch.nn as nn
 
+from trading_system.feature_engineering import FEATURE_NAMES, feature_names
+from trading_system.feature_buffer import FeatureRingBuffer
+
 class LSTMAlphaNet(nn.Module):
     """
     LSTM-based neural network for price movement prediction.
@@ -23,13 +30,96 @@ class LSTMAlphaNet(nn.Module):
         # out: (batch, hidden_size)
         return self.fc(out).squeeze(-1)
 
+    @torch.jit.export
+    def step(self, x, state=None):
+        # type: (torch.Tensor, Optional[Tuple[torch.Tensor, torch.Tensor]]) -> Tuple[torch.Tensor, Tuple[torch.Tensor, torch.Tensor]]
+        """
+        Advances the LSTM over x from a carried (h, c) state.
+        x: (batch, steps, input_size); state None starts from zeros.
+        Returns (logits, new_state).
+        """
+        _, state = self.lstm(x, state)
+        return self.fc(state[0][-1]).squeeze(-1), state
+
+
+def export_torchscript(net, path, quantize=False):
+    """
+    Saves an LSTMAlphaNet as a frozen TorchScript module (forward and step).
+    With quantize=True the LSTM and Linear layers are dynamically quantized
+    to int8 first. The file can be loaded by AlphaModel with
+    config.alpha_model_format = 'torchscript'.
+    """
+    net.eval()
+    if quantize:
+        net = torch.ao.quantization.quantize_dynamic(net, {nn.LSTM, nn.Linear}, dtype=torch.qint8)
+    module = torch.jit.freeze(torch.jit.script(net), preserved_attrs=['step'])
+    torch.jit.save(module, path)
+    return module
+
+logger = logging.getLogger(__name__)
+
+
+def feature_spec_path(model_path):
+    """
+    Sidecar file recording the inputs a model file was trained on.
+    """
+    return model_path + '.features.json'
+
+
+def save_feature_spec(model_path, config):
+    """
+    Writes the feature names and rolling window of `config` next to model_path.
+    """
+    spec = {'feature_names': feature_names(config), 'rolling_window': getattr(config, 'rolling_window', 5.0)}
+    with open(feature_spec_path(model_path), 'w') as f:
+        json.dump(spec, f)
+
+
+def check_feature_spec(model_path, config):
+    """
+    Raises ValueError if the model was trained on different features (or a
+    different rolling window) than `config` computes. Models saved without
+    a feature spec are not checked.
+    """
+    path = feature_spec_path(model_path)
+    if not os.path.exists(path):
+        logger.warning(f"No feature spec at {path}; cannot check the alpha model's input features")
+        return
+    with open(path) as f:
+        spec = json.load(f)
+    names = feature_names(config)
+    window = getattr(config, 'rolling_window', 5.0)
+    # The window only changes the inputs when rolling features are used
+    rolling = len(names) > len(FEATURE_NAMES)
+    if spec['feature_names'] != names or (rolling and spec['rolling_window'] != window):
+        raise ValueError(
+            f"Alpha model {model_path} was trained with features {spec['feature_names']} "
+            f"(rolling_window {spec['rolling_window']}), but the config computes {names} "
+            f"(rolling_window {window}); set config.rolling_features and config.rolling_window "
+            "to match the model or retrain it"
+        )
+
+
 class AlphaModel:
     """
     Price prediction model that loads a trained LSTM PyTorch model.
+
+    By default every prediction runs the LSTM over the full window of the
+    last `sequence_length` feature vectors. With `config.alpha_streaming`
+    enabled, the (h, c) state is carried between ticks and each prediction
+    advances the LSTM by a single step. Because the carried state remembers
+    ticks older than the window, the state is rebuilt from the window every
+    `config.alpha_resync_interval` ticks; the difference between streaming
+    and windowed probabilities at each re-sync is tracked in `max_drift`
+    and logged when it exceeds `config.alpha_streaming_tolerance`.
+
+    When a shared FeatureRingBuffer is passed in, the pipeline appends each
+    tick's features to it and predict() only reads from it; otherwise the
+    model keeps a private buffer and appends on every predict() call.
     """
-    FEATURE_NAMES = ['mid_price', 'spread', 'bid_ask_ratio', 'recent_return']
+    FEATURE_NAMES = FEATURE_NAMES
 
-    def __init__(self, config):
+    def __init__(self, config, feature_buffer=None):
         self.config = config
         model_path = config.alpha_model_path
         if not os.path.exists(model_path):
@@ -37,34 +127,126 @@ class AlphaModel:
                 f"Alpha model not found at {model_path}. "
                 "Please train the model using scripts/train_alpha_model.py"
             )
-        # Initialize the network
-        input_size = len(self.FEATURE_NAMES)
-        self.model = LSTMAlphaNet(
-            input_size=input_size,
-            hidden_size=config.hidden_size,
-            num_layers=config.num_layers
-        )
-        # Load trained parameters
-        state_dict = torch.load(model_path, map_location=torch.device('cpu'))
-        self.model.load_state_dict(state_dict)
+        # Input features: FEATURE_NAMES plus any enabled rolling features
+        self.feature_names = feature_names(config)
+        check_feature_spec(model_path, config)
+        self.model_format = getattr(config, 'alpha_model_format', 'state_dict')
+        if self.model_format == 'torchscript':
+            # Exported (optionally int8-quantized) module; see export_torchscript()
+            self.model = torch.jit.load(model_path, map_location=torch.device('cpu'))
+        elif self.model_format == 'state_dict':
+            # Initialize the network
+            input_size = len(self.feature_names)
+            self.model = LSTMAlphaNet(
+                input_size=input_size,
+                hidden_size=config.hidden_size,
+                num_layers=config.num_layers
+            )
+            # Load trained parameters
+            state_dict = torch.load(model_path, map_location=torch.device('cpu'))
+            trained_size = state_dict['lstm.weight_ih_l0'].shape[1]
+            if trained_size != input_size:
+                raise ValueError(
+                    f"Alpha model {model_path} expects {trained_size} input features, but the config "
+                    f"computes {input_size} ({', '.join(self.feature_names)}); set config.rolling_features "
+                    "to match the model or retrain it"
+                )
+            self.model.load_state_dict(state_dict)
+        else:
+            raise ValueError(f"Unknown alpha model format: {self.model_format}")
         self.model.eval()
-        # Buffer to store recent feature vectors
-        self.buffer = deque(maxlen=config.sequence_length)
+        # Buffer of recent feature vectors (shared with other models if given)
+        self.owns_buffer = feature_buffer is None
+        self.buffer = FeatureRingBuffer(config.sequence_length, self.feature_names) if self.owns_buffer else feature_buffer
+        # Streaming (stateful) inference settings
+        self.streaming = getattr(config, 'alpha_streaming', False)
+        self.resync_interval = getattr(config, 'alpha_resync_interval', config.sequence_length)
+        self.streaming_tolerance = getattr(config, 'alpha_streaming_tolerance', 0.05)
+        self.state = None
+        self.ticks_since_sync = 0
+        self.last_count = 0
+        self.max_drift = 0.0
 
     def predict(self, features):
         """
         Returns a probability of upward price movement.
         Maintains a rolling window of feature vectors.
         """
-        # Append current features
-        x = [features.get(name, 0.0) for name in self.FEATURE_NAMES]
-        self.buffer.append(x)
+        # Append current features unless the pipeline already did
+        if self.owns_buffer:
+            self.buffer.append(features)
         # If not enough data, return neutral probability
         if len(self.buffer) < self.config.sequence_length:
             return 0.5
-        # Prepare input tensor
-        seq = torch.tensor([list(self.buffer)], dtype=torch.float32)
         with torch.no_grad():
-            logits = self.model(seq)
+            if self.streaming:
+                logits = self._predict_streaming()
+            else:
+                # Input tensor is a view over the buffer window
+                seq = torch.from_numpy(self.buffer.window(self.config.sequence_length)).unsqueeze(0)
+                logits = self.model(seq)
             proba = torch.sigmoid(logits).item()
-        return proba
\ No newline at end of file
+        return proba
+
+    def _predict_streaming(self):
+        """
+        Advances the carried LSTM state by one tick, re-syncing it from the
+        full window when it is missing, due, or ticks were skipped.
+        """
+        # The carried state is only valid if exactly one row arrived since the last call
+        contiguous = self.buffer.count == self.last_count + 1
+        self.last_count = self.buffer.count
+        step = torch.from_numpy(self.buffer.window(1)).unsqueeze(0)
+        if not contiguous:
+            self.state = None
+        if self.state is not None and self.ticks_since_sync < self.resync_interval:
+            logits, self.state = self.model.step(step, self.state)
+            self.ticks_since_sync += 1
+            return logits
+        seq = torch.from_numpy(self.buffer.window(self.config.sequence_length)).unsqueeze(0)
+        logits, state = self.model.step(seq)
+        if self.state is not None:
+            # Measure how far the carried state drifted from windowed inference
+            stream_logits, _ = self.model.step(step, self.state)
+            drift = abs(torch.sigmoid(stream_logits).item() - torch.sigmoid(logits).item())
+            self.max_drift = max(self.max_drift, drift)
+            if drift > self.streaming_tolerance:
+                logger.warning(
+                    f"Streaming alpha drifted {drift:.4f} from windowed inference "
+                    f"(tolerance {self.streaming_tolerance}); consider a shorter resync interval"
+                )
+        self.state = state
+        self.ticks_since_sync = 0
+        return logits
+
+    def warmup(self):
+        """
+        Runs one forward pass on an all-zero window (and one streaming step
+        when streaming) so first-call overheads are not paid on a live tick.
+        Leaves the buffer and the carried state untouched.
+        """
+        seq = torch.zeros(1, self.config.sequence_length, len(self.feature_names))
+        with torch.no_grad():
+            self.model(seq)
+            if self.streaming:
+                _, state = self.model.step(seq)
+                self.model.step(seq[:, -1:], state)
+
+    def predict_windows(self, windows, batch_size=4096):
+        """
+        Returns up-move probabilities for an array of feature windows
+        (n, sequence_length, n_features), evaluated in batches.
+        """
+        probas = np.empty(len(windows), dtype=np.float32)
+        with torch.no_grad():
+            for start in range(0, len(windows), batch_size):
+                batch = torch.from_numpy(np.ascontiguousarray(windows[start:start + batch_size], dtype=np.float32))
+                probas[start:start + batch_size] = torch.sigmoid(self.model(batch)).numpy()
+        return probas
+
+    def reset_state(self):
+        """
+        Drops the carried streaming state; the next prediction re-syncs.
+        """
+        self.state = None
+        self.ticks_since_sync = 0
@@ -9,15 +9,74 @@ class Config:
         # Thresholds for trade decision
         self.alpha_threshold_up = 0.6
         self.alpha_threshold_down = 0.4
-        # Profit target and stop-loss levels (price points)
+        # Profit target and stop-loss levels (price points); the stop-loss is
+        # opt-in (None disables it) so the default exit rules stay time and profit
         self.profit_target = 0.5
-        self.stop_loss = 0.25
+        self.stop_loss = None
+        # Hour of day, in the time zone of the historical tick timestamps, at
+        # which the session of the next trading date opens (ES Globex: 17:00 CT);
+        # tick store partitions and --start-date/--end-date use these trading
+        # dates (None = calendar dates)
+        self.session_open_hour = 17
         # Data feed polling interval (seconds)
         self.data_feed_interval = 1.0
+        # Market data source: 'simulated' or 'zmq'
+        self.data_source = 'simulated'
+        # ZeroMQ PUB endpoint publishing binary ticks (see tick_format.py)
+        self.zmq_endpoint = 'tcp://127.0.0.1:5556'
+        # Subscription topic prefix (b'' receives everything)
+        self.zmq_topic = b''
+        # Receive high-water mark (messages queued before the socket drops)
+        self.zmq_rcvhwm = 100000
+        # Maximum messages drained per wakeup
+        self.zmq_max_batch = 1024
+        # Queue between ingestion and the pipeline: 'block', 'drop_oldest' or
+        # 'conflate' (merge into the newest queued tick) when full
+        self.tick_queue_policy = 'block'
+        # Queue capacity in ticks (1 with 'conflate' always trades on the latest book)
+        self.tick_queue_size = 1000
+        # Seconds between printed tick queue stats (depth, drops, conflation,
+        # tick age); None prints them only on shutdown
+        self.tick_queue_report_interval = 60.0
+        # Symbols traded in one process, e.g. ['ES', 'NQ', 'RTY', 'YM']
+        # (None = a single instrument with untagged ticks)
+        self.instruments = None
+        # Seconds to gather ticks from several symbols into one batched alpha forward pass
+        self.multi_instrument_time_slice = 0.001
+        # Order routing: None (instant fills at the last price), 'simulated'
+        # (in-process SimulatedBroker) or 'ib' (Interactive Brokers via ib_insync)
+        self.order_gateway = None
+        # SimulatedBroker: seconds from submission to fill, adverse slippage in
+        # price points, and units per partial fill (None = fill at once)
+        self.broker_latency = 0.005
+        self.broker_slippage = 0.0
+        self.broker_partial_fill_units = None
+        # Seconds (tick time) before a working order is cancelled so exits can
+        # be retried (None = wait for the broker indefinitely)
+        self.order_timeout = 5.0
+        # Interactive Brokers connection and default futures contract
+        self.ib_host = '127.0.0.1'
+        self.ib_port = 7497
+        self.ib_client_id = 1
+        self.ib_symbol = 'ES'
+        self.ib_exchange = 'CME'
+        # Optional time-windowed features appended to the model input, any of
+        # 'ema_gap', 'volatility', 'vwap_gap', 'ofi', 'realized_range' (None = off);
+        # models must be trained with the same list
+        self.rolling_features = None
+        # Seconds of tick timestamps covered by the rolling features (also the EMA time constant)
+        self.rolling_window = 5.0
+        # Content-addressed cache of training features and labels (None = off);
+        # least recently used entries are evicted beyond feature_cache_max_gb
+        self.feature_cache_dir = 'cache/features'
+        self.feature_cache_max_gb = 20
         # Maximum concurrent positions (allow averaging up to two units)
         self.max_positions = 2
         # Path to the trained alpha model file (PyTorch .pth format)
         self.alpha_model_path = 'models/alpha_model.pth'
+        # Alpha model file format: 'state_dict' (.pth from training) or
+        # 'torchscript' (exported, optionally int8-quantized, module)
+        self.alpha_model_format = 'state_dict'
         # LSTM model hyperparameters
         # Sequence length for time-series input
         self.sequence_length = 50
@@ -25,10 +84,26 @@ class Config:
         self.hidden_size = 64
         # Number of LSTM layers
         self.num_layers = 2
+        # Streaming alpha inference: carry LSTM state between ticks instead of
+        # re-running the full window on every tick
+        self.alpha_streaming = False
+        # Ticks between rebuilding the streaming state from the full window
+        self.alpha_resync_interval = self.sequence_length
+        # Max tolerated |streaming - windowed| probability before warning
+        self.alpha_streaming_tolerance = 0.05
         # Training parameters
         self.batch_size = 64
         self.learning_rate = 1e-3
         self.num_epochs = 10
+        # Training windows per shuffled shard streamed by ShardedWindowDataset
+        self.train_shard_size = 65536
+        # Most recent fraction of training windows held out for validation
+        self.validation_fraction = 0.1
+        # Epochs without a validation loss improvement (of more than min_delta) before stopping
+        self.early_stopping_patience = 3
+        self.early_stopping_min_delta = 0.0
+        # Epochs between training checkpoints
+        self.checkpoint_interval = 1
         # Reinforcement Learning parameters
         # Enable RL-based decision model instead of threshold-based model
         self.use_rl = False
@@ -40,10 +115,35 @@ class Config:
         self.rl_risk_lambda = 0.0
         # Path to the trained RL model file (Stable-Baselines3 .zip format)
         self.rl_model_path = 'models/rl_model.zip'
+        # Greedy inference for the trained DQN models: 'numpy' (Q-network
+        # forward pass without SB3, see q_network.py) or 'sb3' (DQN.predict)
+        self.rl_inference_backend = 'numpy'
         # Position management RL parameters
         # Enable RL-based position management after first entry (hold/add/exit)
         self.use_position_rl = False
         # Window size (number of feature vectors) for position RL state
         self.position_rl_window_size = self.sequence_length
         # Path to the trained position management RL model file (.zip format)
-        self.position_rl_model_path = 'models/position_rl_model.zip'
\ No newline at end of file
+        self.position_rl_model_path = 'models/position_rl_model.zip'
+        # Run model inference on a dedicated thread awaited by on_tick
+        self.inference_executor = False
+        # torch intra-op threads used by the inference thread
+        self.inference_threads = 1
+        # CPUs to pin the inference thread to (None = no pinning; Linux only)
+        self.inference_cpus = None
+        # Max inference requests queued or running at once
+        self.inference_max_in_flight = 1
+        # Print every fill to stdout (slow; the journal is the durable record)
+        self.print_fills = False
+        # Directory for the binary decision/fill journal (None disables it)
+        self.journal_dir = None
+        # Journal file size (MB) before rotating to a new file
+        self.journal_rotate_mb = 64
+        # Seconds between journal writes by the background thread
+        self.journal_flush_interval = 0.5
+        # Latency instrumentation of the tick pipeline (per-stage histograms)
+        self.latency_tracking = False
+        # Snapshot file (.json for JSON, otherwise Prometheus text format)
+        self.latency_snapshot_path = 'latency.prom'
+        # Seconds between snapshot writes
+        self.latency_snapshot_interval = 10.0
@@ -2,17 +2,23 @@
 Data ingestion module: simulates or connects to a real-time market data feed.
 """
 import asyncio
+import logging
 import time
 import random
 
+from trading_system.tick_format import decode_ticks, split_symbol_topic, symbol_topic
+
+logger = logging.getLogger(__name__)
 
 class DataIngestion:
     """
     Simulated data feed for E-mini S&P 500 futures.
     Calls a provided callback with each new tick data.
+    Ticks are tagged with `symbol` when one is given.
     """
-    def __init__(self, config):
+    def __init__(self, config, symbol=None):
         self.interval = config.data_feed_interval
+        self.symbol = symbol
 
     async def start(self, callback):
         while True:
@@ -25,5 +31,111 @@ class DataIngestion:
                 'last_price': random.uniform(4400, 4500),
                 'last_size': random.randint(1, 20),
             }
+            if self.symbol is not None:
+                tick['symbol'] = self.symbol
             await callback(tick)
-            await asyncio.sleep(self.interval)
\ No newline at end of file
+            await asyncio.sleep(self.interval)
+
+class ZmqDataIngestion:
+    """
+    Market data feed from a ZeroMQ PUB socket.
+
+    Messages carry one or more ticks in the binary format of
+    trading_system.tick_format. On every wakeup all messages already queued
+    on the socket (up to config.zmq_max_batch) are drained and decoded as
+    one batch before being passed to the callback tick by tick.
+
+    With `symbols`, the socket subscribes to each symbol's topic (see
+    tick_format.symbol_topic) and every tick is tagged with its symbol.
+
+    A malformed message (wrong length or undecodable symbol) is logged,
+    counted in `bad_frames` and skipped; the feed keeps running.
+    """
+    def __init__(self, config, symbols=None):
+        self.endpoint = config.zmq_endpoint
+        self.topic = getattr(config, 'zmq_topic', b'')
+        self.symbols = list(symbols) if symbols else None
+        self.rcvhwm = getattr(config, 'zmq_rcvhwm', 100000)
+        self.max_batch = getattr(config, 'zmq_max_batch', 1024)
+        self.context = None
+        self.socket = None
+        self.drain_socket = None
+        self.running = False
+        # Feed counters
+        self.messages = 0
+        self.ticks = 0
+        self.batches = 0
+        self.max_batch_seen = 0
+        self.bad_frames = 0
+
+    def connect(self):
+        import zmq
+        import zmq.asyncio
+
+        self.context = zmq.asyncio.Context.instance()
+        self.socket = self.context.socket(zmq.SUB)
+        self.socket.setsockopt(zmq.RCVHWM, self.rcvhwm)
+        if self.symbols:
+            for symbol in self.symbols:
+                self.socket.setsockopt(zmq.SUBSCRIBE, symbol_topic(symbol))
+        else:
+            self.socket.setsockopt(zmq.SUBSCRIBE, self.topic)
+        self.socket.connect(self.endpoint)
+        # Plain (non-asyncio) handle on the same socket for non-blocking drains
+        self.drain_socket = zmq.Socket.shadow(self.socket.underlying)
+
+    async def recv_batch(self):
+        """
+        Waits for the next message, then drains every message already
+        queued. Returns the decoded ticks in arrival order.
+        """
+        import zmq
+
+        frames = [await self.socket.recv()]
+        while len(frames) < self.max_batch:
+            try:
+                frames.append(self.drain_socket.recv(zmq.NOBLOCK))
+            except zmq.Again:
+                break
+        # Decoded frame by frame so one malformed message cannot misalign the others
+        ticks = []
+        topic_len = len(self.topic)
+        for frame in frames:
+            try:
+                if self.symbols:
+                    symbol, payload = split_symbol_topic(frame)
+                    frame_ticks = decode_ticks(payload)
+                    for tick in frame_ticks:
+                        tick['symbol'] = symbol
+                else:
+                    frame_ticks = decode_ticks(frame[topic_len:])
+            except ValueError as exc:
+                self.bad_frames += 1
+                logger.warning("Skipping malformed market data frame (%d bytes): %s", len(frame), exc)
+                continue
+            ticks.extend(frame_ticks)
+        self.messages += len(frames)
+        self.ticks += len(ticks)
+        self.batches += 1
+        self.max_batch_seen = max(self.max_batch_seen, len(ticks))
+        return ticks
+
+    async def start(self, callback):
+        if self.socket is None:
+            self.connect()
+        self.running = True
+        try:
+            while self.running:
+                for tick in await self.recv_batch():
+                    await callback(tick)
+        finally:
+            self.close()
+
+    def stop(self):
+        self.running = False
+
+    def close(self):
+        if self.socket is not None:
+            self.socket.close(linger=0)
+            self.socket = None
+            self.drain_socket = None
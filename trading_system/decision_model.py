@@ -1,45 +1,65 @@
 """
 Decision and risk management model logic.
 """
+import numpy as np
+
+from trading_system.observation import account_state, build_observation, check_observation_size, observation_size
 
 
 class DecisionModel:
     """
     Converts prediction probabilities into trade decisions (BUY/SELL/HOLD).
     """
-    def __init__(self, config):
+    def __init__(self, config, feature_buffer=None, rl_model=None):
         self.config = config
         # Determine whether to use RL-based decision model
         self.use_rl = getattr(config, 'use_rl', False)
         if self.use_rl:
-            # RL feature names (must match those used during RL training)
-            try:
-                from trading_system.alpha_model import AlphaModel
-                self.RL_FEATURE_NAMES = AlphaModel.FEATURE_NAMES
-            except ImportError:
-                self.RL_FEATURE_NAMES = []
-            # Buffer to store recent feature vectors for RL state
-            from collections import deque
-            self.buffer = deque(maxlen=config.rl_window_size)
-            # Load trained RL model
-            from stable_baselines3 import DQN
-            self.rl_model = DQN.load(config.rl_model_path)
+            from trading_system.feature_buffer import FeatureRingBuffer
+            from trading_system.feature_engineering import feature_names
+            # Buffer of recent feature vectors for RL state (shared if given)
+            self.window_size = config.rl_window_size
+            # Position scale of the observation (the environment's max_position)
+            self.max_position = getattr(config, 'max_positions', 1)
+            self.owns_buffer = feature_buffer is None
+            self.buffer = FeatureRingBuffer(self.window_size, feature_names(config)) if self.owns_buffer else feature_buffer
+            # Load trained RL model (unless an already loaded one is shared)
+            if rl_model is None:
+                from trading_system.q_network import load_dqn_policy
+                rl_model = load_dqn_policy(config.rl_model_path, getattr(config, 'rl_inference_backend', 'numpy'))
+            check_observation_size(rl_model, observation_size(self.window_size, len(self.buffer.feature_names)))
+            self.rl_model = rl_model
+
+    def warmup(self):
+        """
+        Runs one RL policy prediction on an all-zero state, if RL is enabled.
+        """
+        if self.use_rl:
+            state = np.zeros(observation_size(self.window_size, len(self.buffer.feature_names)), dtype=np.float32)
+            self.rl_model.predict(state, deterministic=True)
+
+    def observation(self, account=None):
+        """
+        RL state: the feature window and account, as TradingEnv observes them.
+        """
+        position, entry_price, cash = account_state(account)
+        return build_observation(self.buffer.window(self.window_size), position, entry_price, cash, self.max_position)
 
-    def decide(self, prediction, features):
+    def decide(self, prediction, features, account=None):
         """
         Decide whether to buy, sell, or hold based on prediction.
+        `account` (e.g. the ExecutionModule) supplies the position for the
+        RL state; None means flat.
         """
         # Use RL-based decisions if enabled
         if self.use_rl:
-            # Append current feature vector in consistent order
-            fv = [features.get(name, 0.0) for name in self.RL_FEATURE_NAMES]
-            self.buffer.append(fv)
+            # Append current feature vector unless the pipeline already did
+            if self.owns_buffer:
+                self.buffer.append(features)
             # If not enough history, hold
-            if len(self.buffer) < self.buffer.maxlen:
+            if len(self.buffer) < self.window_size:
                 return {'action': 'HOLD', 'confidence': None}
-            # Prepare state for RL model
-            import numpy as np
-            state = np.array(self.buffer, dtype=np.float32).flatten()
+            state = self.observation(account)
             # Predict action: 0=SELL, 1=HOLD, 2=BUY
             action, _ = self.rl_model.predict(state, deterministic=True)
             mapping = {0: 'SELL', 1: 'HOLD', 2: 'BUY'}
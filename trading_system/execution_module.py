@@ -7,8 +7,21 @@ import asyncio
 class ExecutionModule:
     """
     Executes trades and manages open positions.
+
+    Fills are reported to the `on_fill` callback and, when given, a
+    TradeJournal; they are printed only with config.print_fills.
+
+    Without a gateway every order fills instantly at the tick's last price.
+    With an OrderGateway (see order_gateway.py) entries, adds and exits are
+    submitted as orders without waiting; the position, entry price and
+    realized PnL change only when fills arrive, and no new orders are placed
+    while one is still working. A working order not completed within
+    config.order_timeout seconds of tick time is cancelled; once the
+    broker confirms the cancel (keeping any partial fills), entries and
+    exits are evaluated again, so an unresponsive broker cannot block the
+    exits indefinitely.
     """
-    def __init__(self, config):
+    def __init__(self, config, on_fill=None, gateway=None, journal=None, symbol=''):
         self.config = config
         # Position units: positive for long, negative for short, 0 for no position
         self.position = 0
@@ -16,8 +29,170 @@ class ExecutionModule:
         self.entry_time = None
         # Flag for RL-based position management after first entry
         self.management_mode = False
+        # Realized PnL of closed positions (price points x units)
+        self.realized_pnl = 0.0
+        # Optional callback receiving a fill record for every entry, add and exit
+        self.on_fill = on_fill
+        # Optional TradeJournal receiving the same records, tagged with symbol
+        self.journal = journal
+        self.symbol = symbol.encode()
+        self.print_fills = getattr(config, 'print_fills', False)
+        # Stop-loss distance in price points (None or 0 disables it)
+        self.stop_loss = getattr(config, 'stop_loss', None)
+        # Order gateway and the intent of the order currently working on it
+        self.gateway = gateway
+        self.working = None
+        # Seconds (tick time) before a working order is cancelled (None = never)
+        self.order_timeout = getattr(config, 'order_timeout', None)
+        self.timed_out_orders = 0
+        if gateway is not None:
+            gateway.on_fill = self._on_order_fill
+            gateway.on_done = self._on_order_done
+
+    def _record_fill(self, action, side, units, price, timestamp, reason=None, pnl=0.0):
+        if self.on_fill is None and self.journal is None:
+            return
+        fill = {
+            'timestamp': timestamp,
+            'action': action,
+            'side': side,
+            'units': units,
+            'price': price,
+            'position': self.position,
+            'reason': reason,
+            'pnl': pnl,
+            'realized_pnl': self.realized_pnl,
+        }
+        if self.on_fill is not None:
+            self.on_fill(fill)
+        if self.journal is not None:
+            self.journal.record_fill(fill, self.symbol)
+
+    def _submit(self, action, side, units, curr_time, reason=None, description=None):
+        """
+        Sends an entry, add or exit to the gateway; fills are applied by _on_order_fill.
+        """
+        buy = (side == 'LONG') != (action == 'EXIT')
+        working = {'action': action, 'side': side, 'time': curr_time, 'reason': reason,
+                   'description': description, 'cancelling': False}
+        self.working = working
+        working['order_id'] = self.gateway.submit('BUY' if buy else 'SELL', units).order.orderId
+
+    def _expire_working(self, curr_time):
+        """
+        Cancels the working order once it has been open for order_timeout seconds.
+        """
+        working = self.working
+        if self.order_timeout is None or working['cancelling'] or curr_time - working['time'] < self.order_timeout:
+            return
+        working['cancelling'] = True
+        self.timed_out_orders += 1
+        if self.print_fills:
+            print(f"Cancelling {working['action']} order not filled after {self.order_timeout}s")
+        self.gateway.cancel(working['order_id'])
+
+    def _enter(self, side, price, curr_time):
+        """
+        Opens a one-unit position.
+        """
+        if self.gateway is not None:
+            self._submit('ENTRY', side, 1, curr_time)
+            return
+        self.position = 1 if side == 'LONG' else -1
+        self.entry_price = price
+        self.entry_time = curr_time
+        if self.print_fills:
+            print(f"Entered {side} unit at {price:.2f} (t={curr_time:.2f})")
+        self._record_fill('ENTRY', side, 1, price, curr_time)
+        # Activate RL-based position management if enabled
+        if self.config.use_position_rl:
+            self.management_mode = True
+
+    def _add_unit(self, side, price, curr_time, reason=None):
+        """
+        Adds one unit to the position, averaging the entry price.
+        """
+        if self.gateway is not None:
+            self._submit('ADD', side, 1, curr_time, reason)
+            return
+        prev_units = abs(self.position)
+        new_units = prev_units + 1
+        self.entry_price = (self.entry_price * prev_units + price) / new_units
+        self.position = new_units if side == 'LONG' else -new_units
+        via = ' via RL decision' if reason == 'rl' else ''
+        if self.print_fills:
+            print(f"Added {side} unit at {price:.2f}, new avg entry price {self.entry_price:.2f}{via}")
+        self._record_fill('ADD', side, 1, price, curr_time, reason)
+
+    def _exit_position(self, price, curr_time, reason, description):
+        """
+        Closes the whole position at price and resets position state.
+        """
+        units = abs(self.position)
+        side = 'LONG' if self.position > 0 else 'SHORT'
+        if self.gateway is not None:
+            self._submit('EXIT', side, units, curr_time, reason, description)
+            return
+        direction = 1 if self.position > 0 else -1
+        pnl = (price - self.entry_price) * direction * units
+        if self.print_fills:
+            print(f"Exited {side} position of {units} units {description} at {price:.2f}")
+        self.realized_pnl += pnl
+        self.position = 0
+        self.entry_price = None
+        self.entry_time = None
+        self.management_mode = False
+        self._record_fill('EXIT', side, units, price, curr_time, reason, pnl)
+
+    def _on_order_fill(self, trade, fill):
+        # Applies one (possibly partial) gateway fill of the working order
+        working = self.working
+        units = fill.execution.shares
+        price = fill.execution.price
+        side = working['side']
+        curr_time = working['time']
+        if working['action'] == 'EXIT':
+            direction = 1 if side == 'LONG' else -1
+            pnl = (price - self.entry_price) * direction * units
+            self.realized_pnl += pnl
+            self.position -= direction * units
+            if self.print_fills:
+                print(f"Exited {side} position of {units} units {working['description']} at {price:.2f}")
+            if self.position == 0:
+                self.entry_price = None
+                self.entry_time = None
+                self.management_mode = False
+            self._record_fill('EXIT', side, units, price, curr_time, working['reason'], pnl)
+            return
+        prev_units = abs(self.position)
+        new_units = prev_units + units
+        if prev_units == 0:
+            self.entry_price = price
+            self.entry_time = curr_time
+            if self.print_fills:
+                print(f"Entered {side} unit at {price:.2f} (t={curr_time:.2f})")
+            if self.config.use_position_rl:
+                self.management_mode = True
+        else:
+            self.entry_price = (self.entry_price * prev_units + price * units) / new_units
+            via = ' via RL decision' if working['reason'] == 'rl' else ''
+            if self.print_fills:
+                print(f"Added {side} unit at {price:.2f}, new avg entry price {self.entry_price:.2f}{via}")
+        self.position = new_units if side == 'LONG' else -new_units
+        self._record_fill(working['action'], side, units, price, curr_time, working['reason'])
+
+    def _on_order_done(self, trade):
+        # Filled or cancelled: new decisions may place orders again
+        self.working = None
 
     async def execute(self, decision, tick):
+        if self.gateway is not None:
+            self.gateway.update_market(tick)
+            if self.working is not None:
+                self._expire_working(tick['timestamp'])
+            if self.working is not None:
+                # The position is in flux until the working order completes (or its cancel is confirmed)
+                return
         action = decision.get('action')
         curr_time = tick['timestamp']
         price = tick.get('last_price')
@@ -25,32 +200,13 @@ class ExecutionModule:
         if self.config.use_position_rl and self.management_mode:
             # Explicit exit decision
             if action == 'EXIT' and self.position != 0:
-                units = abs(self.position)
-                if self.position > 0:
-                    print(f"Exited LONG position of {units} units via RL decision at {price:.2f}")
-                else:
-                    print(f"Exited SHORT position of {units} units via RL decision at {price:.2f}")
-                self.position = 0
-                self.entry_price = None
-                self.entry_time = None
-                self.management_mode = False
+                self._exit_position(price, curr_time, 'rl', 'via RL decision')
                 return
             # Explicit add decision
-            elif action == 'ADD':
-                if self.position > 0:
-                    prev_units = self.position
-                    if prev_units < self.config.max_positions and curr_time < self.entry_time + self.config.prediction_horizon:
-                        new_units = prev_units + 1
-                        self.entry_price = (self.entry_price * prev_units + price) / new_units
-                        self.position = new_units
-                        print(f"Added LONG unit at {price:.2f}, new avg entry price {self.entry_price:.2f} via RL decision")
-                elif self.position < 0:
-                    prev_units = abs(self.position)
-                    if prev_units < self.config.max_positions and curr_time < self.entry_time + self.config.prediction_horizon:
-                        new_units = prev_units + 1
-                        self.entry_price = (self.entry_price * prev_units + price) / new_units
-                        self.position = -new_units
-                        print(f"Added SHORT unit at {price:.2f}, new avg entry price {self.entry_price:.2f} via RL decision")
+            elif action == 'ADD' and self.position != 0:
+                prev_units = abs(self.position)
+                if prev_units < self.config.max_positions and curr_time < self.entry_time + self.config.prediction_horizon:
+                    self._add_unit('LONG' if self.position > 0 else 'SHORT', price, curr_time, 'rl')
                 return
             # Explicit hold: do nothing
             return
@@ -60,70 +216,40 @@ class ExecutionModule:
             prev_units = self.position
             # First entry
             if prev_units == 0:
-                self.position = 1
-                self.entry_price = price
-                self.entry_time = curr_time
-                print(f"Entered LONG unit at {price:.2f} (t={curr_time:.2f})")
-                # Activate RL-based position management if enabled
-                if self.config.use_position_rl:
-                    self.management_mode = True
+                self._enter('LONG', price, curr_time)
             # Add additional unit within prediction horizon
             elif prev_units < self.config.max_positions and curr_time < self.entry_time + self.config.prediction_horizon:
-                new_units = prev_units + 1
-                self.entry_price = (self.entry_price * prev_units + price) / new_units
-                self.position = new_units
-                print(f"Added LONG unit at {price:.2f}, new avg entry price {self.entry_price:.2f}")
+                self._add_unit('LONG', price, curr_time)
         elif action == 'SELL' and self.position <= 0:
             prev_units = abs(self.position)
             # First entry
             if prev_units == 0:
-                self.position = -1
-                self.entry_price = price
-                self.entry_time = curr_time
-                print(f"Entered SHORT unit at {price:.2f} (t={curr_time:.2f})")
-                # Activate RL-based position management if enabled
-                if self.config.use_position_rl:
-                    self.management_mode = True
+                self._enter('SHORT', price, curr_time)
             # Add additional unit within prediction horizon
             elif prev_units < self.config.max_positions and curr_time < self.entry_time + self.config.prediction_horizon:
-                new_units = prev_units + 1
-                self.entry_price = (self.entry_price * prev_units + price) / new_units
-                self.position = -new_units
-                print(f"Added SHORT unit at {price:.2f}, new avg entry price {self.entry_price:.2f}")
+                self._add_unit('SHORT', price, curr_time)
 
         # Exit logic: only evaluate exits on HOLD actions
         if action == 'HOLD':
-            # Long position exit: check time expiration first, then profit target
+            # Long position exit: check time expiration first, then profit target, then stop-loss
             if self.position > 0:
-                units = self.position
                 # Time expiration
                 if curr_time >= self.entry_time + self.config.prediction_horizon:
-                    print(f"Exited LONG position of {units} units on time at {price:.2f}")
-                    self.position = 0
-                    self.entry_price = None
-                    self.entry_time = None
-                    self.management_mode = False
+                    self._exit_position(price, curr_time, 'time', 'on time')
                 # Profit target
                 elif price >= self.entry_price + self.config.profit_target:
-                    print(f"Exited LONG position of {units} units for profit at {price:.2f}")
-                    self.position = 0
-                    self.entry_price = None
-                    self.entry_time = None
-                    self.management_mode = False
-            # Short position exit: check time expiration first, then profit target
+                    self._exit_position(price, curr_time, 'profit', 'for profit')
+                # Stop-loss
+                elif self.stop_loss and price <= self.entry_price - self.stop_loss:
+                    self._exit_position(price, curr_time, 'stop', 'on stop loss')
+            # Short position exit: check time expiration first, then profit target, then stop-loss
             elif self.position < 0:
-                units = abs(self.position)
                 # Time expiration
                 if curr_time >= self.entry_time + self.config.prediction_horizon:
-                    print(f"Exited SHORT position of {units} units on time at {price:.2f}")
-                    self.position = 0
-                    self.entry_price = None
-                    self.entry_time = None
-                    self.management_mode = False
+                    self._exit_position(price, curr_time, 'time', 'on time')
                 # Profit target for short
                 elif price <= self.entry_price - self.config.profit_target:
-                    print(f"Exited SHORT position of {units} units for profit at {price:.2f}")
-                    self.position = 0
-                    self.entry_price = None
-                    self.entry_time = None
-                    self.management_mode = False
\ No newline at end of file
+                    self._exit_position(price, curr_time, 'profit', 'for profit')
+                # Stop-loss for short
+                elif self.stop_loss and price >= self.entry_price + self.stop_loss:
+                    self._exit_position(price, curr_time, 'stop', 'on stop loss')
@@ -0,0 +1,209 @@
+"""
+Vectorized simulation of the rule-based ExecutionModule over tick arrays.
+"""
+import numpy as np
+
+from trading_system.range_query import levels_for_span, sparse_table, first_passage
+
+# Integer action codes
+SELL, HOLD, BUY = -1, 0, 1
+ACTION_CODES = {'SELL': SELL, 'HOLD': HOLD, 'BUY': BUY}
+
+# Exit reason codes
+EXIT_OPEN, EXIT_TIME, EXIT_PROFIT, EXIT_STOP = 0, 1, 2, 3
+EXIT_REASONS = {EXIT_OPEN: None, EXIT_TIME: 'time', EXIT_PROFIT: 'profit', EXIT_STOP: 'stop'}
+
+
+def encode_actions(actions):
+    """
+    Converts BUY/SELL/HOLD strings (or integer codes) to an int8 code array.
+    """
+    actions = np.asarray(actions)
+    if actions.dtype.kind in 'UOS':
+        codes = np.full(len(actions), HOLD, dtype=np.int8)
+        codes[actions == 'BUY'] = BUY
+        codes[actions == 'SELL'] = SELL
+        return codes
+    return actions.astype(np.int8)
+
+
+def signals_from_predictions(predictions, threshold_up, threshold_down):
+    """
+    Applies DecisionModel's threshold rule to an array of probabilities.
+    """
+    predictions = np.asarray(predictions)
+    codes = np.zeros(len(predictions), dtype=np.int8)
+    codes[predictions > threshold_up] = BUY
+    codes[predictions < threshold_down] = SELL
+    return codes
+
+
+def _positions(mask):
+    """
+    Sorted indices where mask is true, followed by a len(mask) sentinel.
+    """
+    return np.append(np.flatnonzero(mask), len(mask))
+
+
+def _next_position(positions, query):
+    """
+    For each query index returns the smallest entry of a sentinel-terminated
+    index array (see _positions) that is >= query.
+    """
+    return positions[np.searchsorted(positions[:-1], query, side='left')]
+
+
+def _simulate_candidates(prices, timestamps, actions, cand, horizon, profit_target, stop_loss, max_positions):
+    """
+    Outcome of a position opened from flat at each candidate tick, assuming
+    nothing else is open. Returns (exit_idx, reason, units, entry_price),
+    with exit_idx == len(prices) for positions still open at the end.
+    """
+    n = len(prices)
+    hold = actions == HOLD
+    hold_pos = _positions(hold)
+    buy_pos = _positions(actions == BUY)
+    sell_pos = _positions(actions == SELL)
+    side = actions[cand].astype(np.int64)
+    deadline = timestamps[cand] + horizon
+    # Time exit: first HOLD tick after entry whose time reaches the deadline
+    time_idx = np.maximum(np.searchsorted(timestamps, deadline, side='left'), cand + 1)
+    time_exit = _next_position(hold_pos, time_idx)
+    next_same = np.where(side > 0, _next_position(buy_pos, cand + 1), _next_position(sell_pos, cand + 1))
+
+    # Range-extreme tables over prices on HOLD ticks only (exits happen on HOLD)
+    span = int(np.max(time_exit - cand)) if len(cand) else 1
+    levels = levels_for_span(span)
+    max_table = sparse_table(np.where(hold, prices, -np.inf), levels, np.maximum)
+    min_table = sparse_table(np.where(hold, prices, np.inf), levels, np.minimum)
+
+    exit_idx = time_exit.copy()
+    reason = np.where(time_exit < n, EXIT_TIME, EXIT_OPEN)
+    units = np.ones(len(cand), dtype=np.int64)
+    entry_price = prices[cand].astype(np.float64)
+    seg_start = cand + 1
+    active = np.arange(len(cand))
+    while len(active):
+        long_side = side[active] > 0
+        ep = entry_price[active]
+        start = seg_start[active]
+        # Next averaging-in tick, if allowed by max_positions and the horizon
+        add_idx = next_same[active]
+        can_add = (units[active] < max_positions) & (add_idx < n)
+        can_add &= timestamps[np.minimum(add_idx, n - 1)] < deadline[active]
+        add_idx = np.where(can_add, add_idx, n)
+        stop = np.minimum(add_idx, time_exit[active])
+        stop = np.maximum(stop, start)
+        # Price exits: first HOLD tick at or beyond the upper / lower levels
+        upper = ep + np.where(long_side, profit_target, stop_loss or 0.0)
+        lower = ep - np.where(long_side, stop_loss or 0.0, profit_target)
+        up_hit = first_passage(max_table, start, stop, upper, above=True)
+        down_hit = first_passage(min_table, start, stop, lower, above=False)
+        if not stop_loss:
+            # Without a stop only the profit side can trigger
+            up_hit = np.where(long_side, up_hit, stop)
+            down_hit = np.where(long_side, stop, down_hit)
+        hit = np.minimum(up_hit, down_hit)
+        found = hit < stop
+        # Profit target is checked before the stop-loss on the same tick
+        profit = np.where(long_side, up_hit == hit, down_hit == hit)
+        done = active[found]
+        exit_idx[done] = hit[found]
+        reason[done] = np.where(profit[found], EXIT_PROFIT, EXIT_STOP)
+        # Positions that average in continue with a new segment
+        adding = ~found & can_add
+        nxt = active[adding]
+        new_units = units[nxt] + 1
+        entry_price[nxt] = (entry_price[nxt] * units[nxt] + prices[add_idx[adding]]) / new_units
+        units[nxt] = new_units
+        seg_start[nxt] = add_idx[adding] + 1
+        after = add_idx[adding] + 1
+        next_same[nxt] = np.where(side[nxt] > 0, _next_position(buy_pos, after), _next_position(sell_pos, after))
+        active = nxt
+    return exit_idx, reason, units, entry_price
+
+
+def simulate_execution(prices, timestamps, actions, config, chunk_size=1 << 18):
+    """
+    Replays ExecutionModule's rule-based entry/exit logic over whole arrays.
+
+    prices are last prices, timestamps are in seconds (sorted) and actions
+    are BUY/SELL/HOLD strings or SELL/HOLD/BUY codes (-1/0/1). The
+    semantics match ExecutionModule without RL position management:
+    entries from flat on BUY/SELL, averaging in up to config.max_positions
+    units while within config.prediction_horizon of the first entry, and
+    exits evaluated only on HOLD ticks in the order time expiry,
+    config.profit_target, config.stop_loss (None or 0 disables the stop).
+
+    Each potential entry tick is simulated independently in vectorized
+    passes, chunk_size entries at a time and restricted to the ticks those
+    entries can reach before their time exit; the realized trade sequence
+    is then found by hopping from each exit to the next signal.
+
+    Returns a dict of per-trade arrays (entry/exit index and time, side,
+    units, avg entry price, exit price, pnl, reason code) plus total_pnl.
+    A position still open at the end has reason EXIT_OPEN and zero pnl.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    actions = encode_actions(actions)
+    n = len(prices)
+    stop_loss = getattr(config, 'stop_loss', None)
+
+    cand = np.flatnonzero(actions != HOLD)
+    hold_pos = _positions(actions == HOLD)
+    exit_idx = np.empty(len(cand), dtype=np.int64)
+    reason = np.empty(len(cand), dtype=np.int8)
+    units = np.empty(len(cand), dtype=np.int64)
+    entry_price = np.empty(len(cand), dtype=np.float64)
+    # Last tick any entry in a chunk can reach: its time exit (or the end)
+    deadline_idx = np.maximum(
+        np.searchsorted(timestamps, timestamps[cand] + config.prediction_horizon, side='left'), cand + 1
+    )
+    reach = _next_position(hold_pos, deadline_idx)
+    for lo in range(0, len(cand), chunk_size):
+        hi = min(lo + chunk_size, len(cand))
+        start = cand[lo]
+        end = min(int(reach[lo:hi].max()) + 1, n)
+        # Keep only ticks some entry in this chunk can reach (entry .. time exit)
+        size = end - start + 1
+        cover = np.bincount(cand[lo:hi] - start, minlength=size)
+        cover -= np.bincount(np.minimum(reach[lo:hi], end - 1) + 1 - start, minlength=size)
+        keep = np.flatnonzero(np.cumsum(cover[:-1]) > 0) + start
+        local = _simulate_candidates(
+            prices[keep], timestamps[keep], actions[keep], np.searchsorted(keep, cand[lo:hi]),
+            config.prediction_horizon, config.profit_target, stop_loss, config.max_positions
+        )
+        # Map exits back to tick indices; positions still open stay at n
+        exit_idx[lo:hi] = np.append(keep, n)[local[0]]
+        reason[lo:hi], units[lo:hi], entry_price[lo:hi] = local[1:]
+
+    # Follow entry -> exit -> next signal; succ[k] is the candidate after k's exit
+    succ = np.searchsorted(cand, exit_idx, side='right').tolist()
+    chosen = []
+    k = 0
+    count = len(cand)
+    while k < count:
+        chosen.append(k)
+        k = succ[k]
+    chosen = np.asarray(chosen, dtype=np.int64)
+
+    entry_index = cand[chosen]
+    exit_index = exit_idx[chosen]
+    closed = exit_index < n
+    side = actions[entry_index].astype(np.int8)
+    exit_price = np.where(closed, prices[np.minimum(exit_index, n - 1)], np.nan)
+    pnl = np.where(closed, (exit_price - entry_price[chosen]) * side * units[chosen], 0.0)
+    return {
+        'entry_index': entry_index,
+        'exit_index': exit_index,
+        'entry_time': timestamps[entry_index],
+        'exit_time': np.where(closed, timestamps[np.minimum(exit_index, n - 1)], np.nan),
+        'side': side,
+        'units': units[chosen],
+        'entry_price': entry_price[chosen],
+        'exit_price': exit_price,
+        'pnl': pnl,
+        'reason': reason[chosen],
+        'total_pnl': float(pnl.sum()),
+    }
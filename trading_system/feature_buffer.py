@@ -0,0 +1,57 @@
+"""
+Preallocated ring buffer of feature vectors shared by the models.
+"""
+import numpy as np
+
+from trading_system.feature_engineering import FEATURE_NAMES
+
+
+class FeatureRingBuffer:
+    """
+    Fixed-size float32 history of feature vectors.
+
+    Every row is written twice, at slot `head` and `head + capacity`, so the
+    most recent `n` rows are always one contiguous slice of the backing
+    array. window() therefore returns a view without copying or allocating
+    new feature storage.
+    """
+    def __init__(self, capacity, feature_names=FEATURE_NAMES):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.feature_names = list(feature_names)
+        self.data = np.zeros((2 * capacity, len(self.feature_names)), dtype=np.float32)
+        # Slot of the most recent row and total number of rows ever written
+        self.head = capacity - 1
+        self.count = 0
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def append(self, features):
+        """
+        Writes one feature dict (missing names become 0.0) as the newest row.
+        """
+        head = self.head + 1
+        if head == self.capacity:
+            head = 0
+        row = [features.get(name, 0.0) for name in self.feature_names]
+        self.data[head] = row
+        self.data[head + self.capacity] = row
+        self.head = head
+        self.count += 1
+
+    def window(self, length):
+        """
+        Returns a (length, n_features) view of the most recent rows, oldest first.
+        """
+        if length > len(self):
+            raise ValueError(f"Requested window of {length} rows but only {len(self)} available")
+        end = self.head + self.capacity + 1
+        return self.data[end - length:end]
+
+    def latest(self):
+        """
+        Returns a view of the most recent row.
+        """
+        return self.data[self.head]
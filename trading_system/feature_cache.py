@@ -0,0 +1,263 @@
+"""
+Content-addressed on-disk cache of training arrays.
+
+Layout:
+    <root>/digests.json            content hashes of input files, by path/size/mtime
+    <root>/<key>/meta.json         description of the entry (kind, params, shapes)
+    <root>/<key>/<array>.npy       arrays, loaded memory-mapped
+
+The key hashes the input data content, the kind of arrays and every
+parameter they depend on, so changing e.g. the learning rate reuses an
+entry while changing sequence_length or the feature set builds a new one.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import time
+
+import numpy as np
+
+from trading_system.tick_store import MANIFEST_NAME, SESSION_OPEN_HOUR, TickStore, is_tick_store
+
+logger = logging.getLogger(__name__)
+
+# Bump when feature or label computation changes so old entries are not reused
+CACHE_VERSION = 1
+DIGESTS_NAME = 'digests.json'
+META_NAME = 'meta.json'
+DEFAULT_MAX_BYTES = 20 << 30
+
+
+class FeatureCache:
+    """
+    Stores named arrays under a key and evicts the least recently used
+    entries once the cache grows beyond `max_bytes`.
+    """
+    def __init__(self, root, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        os.makedirs(root, exist_ok=True)
+        self.digests_path = os.path.join(root, DIGESTS_NAME)
+        try:
+            with open(self.digests_path) as f:
+                self.digests = json.load(f)
+        except (FileNotFoundError, ValueError):
+            self.digests = {}
+        self.hits = 0
+        self.misses = 0
+
+    def file_digest(self, path):
+        """
+        SHA-256 of a file's content; rehashed only when its size or mtime changes.
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        known = self.digests.get(path)
+        if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+            return known['sha256']
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+        self.digests[path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest.hexdigest()}
+        tmp_path = f'{self.digests_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.digests, f)
+        os.replace(tmp_path, self.digests_path)
+        return digest.hexdigest()
+
+    def data_fingerprint(self, path, start=None, end=None, session_open_hour=SESSION_OPEN_HOUR):
+        """
+        Hash of the ticks a load_tick_frame(path, start, end, session_open_hour=...)
+        call reads: the CSV file (and the date roll when filtering it), or
+        the manifest and selected partitions of a tick store.
+        """
+        digest = hashlib.sha256(json.dumps([start, end]).encode())
+        if is_tick_store(path):
+            store = TickStore(path)
+            digest.update(self.file_digest(os.path.join(path, MANIFEST_NAME)).encode())
+            for date in store.dates(start, end):
+                part_dir = os.path.join(path, store._partition(date)['path'])
+                for name in sorted(store.columns):
+                    digest.update(self.file_digest(os.path.join(part_dir, f'{name}.npy')).encode())
+        else:
+            digest.update(self.file_digest(path).encode())
+            if start is not None or end is not None:
+                digest.update(json.dumps(session_open_hour).encode())
+        return digest.hexdigest()
+
+    def key(self, kind, fingerprint, params):
+        description = {'version': CACHE_VERSION, 'kind': kind, 'data': fingerprint, 'params': params}
+        return hashlib.sha256(json.dumps(description, sort_keys=True).encode()).hexdigest()
+
+    def load(self, key):
+        """
+        Returns ({name: read-only memmap}, meta) for a stored key, or None.
+        """
+        entry = os.path.join(self.root, key)
+        meta_path = os.path.join(entry, META_NAME)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return None
+        # Mark as recently used for eviction
+        os.utime(meta_path)
+        arrays = {name: np.load(os.path.join(entry, f'{name}.npy'), mmap_mode='r') for name in meta['arrays']}
+        return arrays, meta
+
+    def store(self, key, arrays, meta=None):
+        """
+        Writes arrays under key (atomically: readers never see a partial
+        entry), evicts old entries and returns the memory-mapped copy.
+        """
+        entry = os.path.join(self.root, key)
+        tmp_entry = f'{entry}.{os.getpid()}.tmp'
+        shutil.rmtree(tmp_entry, ignore_errors=True)
+        os.makedirs(tmp_entry)
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp_entry, f'{name}.npy'), np.ascontiguousarray(array))
+        meta = dict(meta or {})
+        meta['arrays'] = {name: list(np.shape(array)) for name, array in arrays.items()}
+        meta['created'] = time.time()
+        with open(os.path.join(tmp_entry, META_NAME), 'w') as f:
+            json.dump(meta, f)
+        try:
+            os.rename(tmp_entry, entry)
+        except OSError:
+            # Another process stored the same key first; its content is identical
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+        self.evict(keep=key)
+        return self.load(key)
+
+    def entries(self):
+        """
+        (last_used, bytes, key) for every complete entry, least recently used first.
+        """
+        result = []
+        for key in os.listdir(self.root):
+            entry = os.path.join(self.root, key)
+            meta_path = os.path.join(entry, META_NAME)
+            if not os.path.isfile(meta_path):
+                continue
+            size = sum(os.path.getsize(os.path.join(entry, name)) for name in os.listdir(entry))
+            result.append((os.path.getmtime(meta_path), size, key))
+        return sorted(result)
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self, keep=None):
+        """
+        Removes least recently used entries until the cache fits in max_bytes.
+        """
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in entries:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(os.path.join(self.root, key), ignore_errors=True)
+            total -= size
+            logger.info(f"Evicted feature cache entry {key[:12]} ({size / 1e6:.1f} MB)")
+
+    def fetch(self, kind, fingerprint, params, compute):
+        """
+        Returns (arrays, meta) for the key, calling compute() -> (arrays,
+        meta) and storing its result on a miss.
+        """
+        key = self.key(kind, fingerprint, params)
+        cached = self.load(key)
+        if cached is not None:
+            self.hits += 1
+            logger.info(f"Feature cache hit for {kind} ({key[:12]})")
+            return cached
+        self.misses += 1
+        arrays, meta = compute()
+        meta = dict(meta, kind=kind, params=params)
+        logger.info(f"Feature cache miss for {kind} ({key[:12]}), storing")
+        return self.store(key, arrays, meta)
+
+
+def open_feature_cache(config, enabled=True):
+    """
+    FeatureCache from config.feature_cache_dir / feature_cache_max_gb, or
+    None when disabled (enabled=False or no directory configured).
+    """
+    root = getattr(config, 'feature_cache_dir', None)
+    if not enabled or not root:
+        return None
+    max_bytes = int(getattr(config, 'feature_cache_max_gb', DEFAULT_MAX_BYTES / (1 << 30)) * (1 << 30))
+    return FeatureCache(root, max_bytes)
+
+
+def alpha_training_arrays(config, data_path, start=None, end=None, cache=None):
+    """
+    Feature matrix and window labels for alpha model training: returns
+    (features, labels) where window k = features[k:k + sequence_length]
+    has label labels[k] (see windowing.build_sequences). With a cache,
+    the arrays are memory-mapped from disk and only computed on a miss.
+    """
+    from trading_system.feature_engineering import FeatureEngineer
+    from trading_system.tick_store import load_tick_frame
+    from trading_system.windowing import build_sequences
+
+    fe = FeatureEngineer(config)
+    n_shift = int(config.prediction_horizon / config.data_feed_interval)
+    session_open_hour = getattr(config, 'session_open_hour', SESSION_OPEN_HOUR)
+
+    def compute():
+        df = load_tick_frame(data_path, start, end, session_open_hour=session_open_hour)
+        df = df.sort_values(by='timestamp').reset_index(drop=True)
+        features = fe.compute_features_batch(df)
+        matrix = np.column_stack([features[name] for name in fe.feature_names]).astype(np.float32)
+        _, labels = build_sequences(matrix, df['last_price'].to_numpy(), config.sequence_length, n_shift)
+        return {'features': matrix, 'labels': labels}, {'feature_names': fe.feature_names}
+
+    if cache is None:
+        arrays, _ = compute()
+    else:
+        params = {
+            'feature_names': fe.feature_names,
+            'rolling_window': fe.rolling_window if fe.rolling_features else None,
+            'sequence_length': config.sequence_length,
+            'prediction_horizon': config.prediction_horizon,
+            'data_feed_interval': config.data_feed_interval,
+        }
+        fingerprint = cache.data_fingerprint(data_path, start, end, session_open_hour)
+        arrays, _ = cache.fetch('alpha', fingerprint, params, compute)
+    return arrays['features'], arrays['labels']
+
+
+def rl_env_arrays(config, data_path, start=None, end=None, cache=None):
+    """
+    rl_env.compute_env_arrays() of the ticks at data_path: the
+    FeatureEngineer features of `config` (the live model inputs) and mid
+    prices, through the cache if given.
+    """
+    from trading_system.feature_engineering import FeatureEngineer
+    from trading_system.rl_env import compute_env_arrays
+    from trading_system.tick_store import load_tick_frame
+
+    fe = FeatureEngineer(config)
+    session_open_hour = getattr(config, 'session_open_hour', SESSION_OPEN_HOUR)
+
+    def compute():
+        df = load_tick_frame(data_path, start, end, session_open_hour=session_open_hour)
+        df = df.sort_values(by='timestamp').reset_index(drop=True)
+        return compute_env_arrays(df, config), {'feature_names': fe.feature_names}
+
+    if cache is None:
+        arrays, _ = compute()
+    else:
+        params = {
+            'feature_names': fe.feature_names,
+            'rolling_window': fe.rolling_window if fe.rolling_features else None,
+            'history_size': fe.history_size,
+        }
+        fingerprint = cache.data_fingerprint(data_path, start, end, session_open_hour)
+        arrays, _ = cache.fetch('rl_env', fingerprint, params, compute)
+    return arrays
@@ -1,23 +1,103 @@
 """
 Feature engineering: computes input features for prediction and decision models.
 """
+import math
 from collections import deque
 
+import numpy as np
+
+from trading_system import rolling
+
+# Ordered feature names produced by FeatureEngineer (model input order)
+FEATURE_NAMES = ['mid_price', 'spread', 'bid_ask_ratio', 'recent_return']
+# Optional time-windowed features (config.rolling_features), in model input order:
+#   ema_gap         mid price relative to its EMA (time constant rolling_window)
+#   volatility      std of log mid-price returns over the window
+#   vwap_gap        last price relative to the window VWAP (weights: last_size)
+#   ofi             summed order flow imbalance over the window
+#   realized_range  (high - low) / last of the last price over the window
+ROLLING_FEATURE_NAMES = ['ema_gap', 'volatility', 'vwap_gap', 'ofi', 'realized_range']
+
+
+def feature_names(config):
+    """
+    Model input feature names for a configuration: FEATURE_NAMES followed
+    by the enabled rolling features.
+    """
+    enabled = getattr(config, 'rolling_features', None) or []
+    unknown = [name for name in enabled if name not in ROLLING_FEATURE_NAMES]
+    if unknown:
+        raise ValueError(f"Unknown rolling features: {unknown}")
+    return FEATURE_NAMES + [name for name in ROLLING_FEATURE_NAMES if name in enabled]
+
+
+def relative_gap(value, reference):
+    """
+    value / reference - 1, or 0.0 when the reference is missing or zero.
+    """
+    if not reference or reference != reference:
+        return 0.0
+    return value / reference - 1.0
+
 
 class FeatureEngineer:
     """
     Maintains a history of market data and computes features.
+
+    Rolling features listed in config.rolling_features are updated
+    incrementally in update() over the last config.rolling_window seconds
+    of tick timestamps (see rolling.py), so their cost does not depend on
+    the window length.
     """
     def __init__(self, config):
         # Size of history window (based on horizon and feed interval)
         maxlen = int(config.prediction_horizon / config.data_feed_interval) * 2
+        self.history_size = maxlen
         self.order_book_history = deque(maxlen=maxlen)
         self.trade_history = deque(maxlen=maxlen)
+        self.feature_names = feature_names(config)
+        self.rolling_features = self.feature_names[len(FEATURE_NAMES):]
+        self.rolling_window = getattr(config, 'rolling_window', 5.0)
+        self.rolling_values = {}
+        if self.rolling_features:
+            window = self.rolling_window
+            self.ema = rolling.EMA(window)
+            self.volatility = rolling.RollingStd(window)
+            self.vwap = rolling.RollingVWAP(window)
+            self.ofi = rolling.OrderFlowImbalance()
+            self.ofi_sum = rolling.RollingSum(window)
+            self.high = rolling.RollingMax(window)
+            self.low = rolling.RollingMin(window)
+            self.prev_mid = None
 
     def update(self, tick):
         # Append the latest market tick
         self.order_book_history.append(tick)
         self.trade_history.append(tick)
+        if self.rolling_features:
+            self._update_rolling(tick)
+
+    def _update_rolling(self, tick):
+        timestamp = tick['timestamp']
+        bid = tick['best_bid']
+        ask = tick['best_ask']
+        last = tick['last_price']
+        mid = (bid + ask) / 2
+        prev_mid = self.prev_mid
+        log_return = math.log(mid / prev_mid) if prev_mid and prev_mid > 0 and mid > 0 else 0.0
+        self.prev_mid = mid
+        flow = self.ofi.update(bid, ask, tick['bid_size'], tick['ask_size'])
+        high = self.high.update(timestamp, last)
+        low = self.low.update(timestamp, last)
+        values = {
+            'ema_gap': relative_gap(mid, self.ema.update(timestamp, mid)),
+            'volatility': self.volatility.update(timestamp, log_return),
+            # Ticks without a trade size count as one traded unit
+            'vwap_gap': relative_gap(last, self.vwap.update(timestamp, last, tick.get('last_size', 1))),
+            'ofi': self.ofi_sum.update(timestamp, flow),
+            'realized_range': (high - low) / last if last else 0.0,
+        }
+        self.rolling_values = {name: values[name] for name in self.rolling_features}
 
     def compute_features(self):
         """
@@ -37,9 +117,74 @@ class FeatureEngineer:
             recent_return = (end - start) / start if start else 0.0
         else:
             recent_return = 0.0
-        return {
+        features = {
             'mid_price': mid_price,
             'spread': spread,
             'bid_ask_ratio': latest['bid_size'] / (latest['ask_size'] + 1e-6),
             'recent_return': recent_return,
-        }
\ No newline at end of file
+        }
+        if self.rolling_values:
+            features.update(self.rolling_values)
+        return features
+
+    def compute_features_batch(self, data):
+        """
+        Computes features for every tick of a historical dataset at once.
+
+        `data` may be a pandas DataFrame, a NumPy structured array or a dict of
+        arrays with the tick columns (best_bid, best_ask, bid_size, ask_size,
+        last_price), sorted by time, plus timestamp (and optionally
+        last_size) when rolling features are enabled. Returns a dict mapping
+        each name in self.feature_names to a float64 array whose i-th entry
+        equals what compute_features() returns after update() has been
+        called with rows 0..i (rolling features up to float rounding). The
+        streaming history of this instance is not modified.
+        """
+        bid = np.asarray(data['best_bid'], dtype=np.float64)
+        ask = np.asarray(data['best_ask'], dtype=np.float64)
+        bid_size = np.asarray(data['bid_size'], dtype=np.float64)
+        ask_size = np.asarray(data['ask_size'], dtype=np.float64)
+        last = np.asarray(data['last_price'], dtype=np.float64)
+        # Return over the trailing history window (start of deque -> latest tick)
+        start_idx = np.maximum(np.arange(len(last)) - (self.history_size - 1), 0)
+        start = last[start_idx]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            recent_return = np.where(start != 0, (last - start) / start, 0.0)
+        features = {
+            'mid_price': (bid + ask) / 2,
+            'spread': ask - bid,
+            'bid_ask_ratio': bid_size / (ask_size + 1e-6),
+            'recent_return': recent_return,
+        }
+        if self.rolling_features:
+            features.update(self._rolling_batch(data, bid, ask, bid_size, ask_size, last))
+        return features
+
+    def _rolling_batch(self, data, bid, ask, bid_size, ask_size, last):
+        times = np.asarray(data['timestamp'], dtype=np.float64)
+        window = self.rolling_window
+        mid = (bid + ask) / 2
+        log_return = np.zeros(len(mid))
+        prev_mid = mid[:-1]
+        valid = (prev_mid > 0) & (mid[1:] > 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_return[1:] = np.where(valid, np.log(mid[1:] / prev_mid), 0.0)
+            ema = rolling.ema(times, mid, window)
+            ema_gap = np.where(ema != 0, mid / ema - 1.0, 0.0)
+            if 'last_size' in data:
+                volume = np.asarray(data['last_size'], dtype=np.float64)
+            else:
+                volume = np.ones(len(last))
+            vwap = rolling.rolling_vwap(times, last, volume, window)
+            vwap_gap = np.where(np.isfinite(vwap) & (vwap != 0), last / vwap - 1.0, 0.0)
+            high = rolling.rolling_max(times, last, window)
+            low = rolling.rolling_min(times, last, window)
+            realized_range = np.where(last != 0, (high - low) / last, 0.0)
+        values = {
+            'ema_gap': ema_gap,
+            'volatility': rolling.rolling_std(times, log_return, window),
+            'vwap_gap': vwap_gap,
+            'ofi': rolling.rolling_sum(times, rolling.order_flow_imbalance(bid, ask, bid_size, ask_size), window),
+            'realized_range': realized_range,
+        }
+        return {name: values[name] for name in self.rolling_features}
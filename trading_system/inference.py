@@ -0,0 +1,79 @@
+"""
+Runs model inference off the asyncio event loop.
+"""
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Returned by InferenceExecutor.run() when the request was made stale by newer data
+STALE = object()
+
+
+class InferenceExecutor:
+    """
+    Dedicated inference thread that coroutines can await.
+
+    The thread sets torch's intra-op thread count (and, on Linux, pins
+    itself to `cpus`) when it starts, so forward passes do not compete with
+    the event loop thread. At most `max_in_flight` requests are queued or
+    running at once; further callers wait for a slot.
+
+    run() takes an optional is_stale() callable, checked on the event loop
+    before the work is submitted: if newer data is already waiting the
+    request is skipped and STALE is returned instead of a result. Work
+    that has started is never dropped, so a feed that keeps delivering
+    ticks during inference cannot starve the decisions.
+    """
+    def __init__(self, max_in_flight=1, torch_threads=1, cpus=None):
+        self.torch_threads = torch_threads
+        self.cpus = cpus
+        self.max_in_flight = max_in_flight
+        self.slots = asyncio.Semaphore(max_in_flight)
+        self.executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='inference', initializer=self._init_thread
+        )
+        # Counters
+        self.submitted = 0
+        self.completed = 0
+        self.stale = 0
+        self.in_flight = 0
+        self.max_in_flight_seen = 0
+
+    def _init_thread(self):
+        if self.torch_threads:
+            import torch
+            torch.set_num_threads(self.torch_threads)
+        if self.cpus and hasattr(os, 'sched_setaffinity'):
+            # Pid 0 applies to the calling thread only
+            os.sched_setaffinity(0, self.cpus)
+
+    async def run(self, fn, *args, is_stale=None):
+        """
+        Runs fn(*args) on the inference thread and returns its result, or
+        STALE without running it if is_stale() reports newer data.
+        """
+        if is_stale is not None and is_stale():
+            self.stale += 1
+            return STALE
+        async with self.slots:
+            self.submitted += 1
+            self.in_flight += 1
+            self.max_in_flight_seen = max(self.max_in_flight_seen, self.in_flight)
+            try:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(self.executor, fn, *args)
+            finally:
+                self.in_flight -= 1
+        self.completed += 1
+        return result
+
+    def stats(self):
+        return {
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'stale': self.stale,
+            'max_in_flight': self.max_in_flight_seen,
+        }
+
+    def close(self):
+        self.executor.shutdown(wait=True)
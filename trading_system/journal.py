@@ -0,0 +1,243 @@
+"""
+Append-only binary journal of trading decisions and fills.
+"""
+import collections
+import glob
+import json
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+
+from trading_system.feature_engineering import FEATURE_NAMES
+
+# Record kinds
+DECISION = 0
+FILL = 1
+# Decision actions and fill actions share one code table
+ACTIONS = ('HOLD', 'BUY', 'SELL', 'EXIT', 'ADD', 'ENTRY')
+ACTION_CODES = {action: code for code, action in enumerate(ACTIONS)}
+# Fill reasons ('' for signal-driven entries and adds)
+REASONS = ('', 'time', 'profit', 'stop', 'rl')
+REASON_CODES = {reason: code for code, reason in enumerate(REASONS)}
+# File header: magic, little-endian u32 length, then a JSON description
+MAGIC = b'TJOURNAL1\n'
+DEFAULT_ROTATE_BYTES = 64 << 20
+
+logger = logging.getLogger(__name__)
+
+
+def journal_dtype(n_features):
+    """
+    Fixed record layout for a journal with n_features features per decision.
+    """
+    return np.dtype([
+        ('timestamp', '<f8'),
+        ('kind', 'u1'),
+        ('action', 'u1'),
+        ('reason', 'u1'),
+        ('symbol', 'S8'),
+        ('position', '<i4'),
+        ('units', '<i4'),
+        ('prediction', '<f4'),
+        ('price', '<f8'),
+        ('pnl', '<f8'),
+        ('realized_pnl', '<f8'),
+        ('features', '<f4', (n_features,)),
+    ])
+
+
+class TradeJournal:
+    """
+    Records decisions and fills without doing I/O on the tick path.
+
+    record_decision() and record_fill() only append a tuple to a deque; a
+    background thread wakes every `flush_interval` seconds, converts the
+    queued tuples into one structured array (see journal_dtype) and appends
+    it to the session file. Files rotate once they exceed `rotate_bytes`:
+    `<directory>/<session>-0000.bin`, `-0001.bin`, ... Each file starts with
+    a header describing its layout, so read_journal() needs nothing else.
+
+    A failed write is logged and counted (write_errors, records_dropped);
+    the records of that batch are lost, the current file is abandoned and
+    the writer keeps draining into the next one.
+    """
+    def __init__(self, directory, feature_names=FEATURE_NAMES, session=None,
+                 rotate_bytes=DEFAULT_ROTATE_BYTES, flush_interval=0.5):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.feature_names = list(feature_names)
+        self.dtype = journal_dtype(len(self.feature_names))
+        self.session = session or time.strftime('journal-%Y%m%d-%H%M%S')
+        self.rotate_bytes = rotate_bytes
+        self.flush_interval = flush_interval
+        self.queue = collections.deque()
+        self.no_features = (0.0,) * len(self.feature_names)
+        self.file = None
+        self.file_index = -1
+        self.file_bytes = 0
+        # Counters
+        self.records_written = 0
+        self.files_written = 0
+        self.max_queued = 0
+        self.write_errors = 0
+        self.records_dropped = 0
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self._run, name='journal', daemon=True)
+        self.thread.start()
+
+    def record_decision(self, timestamp, features, prediction, action, position, price,
+                        realized_pnl=0.0, symbol=b''):
+        """
+        Queues one decision; `features` is a sequence in feature_names order.
+        """
+        self.queue.append((
+            timestamp, DECISION, ACTION_CODES.get(action, 0), 0, symbol, position, 0,
+            prediction, price, 0.0, realized_pnl, features,
+        ))
+
+    def record_fill(self, fill, symbol=b''):
+        """
+        Queues one ExecutionModule fill record.
+        """
+        self.queue.append((
+            fill['timestamp'], FILL, ACTION_CODES[fill['action']], REASON_CODES.get(fill['reason'] or '', 0),
+            symbol, fill['position'], fill['units'], np.nan, fill['price'], fill['pnl'],
+            fill['realized_pnl'], self.no_features,
+        ))
+
+    def _open_next_file(self):
+        if self.file is not None:
+            self.file.close()
+        self.file_index += 1
+        path = os.path.join(self.directory, f'{self.session}-{self.file_index:04d}.bin')
+        header = json.dumps({
+            'session': self.session,
+            'feature_names': self.feature_names,
+            'actions': ACTIONS,
+            'reasons': REASONS,
+            'dtype': self.dtype.descr,
+        }).encode()
+        self.file = open(path, 'ab')
+        self.file.write(MAGIC + len(header).to_bytes(4, 'little') + header)
+        self.file_bytes = self.file.tell()
+        self.files_written += 1
+
+    def flush(self):
+        """
+        Writes every queued record (called by the background thread).
+        """
+        queue = self.queue
+        count = len(queue)
+        if not count:
+            return
+        self.max_queued = max(self.max_queued, count)
+        try:
+            records = np.array([queue.popleft() for _ in range(count)], dtype=self.dtype)
+            if self.file is None or self.file_bytes >= self.rotate_bytes:
+                self._open_next_file()
+            data = records.tobytes()
+            self.file.write(data)
+            self.file.flush()
+        except Exception:
+            self.records_dropped += count
+            raise
+        self.file_bytes += len(data)
+        self.records_written += count
+
+    def _flush_logged(self):
+        # A write error must not stop the writer: log it and start a new file
+        try:
+            self.flush()
+        except Exception:
+            self.write_errors += 1
+            logger.exception("Trade journal write failed; continuing with a new file")
+            file, self.file = self.file, None
+            if file is not None:
+                try:
+                    file.close()
+                except OSError:
+                    pass
+
+    def _run(self):
+        while not self.stopping.wait(self.flush_interval):
+            self._flush_logged()
+
+    def close(self):
+        """
+        Stops the writer thread after writing everything still queued.
+        """
+        self.stopping.set()
+        self.thread.join()
+        self._flush_logged()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def stats(self):
+        return {
+            'records': self.records_written,
+            'files': self.files_written,
+            'queued': len(self.queue),
+            'max_queued': self.max_queued,
+            'write_errors': self.write_errors,
+            'records_dropped': self.records_dropped,
+        }
+
+
+def read_header(f):
+    if f.read(len(MAGIC)) != MAGIC:
+        raise ValueError(f"{f.name} is not a trade journal file")
+    length = int.from_bytes(f.read(4), 'little')
+    header = json.loads(f.read(length))
+    header['dtype'] = np.dtype([tuple(field) for field in header['dtype']])
+    return header
+
+
+def journal_files(path, session=None):
+    """
+    Journal files of a session in write order (path may be a single file).
+    """
+    if os.path.isfile(path):
+        return [path]
+    pattern = f'{session}-*.bin' if session else '*.bin'
+    return sorted(glob.glob(os.path.join(path, pattern)))
+
+
+def read_journal(path, session=None):
+    """
+    Loads journal records into one structured array plus the header of
+    the first file (feature names and code tables).
+    """
+    files = journal_files(path, session)
+    if not files:
+        raise FileNotFoundError(f"No journal files found at {path}")
+    arrays = []
+    header = None
+    for name in files:
+        with open(name, 'rb') as f:
+            file_header = read_header(f)
+            arrays.append(np.fromfile(f, dtype=file_header['dtype']))
+        header = header or file_header
+    return np.concatenate(arrays), header
+
+
+def journal_frame(path, session=None):
+    """
+    Loads a journal as a pandas DataFrame with decoded kind, action and
+    reason columns and one column per feature.
+    """
+    import pandas as pd
+
+    records, header = read_journal(path, session)
+    columns = {name: records[name] for name in records.dtype.names if name != 'features'}
+    frame = pd.DataFrame(columns)
+    frame['kind'] = np.where(records['kind'] == FILL, 'fill', 'decision')
+    frame['action'] = np.asarray(header['actions'], dtype=object)[records['action']]
+    frame['reason'] = np.asarray(header['reasons'], dtype=object)[records['reason']]
+    frame['symbol'] = frame['symbol'].str.decode('ascii')
+    for i, name in enumerate(header['feature_names']):
+        frame[name] = records['features'][:, i]
+    return frame
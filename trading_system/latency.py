@@ -0,0 +1,167 @@
+"""
+Low-overhead latency histograms for the tick processing hot path.
+"""
+import json
+import os
+import time
+
+# Sub-buckets per power of two (2**SUB_BUCKET_BITS); bounds relative error to 1/8
+SUB_BUCKET_BITS = 3
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+# Buckets cover any 64-bit nanosecond duration
+MAX_BITS = 64
+QUANTILES = {'p50': 0.5, 'p99': 0.99, 'p999': 0.999}
+
+
+def bucket_index(value):
+    """
+    Log-linear bucket of a non-negative integer: exact below 2*SUB_BUCKETS,
+    then SUB_BUCKETS equal-width buckets per power of two.
+    """
+    bits = value.bit_length()
+    if bits <= SUB_BUCKET_BITS + 1:
+        return value
+    shift = bits - SUB_BUCKET_BITS - 1
+    return ((bits - SUB_BUCKET_BITS) << SUB_BUCKET_BITS) + (value >> shift) - SUB_BUCKETS
+
+
+def bucket_upper_bound(index):
+    """
+    Largest value that falls into bucket `index`.
+    """
+    if index < 2 * SUB_BUCKETS:
+        return index
+    bits = (index >> SUB_BUCKET_BITS) + SUB_BUCKET_BITS
+    shift = bits - SUB_BUCKET_BITS - 1
+    lower = (SUB_BUCKETS + (index & (SUB_BUCKETS - 1))) << shift
+    return lower + (1 << shift) - 1
+
+
+class LatencyHistogram:
+    """
+    Fixed-bucket histogram of durations in nanoseconds.
+
+    record() is a handful of integer operations (~0.25us in CPython), so
+    it can be called on every tick; quantiles are reported as bucket upper
+    bounds (within 12.5%).
+    """
+    def __init__(self):
+        self.counts = [0] * (bucket_index((1 << MAX_BITS) - 1) + 1)
+        self.total = 0
+        self.max = 0
+
+    def record(self, ns):
+        # bucket_index() inlined for SUB_BUCKET_BITS == 3
+        bits = ns.bit_length()
+        self.counts[((bits - 3) << 3) + (ns >> (bits - 4)) - 8 if bits > 4 else ns] += 1
+        self.total += ns
+        if ns > self.max:
+            self.max = ns
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def quantile(self, q):
+        """
+        Upper bound of the bucket containing the q-th quantile (0 if empty).
+        """
+        total_count = self.count
+        if not total_count:
+            return 0
+        rank = q * total_count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= rank:
+                return min(bucket_upper_bound(index), self.max)
+        return self.max
+
+    def summary(self):
+        stats = {name: self.quantile(q) for name, q in QUANTILES.items()}
+        stats['max'] = self.max
+        count = self.count
+        stats['mean'] = self.total / count if count else 0.0
+        stats['count'] = count
+        return stats
+
+    def reset(self):
+        self.counts = [0] * len(self.counts)
+        self.total = 0
+        self.max = 0
+
+
+class LatencyRecorder:
+    """
+    Named latency histograms (one per pipeline stage) with periodic
+    snapshots written to a file.
+
+    A path ending in .json gets a JSON document; anything else gets the
+    Prometheus text exposition format (suitable for a node_exporter
+    textfile collector). Values are reported in seconds.
+
+    `gauges` maps a name to a callable returning a dict of numbers (e.g.
+    TickQueue.stats); they are added to every snapshot as they are.
+    """
+    def __init__(self, stages, snapshot_path=None, snapshot_interval=10.0):
+        self.histograms = {stage: LatencyHistogram() for stage in stages}
+        self.gauges = {}
+        self.snapshot_path = snapshot_path
+        self.snapshot_interval_ns = int(snapshot_interval * 1e9)
+        self.next_snapshot_ns = time.perf_counter_ns() + self.snapshot_interval_ns
+
+    def maybe_snapshot(self, now_ns):
+        """
+        Writes a snapshot if the snapshot interval has elapsed.
+        """
+        if now_ns >= self.next_snapshot_ns:
+            self.next_snapshot_ns = now_ns + self.snapshot_interval_ns
+            if self.snapshot_path:
+                self.write_snapshot(self.snapshot_path)
+
+    def snapshot(self):
+        """
+        Dict of stage -> {p50, p99, p999, max, mean, count}, durations in ns.
+        """
+        return {stage: hist.summary() for stage, hist in self.histograms.items()}
+
+    def to_prometheus(self, prefix='trading_stage_latency_seconds'):
+        lines = [
+            f'# HELP {prefix} Tick processing latency per pipeline stage.',
+            f'# TYPE {prefix} summary',
+        ]
+        for stage, stats in self.snapshot().items():
+            for name, q in QUANTILES.items():
+                lines.append(f'{prefix}{{stage="{stage}",quantile="{q}"}} {stats[name] / 1e9:.9f}')
+            lines.append(f'{prefix}_sum{{stage="{stage}"}} {self.histograms[stage].total / 1e9:.9f}')
+            lines.append(f'{prefix}_count{{stage="{stage}"}} {stats["count"]}')
+            lines.append(f'{prefix}_max{{stage="{stage}"}} {stats["max"] / 1e9:.9f}')
+        for name, stats in self.gauges.items():
+            lines.append(f'# TYPE trading_{name} gauge')
+            for stat, value in stats().items():
+                lines.append(f'trading_{name}{{stat="{stat}"}} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def to_json(self):
+        snapshot = {
+            stage: {name: value if name == 'count' else value / 1e9 for name, value in stats.items()}
+            for stage, stats in self.snapshot().items()
+        }
+        document = {'timestamp': time.time(), 'unit': 'seconds', 'stages': snapshot}
+        for name, stats in self.gauges.items():
+            document[name] = stats()
+        return json.dumps(document, indent=2)
+
+    def write_snapshot(self, path):
+        """
+        Atomically replaces `path` with the current snapshot.
+        """
+        text = self.to_json() if path.endswith('.json') else self.to_prometheus()
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+    def reset(self):
+        for hist in self.histograms.values():
+            hist.reset()
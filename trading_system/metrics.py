@@ -0,0 +1,55 @@
+"""
+Performance statistics for closed trades.
+"""
+import numpy as np
+
+SECONDS_PER_DAY = 86400
+TRADING_DAYS_PER_YEAR = 252
+
+
+def max_drawdown(pnl):
+    """
+    Largest peak-to-trough decline of the cumulative PnL curve (>= 0).
+    """
+    pnl = np.asarray(pnl, dtype=np.float64)
+    if len(pnl) == 0:
+        return 0.0
+    equity = np.concatenate(([0.0], np.cumsum(pnl)))
+    return float(np.max(np.maximum.accumulate(equity) - equity))
+
+
+def sharpe_ratio(pnl, exit_times=None):
+    """
+    Sharpe ratio of trade PnL.
+
+    With exit timestamps spanning at least two days, PnL is summed per day
+    and the daily Sharpe is annualized with sqrt(252). Otherwise the ratio
+    is mean / std of per-trade PnL. Returns 0.0 when undefined.
+    """
+    pnl = np.asarray(pnl, dtype=np.float64)
+    if len(pnl) < 2:
+        return 0.0
+    if exit_times is not None:
+        days = np.floor(np.asarray(exit_times, dtype=np.float64) / SECONDS_PER_DAY)
+        unique_days, day_index = np.unique(days, return_inverse=True)
+        if len(unique_days) >= 2:
+            daily = np.bincount(day_index, weights=pnl)
+            std = daily.std(ddof=1)
+            return float(daily.mean() / std * np.sqrt(TRADING_DAYS_PER_YEAR)) if std > 0 else 0.0
+    std = pnl.std(ddof=1)
+    return float(pnl.mean() / std) if std > 0 else 0.0
+
+
+def trade_stats(pnl, exit_times=None):
+    """
+    Summary statistics for a sequence of closed-trade PnL values.
+    """
+    pnl = np.asarray(pnl, dtype=np.float64)
+    return {
+        'trades': int(len(pnl)),
+        'total_pnl': float(pnl.sum()),
+        'win_rate': float(np.mean(pnl > 0)) if len(pnl) else 0.0,
+        'avg_pnl': float(pnl.mean()) if len(pnl) else 0.0,
+        'sharpe': sharpe_ratio(pnl, exit_times),
+        'max_drawdown': max_drawdown(pnl),
+    }
@@ -0,0 +1,252 @@
+"""
+Several instruments traded in one process with batched alpha inference.
+"""
+import asyncio
+import logging
+import time
+
+import numpy as np
+
+from trading_system.feature_engineering import FeatureEngineer, feature_names
+from trading_system.feature_buffer import FeatureRingBuffer
+from trading_system.decision_model import DecisionModel
+from trading_system.execution_module import ExecutionModule
+from trading_system.journal import TradeJournal
+from trading_system.position_model import PositionModel
+
+logger = logging.getLogger(__name__)
+
+class InstrumentState:
+    """
+    Per-symbol feature history, decision and execution state.
+    """
+    def __init__(self, symbol, config, gateway=None, journal=None):
+        self.symbol = symbol
+        self.features = FeatureEngineer(config)
+        window_sizes = [config.sequence_length]
+        if config.use_rl:
+            window_sizes.append(config.rl_window_size)
+        if config.use_position_rl:
+            window_sizes.append(config.position_rl_window_size)
+        self.feature_buffer = FeatureRingBuffer(max(window_sizes), self.features.feature_names)
+        self.execution_module = ExecutionModule(config, gateway=gateway, journal=journal, symbol=symbol)
+        self.symbol_bytes = symbol.encode()
+        # Set by MultiInstrumentPipeline.load_models()
+        self.decision_model = None
+        self.pos_model = None
+
+
+class MultiInstrumentPipeline:
+    """
+    Runs ticks tagged with a 'symbol' through per-symbol feature, decision
+    and execution state, sharing one set of models across symbols.
+
+    Instead of one LSTM forward pass per tick, ticks are gathered for
+    `time_slice` seconds (config.multi_instrument_time_slice); every symbol
+    that ticked in the slice then gets its window evaluated in a single
+    batched forward pass (batch dimension = symbols) and the probabilities
+    are routed back to that symbol's decision model and execution module.
+    Only the latest tick of each symbol within a slice is decided on, and
+    alpha inference is always windowed (alpha_streaming is not used).
+    With time_slice=0 each tick is decided on immediately, exactly as
+    TradingPipeline does.
+
+    Models are loaded by load_models() (or in the background by
+    load_models_async()) unless load_models=False, the same way as
+    TradingPipeline; ticks before that only warm up the features.
+    `gateways` optionally maps symbols to their OrderGateway. With
+    config.journal_dir set, decisions and fills of every symbol go to one
+    TradeJournal, tagged with the symbol.
+
+    If a time-slice flush fails, the error is logged and raised from the
+    next on_tick (or drain) call, so queue.consume stops instead of the
+    error being lost in the background task.
+
+    The TradingPipeline options config.latency_tracking and
+    config.inference_executor are not supported and raise ValueError;
+    there is no `is_stale` hook either, so every flush decides on the
+    latest tick of each symbol.
+    """
+    def __init__(self, config, symbols, time_slice=None, load_models=True, gateways=None):
+        self.config = config
+        self.symbols = list(symbols)
+        if not self.symbols:
+            raise ValueError("At least one symbol is required")
+        for option in ('latency_tracking', 'inference_executor'):
+            if getattr(config, option, False):
+                raise ValueError(f"config.{option} is not supported with several instruments")
+        if time_slice is None:
+            time_slice = getattr(config, 'multi_instrument_time_slice', 0.001)
+        self.time_slice = time_slice
+        self.journal = None
+        if getattr(config, 'journal_dir', None):
+            self.journal = TradeJournal(
+                config.journal_dir,
+                feature_names=feature_names(config),
+                rotate_bytes=int(getattr(config, 'journal_rotate_mb', 64) * (1 << 20)),
+                flush_interval=getattr(config, 'journal_flush_interval', 0.5),
+            )
+        gateways = gateways or {}
+        self.instruments = {
+            symbol: InstrumentState(symbol, config, gateways.get(symbol), self.journal) for symbol in self.symbols
+        }
+        # Preallocated input of the batched forward pass
+        n_features = len(self.instruments[self.symbols[0]].feature_buffer.feature_names)
+        self.batch = np.zeros((len(self.symbols), config.sequence_length, n_features), dtype=np.float32)
+        # Latest (tick, features) per symbol waiting for the next flush
+        self.pending = {}
+        self.flush_task = None
+        # Error of a failed background flush, raised from the next on_tick
+        self.flush_error = None
+        self.alpha_model = None
+        self.models_ready = False
+        self.startup_timings = {}
+        self.warmup_ticks = 0
+        # Batching counters
+        self.batches = 0
+        self.batched_windows = 0
+        self.max_batch_seen = 0
+        if load_models:
+            self.load_models()
+
+    def load_models(self):
+        """
+        Loads the alpha model and one copy of each RL model shared by every
+        symbol, runs a warm-up inference and records startup_timings.
+        """
+        clock = time.perf_counter
+        timings = self.startup_timings
+        start = clock()
+        from trading_system.alpha_model import AlphaModel
+        t_import = clock()
+        timings['alpha_import'] = t_import - start
+        self.alpha_model = AlphaModel(self.config)
+        t_alpha = clock()
+        timings['alpha_load'] = t_alpha - t_import
+        decision_rl = None
+        for instrument in self.instruments.values():
+            instrument.decision_model = DecisionModel(self.config, instrument.feature_buffer, decision_rl)
+            decision_rl = getattr(instrument.decision_model, 'rl_model', None)
+        t_decision = clock()
+        timings['decision_load'] = t_decision - t_alpha
+        position_rl = None
+        for instrument in self.instruments.values():
+            instrument.pos_model = PositionModel(self.config, instrument.feature_buffer, position_rl)
+            position_rl = getattr(instrument.pos_model, 'rl_model', None)
+        t_position = clock()
+        timings['position_load'] = t_position - t_decision
+        # One full-width batch so first-call overheads are paid here
+        first = self.instruments[self.symbols[0]]
+        self.alpha_model.predict_windows(self.batch)
+        first.decision_model.warmup()
+        first.pos_model.warmup()
+        timings['first_inference'] = clock() - t_position
+        self.models_ready = True
+
+    async def load_models_async(self):
+        """
+        Runs load_models() on a worker thread so ingestion can start meanwhile.
+        """
+        await asyncio.to_thread(self.load_models)
+
+    async def on_tick(self, tick):
+        self._raise_flush_error()
+        instrument = self.instruments[tick['symbol']]
+        instrument.features.update(tick)
+        feat_vec = instrument.features.compute_features()
+        instrument.feature_buffer.append(feat_vec)
+        if not self.models_ready:
+            self.warmup_ticks += 1
+            return
+        self.pending[instrument.symbol] = (tick, feat_vec)
+        if self.time_slice <= 0:
+            await self.flush()
+        elif self.flush_task is None:
+            self.flush_task = asyncio.ensure_future(self._flush_after(self.time_slice))
+            self.flush_task.add_done_callback(self._on_flush_done)
+
+    async def _flush_after(self, delay):
+        await asyncio.sleep(delay)
+        self.flush_task = None
+        await self.flush()
+
+    def _on_flush_done(self, task):
+        # Keeps the error of a failed background flush for the next on_tick
+        if task.cancelled() or task.exception() is None:
+            return
+        logger.error("Multi-instrument flush failed", exc_info=task.exception())
+        self.flush_error = task.exception()
+
+    def _raise_flush_error(self):
+        if self.flush_error is not None:
+            error, self.flush_error = self.flush_error, None
+            raise error
+
+    async def flush(self):
+        """
+        Decides on and executes every pending symbol, with one batched alpha
+        forward pass over the symbols that have a full window.
+        """
+        pending, self.pending = self.pending, {}
+        if not pending:
+            return
+        sequence_length = self.config.sequence_length
+        use_position_rl = self.config.use_position_rl
+        decisions = {}
+        predictions = {}
+        ready = []
+        for symbol, (tick, feat_vec) in pending.items():
+            instrument = self.instruments[symbol]
+            if instrument.execution_module.position != 0 and use_position_rl:
+                predictions[symbol] = float('nan')
+                decisions[symbol] = instrument.pos_model.decide(feat_vec, instrument.execution_module)
+            elif len(instrument.feature_buffer) >= sequence_length:
+                self.batch[len(ready)] = instrument.feature_buffer.window(sequence_length)
+                ready.append(symbol)
+            else:
+                # Same neutral probability AlphaModel.predict returns without a full window
+                predictions[symbol] = 0.5
+                decisions[symbol] = instrument.decision_model.decide(0.5, feat_vec, instrument.execution_module)
+        if ready:
+            probas = self.alpha_model.predict_windows(self.batch[:len(ready)])
+            self.batches += 1
+            self.batched_windows += len(ready)
+            self.max_batch_seen = max(self.max_batch_seen, len(ready))
+            for symbol, proba in zip(ready, probas.tolist()):
+                predictions[symbol] = proba
+                instrument = self.instruments[symbol]
+                decisions[symbol] = instrument.decision_model.decide(proba, pending[symbol][1], instrument.execution_module)
+        for symbol, (tick, _) in pending.items():
+            instrument = self.instruments[symbol]
+            execution = instrument.execution_module
+            await execution.execute(decisions[symbol], tick)
+            if self.journal is not None:
+                self.journal.record_decision(
+                    tick['timestamp'], instrument.feature_buffer.window(1)[0].tolist(), predictions[symbol],
+                    decisions[symbol]['action'], execution.position, tick['last_price'],
+                    execution.realized_pnl, instrument.symbol_bytes,
+                )
+
+    async def drain(self):
+        """
+        Flushes pending ticks now instead of waiting for the time slice.
+        """
+        if self.flush_task is not None:
+            self.flush_task.cancel()
+            self.flush_task = None
+        self._raise_flush_error()
+        await self.flush()
+
+    def close(self):
+        """
+        Flushes the journal, if any.
+        """
+        if self.journal is not None:
+            self.journal.close()
+
+    def stats(self):
+        return {
+            'batches': self.batches,
+            'mean_batch': self.batched_windows / self.batches if self.batches else 0.0,
+            'max_batch': self.max_batch_seen,
+        }
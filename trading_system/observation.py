@@ -0,0 +1,72 @@
+"""
+RL observations shared by the training environments and the live models.
+"""
+import numpy as np
+
+# Position, cash and unrealized PnL appended after the feature window
+ACCOUNT_CHANNELS = 3
+# Column of the mid price in the feature vectors (FEATURE_NAMES[0])
+MID_PRICE = 0
+
+
+def observation_size(window_size, n_features):
+    return window_size * n_features + ACCOUNT_CHANNELS
+
+
+def build_observation(window, position, entry_price, cash, max_position, out=None):
+    """
+    Observation of a window of feature vectors (oldest first) plus the account.
+
+    Each feature column is z-scored over the window itself, so an
+    observation depends only on the ticks it covers: nothing is learned
+    from later data, and the environments (stepping over
+    FeatureEngineer.compute_features_batch output) and the live models
+    (reading the FeatureRingBuffer) build the same values. The window is
+    followed by position / max_position, cash / price and the unrealized
+    PnL in units of the window's mid-price standard deviation, where price
+    is the latest mid price.
+
+    Takes one window (window_size, n_features) with scalar account values,
+    or a batch (n, window_size, n_features) with account arrays of length
+    n. Returns float32, written to `out` if given.
+    """
+    window = np.asarray(window, dtype=np.float64)
+    lead = window.shape[:-2]
+    mean = window.mean(axis=-2, keepdims=True)
+    std = window.std(axis=-2, keepdims=True)
+    std = np.where(std > 0, std, 1.0)
+    if out is None:
+        out = np.empty(lead + (observation_size(*window.shape[-2:]),), dtype=np.float32)
+    out[..., :-ACCOUNT_CHANNELS] = ((window - mean) / std).reshape(lead + (-1,))
+    price = window[..., -1, MID_PRICE]
+    out[..., -3] = np.divide(position, max_position)
+    out[..., -2] = np.divide(cash, np.where(price != 0, price, 1.0))
+    out[..., -1] = np.multiply(position, price - entry_price) / std[..., 0, MID_PRICE]
+    return out
+
+
+def account_state(account):
+    """
+    (position, entry_price, cash) of an ExecutionModule-like account, as
+    the environments track them; a flat account when None. Cash is the
+    realized PnL less the cost of the open position.
+    """
+    if account is None:
+        return 0, 0.0, 0.0
+    position = account.position
+    entry_price = account.entry_price if position and account.entry_price is not None else 0.0
+    return position, entry_price, account.realized_pnl - position * entry_price
+
+
+def check_observation_size(rl_model, size):
+    """
+    Raises ValueError if the policy was trained on observations of another size.
+    """
+    shape = getattr(rl_model, 'observation_shape', None)
+    if shape is None:
+        shape = getattr(getattr(rl_model, 'observation_space', None), 'shape', None)
+    if shape is not None and int(np.prod(shape)) != size:
+        raise ValueError(
+            f"RL model expects observations of size {int(np.prod(shape))}, but the configured window "
+            f"and features give {size}; retrain it with the same window size and features"
+        )
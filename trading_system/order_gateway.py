@@ -0,0 +1,356 @@
+"""
+Asynchronous order gateway with an ib_insync-style broker interface.
+
+OrderGateway talks to a broker object with the ib_insync.IB order API
+(placeOrder, cancelOrder, orderStatusEvent, execDetailsEvent): either a
+connected ib_insync.IB or the in-process SimulatedBroker below, which
+reproduces the same objects and events with configurable latency,
+slippage and partial fills for offline load tests.
+"""
+import asyncio
+import datetime
+import time
+
+from trading_system.latency import LatencyHistogram
+
+# Order states tracked by the gateway
+PENDING = 'pending'
+PARTIAL = 'partial'
+FILLED = 'filled'
+CANCELLED = 'cancelled'
+ORDER_STATES = (PENDING, PARTIAL, FILLED, CANCELLED)
+# ib_insync statuses of orders that can no longer fill
+DONE_STATUSES = ('Filled', 'Cancelled', 'ApiCancelled', 'Inactive')
+
+
+class Event:
+    """
+    Minimal eventkit-style event: handlers are connected with += and
+    called with the emitted arguments.
+    """
+    def __init__(self):
+        self.handlers = []
+
+    def __iadd__(self, handler):
+        self.handlers.append(handler)
+        return self
+
+    def __isub__(self, handler):
+        self.handlers.remove(handler)
+        return self
+
+    def emit(self, *args):
+        for handler in list(self.handlers):
+            handler(*args)
+
+
+# Stand-ins for the ib_insync objects used by the gateway (same attribute names)
+class Contract:
+    def __init__(self, symbol='', secType='FUT', exchange=''):
+        self.symbol = symbol
+        self.secType = secType
+        self.exchange = exchange
+
+
+class Order:
+    def __init__(self, action, totalQuantity, orderType='MKT', orderId=0):
+        self.orderId = orderId
+        self.action = action
+        self.totalQuantity = totalQuantity
+        self.orderType = orderType
+
+
+class MarketOrder(Order):
+    def __init__(self, action, totalQuantity):
+        super().__init__(action, totalQuantity, 'MKT')
+
+
+class OrderStatus:
+    def __init__(self, orderId, status, filled, remaining, avgFillPrice=0.0):
+        self.orderId = orderId
+        self.status = status
+        self.filled = filled
+        self.remaining = remaining
+        self.avgFillPrice = avgFillPrice
+
+
+class Execution:
+    def __init__(self, execId, time, side, shares, price, orderId, cumQty, avgPrice):
+        self.execId = execId
+        self.time = time
+        self.side = side
+        self.shares = shares
+        self.price = price
+        self.orderId = orderId
+        self.cumQty = cumQty
+        self.avgPrice = avgPrice
+
+
+class Fill:
+    def __init__(self, contract, execution, time):
+        self.contract = contract
+        self.execution = execution
+        self.time = time
+
+
+class Trade:
+    def __init__(self, contract, order, orderStatus):
+        self.contract = contract
+        self.order = order
+        self.orderStatus = orderStatus
+        self.fills = []
+
+    def isDone(self):
+        return self.orderStatus.status in DONE_STATUSES
+
+    def filled(self):
+        return sum(fill.execution.shares for fill in self.fills)
+
+    def remaining(self):
+        return self.order.totalQuantity - self.filled()
+
+
+def order_state(order_status):
+    """
+    Gateway state of an ib_insync OrderStatus.
+    """
+    if order_status.status == 'Filled':
+        return FILLED
+    if order_status.status in DONE_STATUSES:
+        return CANCELLED
+    return PARTIAL if order_status.filled > 0 else PENDING
+
+
+class SimulatedBroker:
+    """
+    In-process broker implementing the subset of ib_insync.IB used by
+    OrderGateway.
+
+    Orders are acknowledged on the next event loop iteration and filled
+    `latency` seconds after submission at the contract's last price moved
+    `slippage` price points against the order. With `partial_fill_units`,
+    an order fills in chunks of that size, `latency` apart. Prices come
+    from update_market(), which the gateway feeds with the strategy's ticks.
+    """
+    def __init__(self, latency=0.005, slippage=0.0, partial_fill_units=None):
+        self.latency = latency
+        self.slippage = slippage
+        self.partial_fill_units = partial_fill_units
+        # Last traded price per contract symbol
+        self.prices = {}
+        self.orderStatusEvent = Event()
+        self.execDetailsEvent = Event()
+        self._trades = {}
+        self.next_order_id = 1
+        self.next_exec_id = 1
+
+    def update_market(self, tick, contract=None):
+        symbol = getattr(contract, 'symbol', '')
+        self.prices[symbol] = tick['last_price']
+
+    def placeOrder(self, contract, order):
+        if not order.orderId:
+            order.orderId = self.next_order_id
+            self.next_order_id += 1
+        trade = Trade(contract, order, OrderStatus(order.orderId, 'PendingSubmit', 0, order.totalQuantity))
+        self._trades[order.orderId] = trade
+        loop = asyncio.get_running_loop()
+        loop.call_soon(self._set_status, trade, 'Submitted')
+        loop.call_later(self.latency, self._fill, trade)
+        return trade
+
+    def cancelOrder(self, order):
+        trade = self._trades.get(order.orderId)
+        if trade is not None and not trade.isDone():
+            self._set_status(trade, 'Cancelled')
+        return trade
+
+    def trades(self):
+        return list(self._trades.values())
+
+    def openTrades(self):
+        return [trade for trade in self._trades.values() if not trade.isDone()]
+
+    def _set_status(self, trade, status):
+        if trade.isDone():
+            return
+        trade.orderStatus.status = status
+        self.orderStatusEvent.emit(trade)
+
+    def _fill(self, trade):
+        if trade.isDone():
+            return
+        status = trade.orderStatus
+        units = status.remaining
+        if self.partial_fill_units:
+            units = min(units, self.partial_fill_units)
+        buy = trade.order.action == 'BUY'
+        price = self.prices.get(getattr(trade.contract, 'symbol', ''), 0.0)
+        price += self.slippage if buy else -self.slippage
+        status.avgFillPrice = (status.avgFillPrice * status.filled + price * units) / (status.filled + units)
+        status.filled += units
+        status.remaining -= units
+        now = datetime.datetime.now(datetime.timezone.utc)
+        execution = Execution(
+            f'sim.{self.next_exec_id}', now, 'BOT' if buy else 'SLD', units, price,
+            trade.order.orderId, status.filled, status.avgFillPrice,
+        )
+        self.next_exec_id += 1
+        fill = Fill(trade.contract, execution, now)
+        trade.fills.append(fill)
+        if not status.remaining:
+            status.status = 'Filled'
+        self.execDetailsEvent.emit(trade, fill)
+        self.orderStatusEvent.emit(trade)
+        if status.remaining:
+            asyncio.get_running_loop().call_later(self.latency, self._fill, trade)
+
+
+class OrderGateway:
+    """
+    Non-blocking order submission and order tracking for one contract.
+
+    submit() places an order and returns its Trade at once; acknowledgements
+    and fills arrive later as broker events. Every order is indexed by id in
+    `trades` and by state in `by_state` (pending, partial, filled,
+    cancelled), and fills update the net `position`. `on_fill(trade, fill)`
+    is called for every execution and `on_done(trade)` once an order is
+    fully filled or cancelled (after all of its fills were reported).
+    Submit-to-last-fill times are recorded in `fill_latency` (ns).
+    """
+    def __init__(self, broker, contract=None, order_factory=MarketOrder):
+        self.broker = broker
+        self.contract = contract
+        self.order_factory = order_factory
+        self.trades = {}
+        self.by_state = {state: set() for state in ORDER_STATES}
+        self.states = {}
+        self.filled_units = {}
+        self.position = 0
+        self.on_fill = None
+        self.on_done = None
+        # The simulated broker fills against the strategy's ticks; a real broker has its own feed
+        self._update_market = getattr(broker, 'update_market', None)
+        self.submitted_ns = {}
+        self.fill_latency = LatencyHistogram()
+        self.submitted = 0
+        self.fills = 0
+        broker.orderStatusEvent += self._on_status
+        broker.execDetailsEvent += self._on_exec
+
+    def update_market(self, tick):
+        if self._update_market is not None:
+            self._update_market(tick, self.contract)
+
+    def submit(self, action, quantity):
+        """
+        Places a market order ('BUY' or 'SELL') without waiting for it.
+        """
+        trade = self.broker.placeOrder(self.contract, self.order_factory(action, quantity))
+        order_id = trade.order.orderId
+        self.trades[order_id] = trade
+        self.filled_units[order_id] = 0
+        self.submitted_ns[order_id] = time.perf_counter_ns()
+        self.submitted += 1
+        self._set_state(order_id, PENDING)
+        return trade
+
+    def cancel(self, order_id):
+        trade = self.trades[order_id]
+        if not trade.isDone():
+            self.broker.cancelOrder(trade.order)
+        return trade
+
+    def cancel_all(self):
+        for order_id in self.open_orders():
+            self.cancel(order_id)
+
+    def open_orders(self):
+        """
+        Ids of orders that can still fill.
+        """
+        return self.by_state[PENDING] | self.by_state[PARTIAL]
+
+    def _set_state(self, order_id, state):
+        previous = self.states.get(order_id)
+        if previous == state:
+            return
+        if previous is not None:
+            self.by_state[previous].discard(order_id)
+        self.by_state[state].add(order_id)
+        self.states[order_id] = state
+
+    def _on_exec(self, trade, fill):
+        order_id = trade.order.orderId
+        if order_id not in self.trades:
+            return
+        units = fill.execution.shares
+        self.position += units if fill.execution.side == 'BOT' else -units
+        self.filled_units[order_id] += units
+        self.fills += 1
+        if self.on_fill is not None:
+            self.on_fill(trade, fill)
+        self._on_status(trade)
+
+    def _on_status(self, trade):
+        order_id = trade.order.orderId
+        previous = self.states.get(order_id)
+        if previous is None or previous in (FILLED, CANCELLED):
+            return
+        state = order_state(trade.orderStatus)
+        # Not final until every fill has been reported (IB may send the status first)
+        if state == FILLED and self.filled_units[order_id] < trade.order.totalQuantity:
+            state = PARTIAL
+        self._set_state(order_id, state)
+        if state in (FILLED, CANCELLED):
+            if state == FILLED:
+                self.fill_latency.record(time.perf_counter_ns() - self.submitted_ns[order_id])
+            if self.on_done is not None:
+                self.on_done(trade)
+
+    def stats(self):
+        latency = self.fill_latency.summary()
+        stats = {state: len(ids) for state, ids in self.by_state.items()}
+        stats.update({
+            'submitted': self.submitted,
+            'fills': self.fills,
+            'position': self.position,
+            'fill_latency_p50_ms': latency['p50'] / 1e6,
+            'fill_latency_p99_ms': latency['p99'] / 1e6,
+        })
+        return stats
+
+
+async def connect_broker(config):
+    """
+    Broker for config.order_gateway: a SimulatedBroker or a connected ib_insync.IB.
+    """
+    kind = getattr(config, 'order_gateway', None)
+    if kind == 'simulated':
+        return SimulatedBroker(
+            latency=getattr(config, 'broker_latency', 0.005),
+            slippage=getattr(config, 'broker_slippage', 0.0),
+            partial_fill_units=getattr(config, 'broker_partial_fill_units', None),
+        )
+    if kind == 'ib':
+        from ib_insync import IB
+        ib = IB()
+        await ib.connectAsync(config.ib_host, config.ib_port, clientId=config.ib_client_id)
+        return ib
+    raise ValueError(f"Unknown order gateway: {kind}")
+
+
+async def create_order_gateway(broker, config, symbol=None):
+    """
+    OrderGateway for one futures symbol (config.ib_symbol by default); with
+    IB, the symbol is resolved to its front-month contract.
+    """
+    symbol = symbol or getattr(config, 'ib_symbol', 'ES')
+    if isinstance(broker, SimulatedBroker):
+        return OrderGateway(broker, Contract(symbol))
+    from ib_insync import ContFuture, Future
+    from ib_insync import MarketOrder as IBMarketOrder
+    front, = await broker.qualifyContractsAsync(ContFuture(symbol, config.ib_exchange))
+    contract = Future(conId=front.conId)
+    await broker.qualifyContractsAsync(contract)
+    return OrderGateway(broker, contract, order_factory=IBMarketOrder)
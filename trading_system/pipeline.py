@@ -0,0 +1,226 @@
+"""
+Tick processing pipeline shared by live trading and historical replay.
+"""
+import asyncio
+import time
+
+from trading_system.feature_engineering import FeatureEngineer
+from trading_system.feature_buffer import FeatureRingBuffer
+from trading_system.decision_model import DecisionModel
+from trading_system.execution_module import ExecutionModule
+from trading_system.position_model import PositionModel
+from trading_system.latency import LatencyRecorder
+from trading_system.inference import STALE, InferenceExecutor
+from trading_system.journal import TradeJournal
+
+# Journaled prediction of decisions made by the position model
+NO_PREDICTION = float('nan')
+# Decision for ticks whose model work was skipped: no new orders, exits still checked
+EXITS_ONLY = {'action': 'HOLD', 'confidence': None}
+# Stages timed when latency tracking is enabled
+LATENCY_STAGES = ['features', 'alpha', 'decision', 'position', 'inference', 'execution', 'total']
+
+
+class TradingPipeline:
+    """
+    Runs each tick through FeatureEngineer -> AlphaModel ->
+    DecisionModel/PositionModel -> ExecutionModule.
+
+    With config.latency_tracking enabled, on_tick records each stage's
+    duration in `latency` (a LatencyRecorder); when disabled the timing
+    calls are skipped.
+
+    With config.inference_executor enabled, the model calls (_decide) run
+    on an InferenceExecutor thread and on_tick awaits them, so the event
+    loop keeps servicing the feed meanwhile. If `is_stale` (a callable set
+    by the runner, e.g. "newer ticks are queued") is true when a tick
+    reaches the models, their work is skipped and the tick is executed as
+    a HOLD, so the time, profit and stop-loss exits still run on it.
+
+    With config.journal_dir set, every decision (tick time, features,
+    prediction, action, resulting position) and every fill is queued to a
+    TradeJournal that writes them from a background thread.
+
+    With load_models=False the models (and torch) are not loaded in the
+    constructor: on_tick only warms up the feature history until
+    load_models() or load_models_async() has finished, then switches to
+    the normal processing. Load times and the first (warm-up) inference
+    time are kept in `startup_timings`, in seconds.
+    """
+    def __init__(self, config, execution_module=None, load_models=True):
+        self.config = config
+        self.features = FeatureEngineer(config)
+        # One feature history shared by all models, written once per tick
+        window_sizes = [config.sequence_length]
+        if config.use_rl:
+            window_sizes.append(config.rl_window_size)
+        if config.use_position_rl:
+            window_sizes.append(config.position_rl_window_size)
+        self.feature_buffer = FeatureRingBuffer(max(window_sizes), self.features.feature_names)
+        self.execution_module = execution_module or ExecutionModule(config)
+        # Decision and fill journal written off the tick path
+        self.journal = None
+        if getattr(config, 'journal_dir', None):
+            self.journal = TradeJournal(
+                config.journal_dir,
+                feature_names=self.feature_buffer.feature_names,
+                rotate_bytes=int(getattr(config, 'journal_rotate_mb', 64) * (1 << 20)),
+                flush_interval=getattr(config, 'journal_flush_interval', 0.5),
+            )
+            self.execution_module.journal = self.journal
+        # Models are set by load_models()
+        self.alpha_model = None
+        self.decision_model = None
+        # Position management RL model (after first entry)
+        self.pos_model = None
+        self.models_ready = False
+        self.startup_timings = {}
+        self.warmup_ticks = 0
+        # Per-stage latency histograms and the end of the last timed stage
+        self.latency = None
+        self.lap_start = 0
+        if getattr(config, 'latency_tracking', False):
+            self.latency = LatencyRecorder(
+                LATENCY_STAGES,
+                snapshot_path=getattr(config, 'latency_snapshot_path', None),
+                snapshot_interval=getattr(config, 'latency_snapshot_interval', 10.0),
+            )
+        # Optional inference thread for the model calls
+        self.inference = None
+        self.is_stale = None
+        self.stale_ticks = 0
+        if getattr(config, 'inference_executor', False):
+            self.inference = InferenceExecutor(
+                max_in_flight=getattr(config, 'inference_max_in_flight', 1),
+                torch_threads=getattr(config, 'inference_threads', 1),
+                cpus=getattr(config, 'inference_cpus', None),
+            )
+        if load_models:
+            self.load_models()
+        else:
+            # Feature warm-up until the models are loaded (swaps in _on_tick_warmup)
+            self._ready_on_tick = self.on_tick
+            self.on_tick = self._on_tick_warmup
+
+    def load_models(self):
+        """
+        Loads the alpha, decision and position models and runs one warm-up
+        inference through each, recording the timings in startup_timings.
+        """
+        clock = time.perf_counter
+        timings = self.startup_timings
+        start = clock()
+        # Imports torch, so only done once the models are actually needed
+        from trading_system.alpha_model import AlphaModel
+        t_import = clock()
+        timings['alpha_import'] = t_import - start
+        self.alpha_model = AlphaModel(self.config, self.feature_buffer)
+        t_alpha = clock()
+        timings['alpha_load'] = t_alpha - t_import
+        self.decision_model = DecisionModel(self.config, self.feature_buffer)
+        t_decision = clock()
+        timings['decision_load'] = t_decision - t_alpha
+        self.pos_model = PositionModel(self.config, self.feature_buffer)
+        t_position = clock()
+        timings['position_load'] = t_position - t_decision
+        # Pay one-off first-call costs here rather than on the first live tick
+        self.alpha_model.warmup()
+        self.decision_model.warmup()
+        self.pos_model.warmup()
+        timings['first_inference'] = clock() - t_position
+        self.models_ready = True
+
+    async def load_models_async(self):
+        """
+        Runs load_models() off the event loop (on the inference thread when
+        there is one), so ingestion can start while the models load.
+        """
+        if self.inference is not None:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self.inference.executor, self.load_models)
+        else:
+            await asyncio.to_thread(self.load_models)
+
+    async def _on_tick_warmup(self, tick):
+        # Fills the feature history until the models are ready
+        if self.models_ready:
+            await self._ready_on_tick(tick)
+            return
+        self.features.update(tick)
+        self.feature_buffer.append(self.features.compute_features())
+        self.warmup_ticks += 1
+
+    async def on_tick(self, tick):
+        # With latency tracking, each stage is timed by _lap()
+        timed = self.latency is not None
+        if timed:
+            start = self.lap_start = time.perf_counter_ns()
+        # Update features and compute
+        self.features.update(tick)
+        feat_vec = self.features.compute_features()
+        self.feature_buffer.append(feat_vec)
+        if timed:
+            self._lap('features')
+        if self.inference is None:
+            prediction, decision = self._decide(feat_vec)
+        else:
+            # Models run on the inference thread while the event loop keeps going
+            submitted = self.lap_start
+            result = await self.inference.run(self._decide, feat_vec, is_stale=self.is_stale)
+            if timed:
+                self.lap_start = submitted
+                self._lap('inference')
+            if result is STALE:
+                # A newer tick is waiting and gets the models; this one only checks exits
+                self.stale_ticks += 1
+                result = NO_PREDICTION, EXITS_ONLY
+            prediction, decision = result
+        # Execute orders based on decision
+        await self.execution_module.execute(decision, tick)
+        if timed:
+            self._lap('execution')
+            self.latency.histograms['total'].record(self.lap_start - start)
+            self.latency.maybe_snapshot(self.lap_start)
+        if self.journal is not None:
+            self._journal_decision(tick, prediction, decision)
+
+    def _decide(self, feat_vec):
+        # Model section of on_tick, run on the inference thread when offloaded
+        timed = self.latency is not None
+        # Choose decision logic: initial entry vs. position management
+        if self.execution_module.position != 0 and self.config.use_position_rl:
+            # After first entry, use RL-based position management
+            decision = self.pos_model.decide(feat_vec, self.execution_module)
+            if timed:
+                self._lap('position')
+            return NO_PREDICTION, decision
+        # Initial trade decision using alpha model and threshold/RL
+        prediction = self.alpha_model.predict(feat_vec)
+        if timed:
+            self._lap('alpha')
+        decision = self.decision_model.decide(prediction, feat_vec, self.execution_module)
+        if timed:
+            self._lap('decision')
+        return prediction, decision
+
+    def _lap(self, stage):
+        # Records the time since the previous lap as `stage`
+        now = time.perf_counter_ns()
+        self.latency.histograms[stage].record(now - self.lap_start)
+        self.lap_start = now
+
+    def _journal_decision(self, tick, prediction, decision):
+        execution = self.execution_module
+        self.journal.record_decision(
+            tick['timestamp'], self.feature_buffer.window(1)[0].tolist(), prediction, decision['action'],
+            execution.position, tick['last_price'], execution.realized_pnl,
+        )
+
+    def close(self):
+        """
+        Stops and joins the inference thread and closes the journal, if any.
+        """
+        if self.inference is not None:
+            self.inference.close()
+        if self.journal is not None:
+            self.journal.close()
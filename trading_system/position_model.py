@@ -2,10 +2,10 @@
 Position management RL model: decides whether to hold, exit, or add a unit after the first entry.
 """
 import numpy as np
-from collections import deque
-from stable_baselines3 import DQN
 
-from trading_system.alpha_model import AlphaModel
+from trading_system.feature_buffer import FeatureRingBuffer
+from trading_system.feature_engineering import feature_names
+from trading_system.observation import account_state, build_observation, check_observation_size, observation_size
 
 class PositionModel:
     """
@@ -13,36 +13,56 @@ class PositionModel:
     exit the position (reduce by one unit), or add one unit (up to max_positions).
     Actions: 0=EXIT, 1=HOLD, 2=ADD
     """
-    def __init__(self, config):
+    def __init__(self, config, feature_buffer=None, rl_model=None):
         self.config = config
         self.use_position_rl = getattr(config, 'use_position_rl', False)
         if self.use_position_rl:
-            # Feature names must match those used during RL training
-            try:
-                self.FEATURE_NAMES = AlphaModel.FEATURE_NAMES
-            except Exception:
-                self.FEATURE_NAMES = []
-            # Buffer to store recent feature vectors for RL state
-            self.buffer = deque(maxlen=config.position_rl_window_size)
-            # Load trained RL model
-            self.rl_model = DQN.load(config.position_rl_model_path)
+            # Buffer of recent feature vectors for RL state (shared if given)
+            self.window_size = config.position_rl_window_size
+            # Position scale of the observation (the environment's max_position)
+            self.max_position = getattr(config, 'max_positions', 1)
+            self.owns_buffer = feature_buffer is None
+            self.buffer = FeatureRingBuffer(self.window_size, feature_names(config)) if self.owns_buffer else feature_buffer
+            # Load trained RL model (unless an already loaded one is shared)
+            if rl_model is None:
+                from trading_system.q_network import load_dqn_policy
+                rl_model = load_dqn_policy(
+                    config.position_rl_model_path, getattr(config, 'rl_inference_backend', 'numpy')
+                )
+            check_observation_size(rl_model, observation_size(self.window_size, len(self.buffer.feature_names)))
+            self.rl_model = rl_model
 
-    def decide(self, features):  # noqa: C901
+    def warmup(self):
+        """
+        Runs one RL policy prediction on an all-zero state, if RL is enabled.
+        """
+        if self.use_position_rl:
+            state = np.zeros(observation_size(self.window_size, len(self.buffer.feature_names)), dtype=np.float32)
+            self.rl_model.predict(state, deterministic=True)
+
+    def observation(self, account=None):
+        """
+        RL state: the feature window and account, as TradingEnv observes them.
+        """
+        position, entry_price, cash = account_state(account)
+        return build_observation(self.buffer.window(self.window_size), position, entry_price, cash, self.max_position)
+
+    def decide(self, features, account=None):  # noqa: C901
         """
         Decide action based on RL policy: EXIT, HOLD, or ADD.
-        Returns a dict with 'action' key.
+        `account` (e.g. the ExecutionModule) supplies the open position for
+        the RL state. Returns a dict with 'action' key.
         """
         # Default to hold if RL not enabled
         if not self.use_position_rl:
             return {'action': 'HOLD', 'confidence': None}
-        # Append current feature vector in consistent order
-        fv = [features.get(name, 0.0) for name in self.FEATURE_NAMES]
-        self.buffer.append(fv)
+        # Append current feature vector unless the pipeline already did
+        if self.owns_buffer:
+            self.buffer.append(features)
         # If not enough history, hold
-        if len(self.buffer) < self.buffer.maxlen:
+        if len(self.buffer) < self.window_size:
             return {'action': 'HOLD', 'confidence': None}
-        # Prepare state for RL model
-        state = np.array(self.buffer, dtype=np.float32).flatten()
+        state = self.observation(account)
         # Predict action: 0=EXIT, 1=HOLD, 2=ADD
         action, _ = self.rl_model.predict(state, deterministic=True)
         mapping = {0: 'EXIT', 1: 'HOLD', 2: 'ADD'}
@@ -0,0 +1,205 @@
+"""
+Chunked conversion of raw Sierra-style ES exports to the tick format.
+
+Raw files have columns like Date, Time, Open, High, Low, Last, Volume,
+NumberOfTrades, BidVolume, AskVolume (names may carry leading spaces).
+The output columns are:
+    timestamp,best_bid,best_ask,bid_size,ask_size,last_price
+"""
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from trading_system.tick_store import SESSION_OPEN_HOUR, TickStoreWriter, trading_dates
+
+OUTPUT_COLUMNS = ['timestamp', 'best_bid', 'best_ask', 'bid_size', 'ask_size', 'last_price']
+RENAME_MAP = {
+    'Low': 'best_bid',
+    'High': 'best_ask',
+    'BidVolume': 'bid_size',
+    'AskVolume': 'ask_size',
+    'Last': 'last_price',
+}
+DEFAULT_CHUNK_BYTES = 64 << 20
+
+
+def _digits(strings, width):
+    """
+    (n, width) array of character codes minus '0' for fixed-width strings.
+    """
+    raw = np.asarray(strings, dtype=f'S{width}')
+    return np.frombuffer(raw.tobytes(), dtype=np.uint8).reshape(-1, width).astype(np.int64) - ord('0')
+
+
+def _parse_dates(strings):
+    """
+    Seconds since epoch of 'YYYY/MM/DD' (or 'YYYY-MM-DD') strings.
+    """
+    strings = np.char.strip(np.asarray(strings, dtype=str))
+    if len(strings) == 0:
+        return np.empty(0, dtype=np.int64)
+    if np.any(np.char.str_len(strings) != 10):
+        raise ValueError("Dates must be formatted as YYYY/MM/DD")
+    d = _digits(strings, 10)
+    sep = d[:, [4, 7]] + ord('0')
+    if not np.all((sep == ord('/')) | (sep == ord('-'))):
+        raise ValueError("Dates must be formatted as YYYY/MM/DD")
+    year = d[:, 0] * 1000 + d[:, 1] * 100 + d[:, 2] * 10 + d[:, 3]
+    month = d[:, 5] * 10 + d[:, 6]
+    day = d[:, 8] * 10 + d[:, 9]
+    if np.any((month < 1) | (month > 12) | (day < 1) | (day > 31)):
+        raise ValueError("Invalid month or day in dates")
+    months = ((year - 1970) * 12 + month - 1).astype('datetime64[M]')
+    days = months.astype('datetime64[D]') + (day - 1)
+    return days.astype('datetime64[s]').astype(np.int64)
+
+
+def _parse_times(strings):
+    """
+    Seconds after midnight of 'HH:MM:SS' strings with optional fractional seconds.
+    """
+    strings = np.char.strip(np.asarray(strings, dtype=str))
+    if len(strings) == 0:
+        return np.empty(0, dtype=np.float64)
+    lengths = np.char.str_len(strings)
+    if np.any(lengths < 8):
+        raise ValueError("Times must be formatted as HH:MM:SS")
+    d = _digits(strings, 8)
+    if not np.all(d[:, [2, 5]] + ord('0') == ord(':')):
+        raise ValueError("Times must be formatted as HH:MM:SS")
+    seconds = ((d[:, 0] * 10 + d[:, 1]) * 3600 + (d[:, 3] * 10 + d[:, 4]) * 60 + d[:, 6] * 10 + d[:, 7]).astype(np.float64)
+    fractional = lengths > 8
+    if fractional.any():
+        seconds[fractional] += [float('0' + s[8:]) for s in strings[fractional]]
+    return seconds
+
+
+def parse_timestamps(dates, times):
+    """
+    Unix timestamps (float seconds) from separate Date and Time columns.
+
+    Uses fixed character offsets instead of strptime, and parses each
+    distinct date and time string only once (a chunk of ticks spans few
+    dates and at most 86400 distinct whole-second times).
+    """
+    date_codes, date_values = pd.factorize(np.asarray(dates))
+    time_codes, time_values = pd.factorize(np.asarray(times))
+    if (date_codes < 0).any() or (time_codes < 0).any():
+        raise ValueError("Date and Time must not be missing")
+    return _parse_dates(date_values)[date_codes] + _parse_times(time_values)[time_codes]
+
+
+def process_frame(df, session_open_hour=SESSION_OPEN_HOUR):
+    """
+    Converts a raw DataFrame to the output columns.
+    Returns (processed DataFrame, array of 'YYYY-MM-DD' trading dates per
+    row, see tick_store.trading_dates).
+    """
+    df.columns = df.columns.str.strip()
+    if 'Date' not in df.columns or 'Time' not in df.columns:
+        raise KeyError("Input CSV must contain 'Date' and 'Time' columns")
+    for src in RENAME_MAP:
+        if src not in df.columns:
+            raise KeyError(f"Expected column '{src}' not found in input CSV")
+    timestamps = parse_timestamps(df['Date'].to_numpy(), df['Time'].to_numpy())
+    processed = df[list(RENAME_MAP)].rename(columns=RENAME_MAP)
+    processed.insert(0, 'timestamp', timestamps)
+    processed = processed[OUTPUT_COLUMNS].reset_index(drop=True)
+    dates = trading_dates(timestamps, session_open_hour)
+    return processed, dates
+
+
+def split_byte_ranges(path, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """
+    Splits a CSV file into (start, end) byte ranges of about chunk_bytes,
+    each ending on a line boundary. Returns (header bytes, ranges).
+    """
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, 'rb') as f:
+        header = f.readline()
+        start = f.tell()
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            if f.tell() < size:
+                f.readline()
+            end = f.tell()
+            ranges.append((start, end))
+            start = end
+    return header, ranges
+
+
+def process_range(path, header, start, end, csv=False, session_open_hour=SESSION_OPEN_HOUR):
+    """
+    Reads and converts the rows in one byte range of the raw file.
+    Returns (processed DataFrame, dates, CSV text of the rows or None);
+    formatting the CSV here lets worker processes share that cost.
+    """
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+    df = pd.read_csv(io.BytesIO(header + data))
+    processed, dates = process_frame(df, session_open_hour)
+    text = processed.to_csv(header=False, index=False) if csv else None
+    return processed, dates, text
+
+
+def iter_processed_chunks(path, chunk_bytes=DEFAULT_CHUNK_BYTES, workers=1, csv=False,
+                          session_open_hour=SESSION_OPEN_HOUR):
+    """
+    Yields process_range() results per chunk, in file order.
+
+    With workers > 1 chunks are converted in a process pool; at most
+    2 * workers chunks are in flight so memory stays bounded regardless of
+    file size.
+    """
+    header, ranges = split_byte_ranges(path, chunk_bytes)
+    if workers <= 1:
+        for start, end in ranges:
+            yield process_range(path, header, start, end, csv, session_open_hour)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for start, end in ranges:
+            pending.append(pool.submit(process_range, path, header, start, end, csv, session_open_hour))
+            if len(pending) >= 2 * workers:
+                yield pending.pop(0).result()
+        for future in pending:
+            yield future.result()
+
+
+def preprocess_file(input_path, output_path=None, store_dir=None, chunk_bytes=DEFAULT_CHUNK_BYTES, workers=1,
+                    session_open_hour=SESSION_OPEN_HOUR):
+    """
+    Streams a raw export to a processed CSV and/or a tick store whose
+    partitions are trading dates rolled at session_open_hour.
+    Returns a dict with rows, elapsed_sec and rows_per_sec.
+    """
+    writer = TickStoreWriter(store_dir, session_open_hour) if store_dir else None
+    out = open(output_path, 'w', newline='') if output_path else None
+    rows = 0
+    start_time = time.perf_counter()
+    try:
+        if out is not None:
+            out.write(','.join(OUTPUT_COLUMNS) + '\n')
+        for processed, dates, text in iter_processed_chunks(input_path, chunk_bytes, workers, csv=out is not None,
+                                                           session_open_hour=session_open_hour):
+            if out is not None:
+                out.write(text)
+            if writer is not None:
+                writer.append({col: processed[col].to_numpy() for col in OUTPUT_COLUMNS}, dates)
+            rows += len(processed)
+    finally:
+        if out is not None:
+            out.close()
+    stats = {'rows': rows}
+    if writer is not None:
+        stats['partitions'] = len(writer.close()['partitions'])
+    elapsed = time.perf_counter() - start_time
+    stats['elapsed_sec'] = elapsed
+    stats['rows_per_sec'] = rows / elapsed if elapsed > 0 else float('inf')
+    return stats
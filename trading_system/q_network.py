@@ -0,0 +1,112 @@
+"""
+Lightweight greedy inference for trained Stable-Baselines3 DQN models.
+"""
+import io
+import json
+import zipfile
+
+import numpy as np
+
+# In-place activations for the hidden layers, by torch class name
+ACTIVATIONS = {
+    'ReLU': lambda x: np.maximum(x, 0.0, out=x),
+    'Tanh': lambda x: np.tanh(x, out=x),
+}
+# SB3's default MlpPolicy activation
+DEFAULT_ACTIVATION = 'ReLU'
+BACKENDS = ('numpy', 'sb3')
+
+
+def read_dqn_zip(path):
+    """
+    Reads the online Q-network of an SB3 DQN .zip without SB3.
+
+    Returns (layers, activation, observation_shape) where layers is a list
+    of (weight (out, in), bias (out,)) float32 arrays in forward order.
+    """
+    import torch
+    with zipfile.ZipFile(path) as archive:
+        data = json.loads(archive.read('data'))
+        state_dict = torch.load(
+            io.BytesIO(archive.read('policy.pth')), map_location=torch.device('cpu'), weights_only=True
+        )
+    policy_kwargs = data.get('policy_kwargs') or {}
+    extractor = policy_kwargs.get('features_extractor_class', 'FlattenExtractor')
+    if 'FlattenExtractor' not in extractor:
+        raise ValueError(f"Unsupported DQN features extractor: {extractor}")
+    # Serialized as "<class 'torch.nn.modules.activation.ReLU'>"
+    activation = policy_kwargs.get('activation_fn', DEFAULT_ACTIVATION).split('.')[-1].rstrip("'>")
+    if activation not in ACTIVATIONS:
+        raise ValueError(f"Unsupported DQN activation: {activation}")
+    prefix = 'q_net.q_net.'
+    indices = sorted({int(key[len(prefix):].split('.')[0]) for key in state_dict if key.startswith(prefix)})
+    layers = [
+        (state_dict[f'{prefix}{i}.weight'].numpy().astype(np.float32),
+         state_dict[f'{prefix}{i}.bias'].numpy().astype(np.float32))
+        for i in indices
+    ]
+    observation_shape = tuple(data.get('observation_space', {}).get('_shape') or (layers[0][0].shape[1],))
+    return layers, activation, observation_shape
+
+
+class QNetworkPolicy:
+    """
+    Greedy action selection with the weights of a trained DQN Q-network.
+
+    predict() takes the same single observation as DQN.predict(obs,
+    deterministic=True) and returns the same (action, None), but computes
+    the small MLP forward pass with NumPy into preallocated buffers,
+    skipping SB3's observation checks, tensor conversions and torch
+    dispatch. Use load() to read an SB3 .zip directly.
+    """
+    def __init__(self, layers, activation=DEFAULT_ACTIVATION, observation_shape=None):
+        # Weights stored transposed (in, out) so each layer is one x @ W
+        self.weights = [np.ascontiguousarray(weight.T, dtype=np.float32) for weight, _ in layers]
+        self.biases = [np.asarray(bias, dtype=np.float32) for _, bias in layers]
+        self.activation = ACTIVATIONS[activation]
+        input_size = self.weights[0].shape[0]
+        self.observation_shape = tuple(observation_shape) if observation_shape else (input_size,)
+        # Preallocated input and per-layer output buffers
+        self.input = np.empty(input_size, dtype=np.float32)
+        self.outputs = [np.empty(weight.shape[1], dtype=np.float32) for weight in self.weights]
+
+    @classmethod
+    def load(cls, path):
+        layers, activation, observation_shape = read_dqn_zip(path)
+        return cls(layers, activation, observation_shape)
+
+    def q_values(self, observation):
+        """
+        Q-value of each action for one observation (a view of an internal
+        buffer, overwritten by the next call).
+        """
+        x = self.input
+        # Casts like SB3's obs.float()
+        np.copyto(x, np.reshape(observation, -1), casting='unsafe')
+        last = len(self.weights) - 1
+        for i, (weight, bias, out) in enumerate(zip(self.weights, self.biases, self.outputs)):
+            np.dot(x, weight, out=out)
+            out += bias
+            if i < last:
+                self.activation(out)
+            x = out
+        return x
+
+    def predict(self, observation, deterministic=True):
+        """
+        Returns (greedy action, None), matching DQN.predict's signature.
+        """
+        return int(self.q_values(observation).argmax()), None
+
+
+def load_dqn_policy(path, backend='numpy'):
+    """
+    Loads a trained DQN for greedy inference: a QNetworkPolicy ('numpy')
+    or the full SB3 model ('sb3').
+    """
+    if backend == 'numpy':
+        return QNetworkPolicy.load(path)
+    if backend == 'sb3':
+        from stable_baselines3 import DQN
+        return DQN.load(path)
+    raise ValueError(f"Unknown RL inference backend: {backend}")
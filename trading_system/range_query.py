@@ -0,0 +1,71 @@
+"""
+Vectorized range queries over NumPy arrays using sparse tables.
+"""
+import numpy as np
+
+
+def levels_for_span(span):
+    """
+    Number of sparse-table levels needed to cover ranges of up to `span` elements.
+    """
+    return max(int(span).bit_length(), 1)
+
+
+def sparse_table(values, levels, op):
+    """
+    Builds a sparse table for an idempotent reduction `op` (np.maximum or
+    np.minimum). Level j holds op over values[i:i + 2**j] at index i.
+    """
+    table = [np.asarray(values)]
+    for j in range(1, levels):
+        prev = table[-1]
+        step = 1 << (j - 1)
+        if len(prev) <= step:
+            break
+        table.append(op(prev[:-step], prev[step:]))
+    return table
+
+
+def range_reduce(table, start, stop, op):
+    """
+    Reduces values[start:stop] for arrays of non-empty ranges in O(1) each.
+    """
+    start = np.asarray(start, dtype=np.int64)
+    length = np.asarray(stop, dtype=np.int64) - start
+    level = np.zeros_like(length)
+    # floor(log2(length)) without floating point
+    for j in range(1, len(table)):
+        level += length >= (1 << j)
+    result = np.empty(len(start), dtype=table[0].dtype)
+    for j in np.unique(level):
+        mask = level == j
+        left = start[mask]
+        right = start[mask] + length[mask] - (1 << j)
+        result[mask] = op(table[j][left], table[j][right])
+    return result
+
+
+def first_passage(table, start, stop, threshold, above=True):
+    """
+    For each query, returns the first index k in [start, stop) whose value is
+    >= threshold (above=True, using a max table) or <= threshold (above=False,
+    using a min table). Queries without a match return `stop`.
+
+    Ranges must not be longer than 2**len(table) - 1 elements.
+    """
+    pos = np.array(start, dtype=np.int64)
+    stop = np.asarray(stop, dtype=np.int64)
+    threshold = np.asarray(threshold)
+    # Greedily skip the largest blocks that contain no passing value
+    for j in range(len(table) - 1, -1, -1):
+        level = table[j]
+        block = 1 << j
+        fits = pos + block <= stop
+        idx = np.minimum(pos, len(level) - 1)
+        block_val = level[idx]
+        clean = block_val < threshold if above else block_val > threshold
+        pos += np.where(fits & clean, block, 0)
+    values = table[0]
+    idx = np.minimum(pos, len(values) - 1)
+    hit = values[idx] >= threshold if above else values[idx] <= threshold
+    return np.where((pos < stop) & hit, pos, stop)
@@ -1,35 +1,98 @@
 """
 Gym-compatible trading environment for discrete-action RL.
 
-Observation (state) consists of a sliding window of market features:
- - Normalized mid-price returns
- - Normalized spread
- - Log bid-ask ratio
- Plus current position, cash balance, and unrealized PnL normalized.
+Observation (state) is the one the live DecisionModel/PositionModel build
+(see observation.py): a sliding window of the model input features
+(FeatureEngineer, feature_names(config)), each z-scored over the window,
+plus current position, cash balance, and unrealized PnL normalized.
 
 Actions: Discrete {0: SELL (-1), 1: HOLD (0), 2: BUY (+1)}.
 
 Reward: Δ Portfolio Value - fee * |ΔPosition| - risk_lambda * position^2.
+
+Orders fill at the mid price of the current tick; the resulting position
+is marked to the mid price of the next tick. Features are computed once
+for the whole dataset (see compute_env_arrays) so stepping only indexes
+precomputed arrays.
 """
-"""Gym-compatible trading environment stub for discrete-action RL."""
 import numpy as np
-import gym
-from gym import spaces
+
+try:
+    import gymnasium as gym
+    from gymnasium import spaces
+except ImportError:  # pragma: no cover - legacy gym installs
+    import gym
+    from gym import spaces
+
+from trading_system.config import Config
+from trading_system.feature_engineering import FeatureEngineer
+from trading_system.observation import build_observation, observation_size
+
+# Action index -> position change
+ACTION_DELTAS = np.array([-1, 0, 1], dtype=np.int64)
+
+
+def compute_env_arrays(data, config=None):
+    """
+    Precomputes the per-tick arrays the environments step over.
+
+    `data` is anything FeatureEngineer.compute_features_batch accepts.
+    Returns a dict with 'features' (float32, shape (n, n_features): the
+    live model inputs, in feature_names(config) order) and 'price'
+    (float64 mid prices). `config` defaults to Config().
+    """
+    engineer = FeatureEngineer(config if config is not None else Config())
+    batch = engineer.compute_features_batch(data)
+    features = np.column_stack([batch[name] for name in engineer.feature_names]).astype(np.float32)
+    return {'features': features, 'price': batch['mid_price']}
+
+
+def apply_trades(position, entry_price, cash, delta, price, max_position):
+    """
+    Applies position changes at `price`; works on scalars or arrays.
+    Returns (new_position, traded, new_entry_price, new_cash). The entry
+    price is the average price of the open position.
+    """
+    new_position = np.clip(position + delta, -max_position, max_position)
+    traded = new_position - position
+    opened = (new_position != 0) & (np.sign(new_position) != np.sign(position))
+    added = (new_position * position > 0) & (np.abs(new_position) > np.abs(position))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        averaged = (entry_price * np.abs(position) + price * np.abs(traded)) / np.abs(new_position)
+    entry_price = np.where(opened, price, np.where(added, averaged, entry_price))
+    return new_position, traded, entry_price, cash - traded * price
+
 
 class TradingEnv(gym.Env):
-    def __init__(self, df, window_size=50, fee=0.0001, risk_lambda=0.0):
+    """
+    Single trading environment over one historical dataset.
+
+    Episodes start at the first tick with a full window of history and run
+    to the end of the data. reset() returns the observation and step()
+    returns (obs, reward, done, info).
+
+    `data` is a DataFrame of ticks (features computed with `config`, by
+    default Config()) or the dict from compute_env_arrays. Train with
+    max_position=config.max_positions, the scale the live models use.
+    """
+    def __init__(self, data, window_size=50, fee=0.0001, risk_lambda=0.0, max_position=1, config=None):
         # Basic initialization
+        if not (isinstance(data, dict) and 'features' in data):
+            data = compute_env_arrays(data, config)
+        self.features = data['features']
+        self.prices = data['price']
         self.window_size = window_size
-        self.length = len(df)
+        self.length = len(self.prices)
         self.fee = fee
         self.risk_lambda = risk_lambda
-        self.current_step = window_size
+        self.max_position = max_position
+        self.current_step = window_size - 1
         self.position = 0
+        self.entry_price = 0.0
         self.cash = 0.0
-        self.prev_price = 0.0
         self.done = False
         # Define action and observation spaces
-        obs_dim = self.window_size * 3 + 3
+        obs_dim = observation_size(window_size, self.features.shape[1])
         self.observation_space = spaces.Box(
             low=-np.inf, high=np.inf,
             shape=(obs_dim,), dtype=np.float32
@@ -38,44 +101,49 @@ class TradingEnv(gym.Env):
 
     def reset(self):
         # Reset to initial state
-        self.current_step = self.window_size
+        if self.length < self.window_size + 1:
+            raise ValueError("Need at least window_size + 1 ticks to step the environment")
+        self.current_step = self.window_size - 1
         self.position = 0
+        self.entry_price = 0.0
         self.cash = 0.0
-        self.prev_price = 0.0
         self.done = False
-        # Return zeroed observation
-        import numpy as np
-        obs_shape = self.window_size * 3 + 3
-        return np.zeros(obs_shape, dtype=np.float32)
+        return self._observation()
 
     def step(self, action):
         # Ensure valid sequence
         if self.done:
             raise RuntimeError("Episode is done. Call reset() to start a new episode.")
-        # Map action to position change
-        if action == 0:
-            delta_pos = -1
-        elif action == 2:
-            delta_pos = 1
-        else:
-            delta_pos = 0
-        # Update position
-        self.position += delta_pos
-        # Stub reward always zero
-        reward = 0.0
+        t = self.current_step
+        price = self.prices[t]
+        next_price = self.prices[t + 1]
+        # Map action to position change and trade at the current price
+        position, traded, entry_price, cash = apply_trades(
+            self.position, self.entry_price, self.cash, ACTION_DELTAS[int(action)], price, self.max_position
+        )
+        self.position = int(position)
+        self.entry_price = float(entry_price)
+        self.cash = float(cash)
+        # Mark the new position to the next price
+        reward = (
+            self.position * (next_price - price)
+            - self.fee * abs(int(traded))
+            - self.risk_lambda * self.position ** 2
+        )
         # Advance time step
         self.current_step += 1
-        if self.current_step >= self.length:
+        if self.current_step >= self.length - 1:
             self.done = True
-        # Return zeroed observation
-        import numpy as np
-        obs_shape = self.window_size * 3 + 3
-        obs = np.zeros(obs_shape, dtype=np.float32)
-        return obs, reward, self.done, {}
+        return self._observation(), float(reward), self.done, {}
+
+    def _observation(self):
+        t = self.current_step
+        window = self.features[t - self.window_size + 1:t + 1]
+        return build_observation(window, self.position, self.entry_price, self.cash, self.max_position)
 
     def render(self, mode='human'):
         # Simple render stub
         print(f"Step: {self.current_step}, Position: {self.position}, Cash: {self.cash:.2f}")
 
     def close(self):
-        pass
\ No newline at end of file
+        pass
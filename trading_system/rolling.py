@@ -0,0 +1,315 @@
+"""
+Incremental rolling operators over time-based windows.
+
+Streaming operators are updated once per tick with the tick timestamp and
+return the statistic over the trailing window (timestamp - window,
+timestamp] in O(1) amortized time: sums are kept as running totals and
+min/max use monotonic deques. Each operator has a batch function that
+computes the same statistic for every row of time-sorted arrays at once,
+so features for training match the features seen live.
+"""
+import math
+from collections import deque
+
+import numpy as np
+
+from trading_system.range_query import levels_for_span, range_reduce, sparse_table
+
+# Evictions between exact recomputations of a running sum (bounds float drift)
+REFRESH_EVICTIONS = 4096
+
+
+class RollingSum:
+    """
+    Sum of the values inside the trailing time window.
+    """
+    def __init__(self, window):
+        if window <= 0:
+            raise ValueError("window must be positive")
+        self.window = window
+        self.items = deque()
+        self.total = 0.0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def update(self, timestamp, value):
+        self.items.append((timestamp, value))
+        self.total += value
+        items = self.items
+        cutoff = timestamp - self.window
+        while items[0][0] <= cutoff:
+            self.total -= items.popleft()[1]
+            self.evictions += 1
+        if self.evictions >= REFRESH_EVICTIONS:
+            self.total = math.fsum(value for _, value in items)
+            self.evictions = 0
+        return self.total
+
+
+class RollingStd:
+    """
+    Population standard deviation of the values inside the trailing time
+    window, from running sums of the values and their squares. Values are
+    shifted by the first one seen to keep the sums small.
+    """
+    def __init__(self, window):
+        if window <= 0:
+            raise ValueError("window must be positive")
+        self.window = window
+        self.items = deque()
+        self.shift = None
+        self.sum = 0.0
+        self.sum_sq = 0.0
+        self.evictions = 0
+
+    def update(self, timestamp, value):
+        if self.shift is None:
+            self.shift = value
+        x = value - self.shift
+        self.items.append((timestamp, x))
+        self.sum += x
+        self.sum_sq += x * x
+        items = self.items
+        cutoff = timestamp - self.window
+        while items[0][0] <= cutoff:
+            x = items.popleft()[1]
+            self.sum -= x
+            self.sum_sq -= x * x
+            self.evictions += 1
+        if self.evictions >= REFRESH_EVICTIONS:
+            self.sum = math.fsum(x for _, x in items)
+            self.sum_sq = math.fsum(x * x for _, x in items)
+            self.evictions = 0
+        n = len(items)
+        mean = self.sum / n
+        return math.sqrt(max(self.sum_sq / n - mean * mean, 0.0))
+
+
+class RollingVWAP:
+    """
+    Volume-weighted average price inside the trailing time window (NaN
+    while the window holds no volume).
+    """
+    def __init__(self, window):
+        if window <= 0:
+            raise ValueError("window must be positive")
+        self.window = window
+        self.items = deque()
+        self.shift = None
+        self.value = 0.0
+        self.volume = 0.0
+        self.evictions = 0
+
+    def update(self, timestamp, price, volume):
+        if self.shift is None:
+            self.shift = price
+        value = (price - self.shift) * volume
+        self.items.append((timestamp, value, volume))
+        self.value += value
+        self.volume += volume
+        items = self.items
+        cutoff = timestamp - self.window
+        while items[0][0] <= cutoff:
+            _, value, volume = items.popleft()
+            self.value -= value
+            self.volume -= volume
+            self.evictions += 1
+        if self.evictions >= REFRESH_EVICTIONS:
+            self.value = math.fsum(item[1] for item in items)
+            self.volume = math.fsum(item[2] for item in items)
+            self.evictions = 0
+        if self.volume <= 0:
+            return math.nan
+        return self.shift + self.value / self.volume
+
+
+class RollingMax:
+    """
+    Maximum inside the trailing time window. The deque holds the entries
+    that can still become the maximum, in decreasing value order, so each
+    value is pushed and popped at most once.
+    """
+    def __init__(self, window):
+        if window <= 0:
+            raise ValueError("window must be positive")
+        self.window = window
+        self.items = deque()
+
+    def _dominates(self, new, old):
+        return new >= old
+
+    def update(self, timestamp, value):
+        items = self.items
+        while items and self._dominates(value, items[-1][1]):
+            items.pop()
+        items.append((timestamp, value))
+        cutoff = timestamp - self.window
+        while items[0][0] <= cutoff:
+            items.popleft()
+        return items[0][1]
+
+
+class RollingMin(RollingMax):
+    """
+    Minimum inside the trailing time window.
+    """
+    def _dominates(self, new, old):
+        return new <= old
+
+
+class EMA:
+    """
+    Exponential moving average for irregularly spaced ticks: the previous
+    average decays by exp(-dt / time_constant) with dt the time since the
+    previous tick. The first value initializes the average.
+    """
+    def __init__(self, time_constant):
+        if time_constant <= 0:
+            raise ValueError("time_constant must be positive")
+        self.time_constant = time_constant
+        self.value = None
+        self.timestamp = None
+
+    def update(self, timestamp, value):
+        if self.value is None:
+            self.value = value
+        else:
+            decay = math.exp(-(timestamp - self.timestamp) / self.time_constant)
+            self.value = decay * self.value + (1.0 - decay) * value
+        self.timestamp = timestamp
+        return self.value
+
+
+class OrderFlowImbalance:
+    """
+    Order flow imbalance of one top-of-book update (Cont, Kukanov and
+    Stoikov): bid size added at or above the previous best bid minus size
+    removed below it, minus the same for the ask side. The first update
+    returns 0.
+    """
+    def __init__(self):
+        self.previous = None
+
+    def update(self, bid, ask, bid_size, ask_size):
+        previous = self.previous
+        self.previous = (bid, ask, bid_size, ask_size)
+        if previous is None:
+            return 0.0
+        prev_bid, prev_ask, prev_bid_size, prev_ask_size = previous
+        flow = 0.0
+        if bid >= prev_bid:
+            flow += bid_size
+        if bid <= prev_bid:
+            flow -= prev_bid_size
+        if ask <= prev_ask:
+            flow -= ask_size
+        if ask >= prev_ask:
+            flow += prev_ask_size
+        return flow
+
+
+def window_starts(times, window):
+    """
+    Index of the first row inside each row's window (times - window, times].
+    """
+    times = np.asarray(times, dtype=np.float64)
+    return np.searchsorted(times, times - window, side='right')
+
+
+def rolling_sum(times, values, window):
+    """
+    Batch form of RollingSum.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    cumulative = np.concatenate(([0.0], np.cumsum(values)))
+    return cumulative[1:] - cumulative[window_starts(times, window)]
+
+
+def rolling_std(times, values, window):
+    """
+    Batch form of RollingStd.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if not len(values):
+        return values
+    x = values - values[0]
+    start = window_starts(times, window)
+    count = np.arange(1, len(x) + 1) - start
+    s1 = np.concatenate(([0.0], np.cumsum(x)))
+    s2 = np.concatenate(([0.0], np.cumsum(x * x)))
+    mean = (s1[1:] - s1[start]) / count
+    return np.sqrt(np.maximum((s2[1:] - s2[start]) / count - mean * mean, 0.0))
+
+
+def rolling_vwap(times, prices, volumes, window):
+    """
+    Batch form of RollingVWAP.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    volumes = np.asarray(volumes, dtype=np.float64)
+    if not len(prices):
+        return prices
+    shift = prices[0]
+    value = rolling_sum(times, (prices - shift) * volumes, window)
+    volume = rolling_sum(times, volumes, window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(volume > 0, shift + value / volume, np.nan)
+
+
+def _rolling_extreme(times, values, window, op):
+    values = np.asarray(values, dtype=np.float64)
+    if not len(values):
+        return values
+    start = window_starts(times, window)
+    stop = np.arange(1, len(values) + 1)
+    table = sparse_table(values, levels_for_span(int((stop - start).max())), op)
+    return range_reduce(table, start, stop, op)
+
+
+def rolling_max(times, values, window):
+    """
+    Batch form of RollingMax (sparse-table range maximum per row).
+    """
+    return _rolling_extreme(times, values, window, np.maximum)
+
+
+def rolling_min(times, values, window):
+    """
+    Batch form of RollingMin.
+    """
+    return _rolling_extreme(times, values, window, np.minimum)
+
+
+def ema(times, values, time_constant):
+    """
+    Batch form of EMA.
+    """
+    result = np.empty(len(values), dtype=np.float64)
+    operator = EMA(time_constant)
+    update = operator.update
+    for i, (timestamp, value) in enumerate(zip(np.asarray(times, dtype=np.float64).tolist(),
+                                               np.asarray(values, dtype=np.float64).tolist())):
+        result[i] = update(timestamp, value)
+    return result
+
+
+def order_flow_imbalance(bid, ask, bid_size, ask_size):
+    """
+    Batch form of OrderFlowImbalance.
+    """
+    bid = np.asarray(bid, dtype=np.float64)
+    ask = np.asarray(ask, dtype=np.float64)
+    bid_size = np.asarray(bid_size, dtype=np.float64)
+    ask_size = np.asarray(ask_size, dtype=np.float64)
+    flow = np.zeros(len(bid))
+    prev_bid, prev_ask = bid[:-1], ask[:-1]
+    cur_bid, cur_ask = bid[1:], ask[1:]
+    flow[1:] = (
+        np.where(cur_bid >= prev_bid, bid_size[1:], 0.0)
+        - np.where(cur_bid <= prev_bid, bid_size[:-1], 0.0)
+        - np.where(cur_ask <= prev_ask, ask_size[1:], 0.0)
+        + np.where(cur_ask >= prev_ask, ask_size[:-1], 0.0)
+    )
+    return flow
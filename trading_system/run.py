@@ -4,44 +4,105 @@ Main run loop for the trading system.
 import asyncio
 
 from trading_system.config import Config
-from trading_system.data_ingestion import DataIngestion
-from trading_system.feature_engineering import FeatureEngineer
-from trading_system.alpha_model import AlphaModel
-from trading_system.decision_model import DecisionModel
+from trading_system.data_ingestion import DataIngestion, ZmqDataIngestion
 from trading_system.execution_module import ExecutionModule
-from trading_system.position_model import PositionModel
+from trading_system.multi_instrument import MultiInstrumentPipeline
+from trading_system.order_gateway import connect_broker, create_order_gateway
+from trading_system.pipeline import TradingPipeline
+from trading_system.tick_queue import TickQueue
 
 
-async def run():
+def format_startup_report(timings, import_sec=None, warmup_ticks=0):
+    """
+    One-line summary of where startup time went. import_sec is the
+    wall-clock time of importing this module (None when not measured).
+    """
+    imports = 'not measured' if import_sec is None else f"{import_sec:.3f}s"
+    return (
+        f"Startup: imports {imports}, "
+        f"alpha import {timings.get('alpha_import', 0.0):.3f}s, "
+        f"alpha load {timings.get('alpha_load', 0.0):.3f}s, "
+        f"decision load {timings.get('decision_load', 0.0):.3f}s, "
+        f"position load {timings.get('position_load', 0.0):.3f}s, "
+        f"first inference {timings.get('first_inference', 0.0) * 1e3:.1f}ms "
+        f"({warmup_ticks} ticks buffered while loading)"
+    )
+
+
+async def load_models(pipeline, import_sec=None):
+    # Loads the models in the background and reports startup timings
+    await pipeline.load_models_async()
+    print(format_startup_report(pipeline.startup_timings, import_sec, pipeline.warmup_ticks))
+
+
+def format_queue_report(stats):
+    """
+    One-line summary of TickQueue.stats().
+    """
+    return (
+        f"Tick queue: depth {stats['depth']} (max {stats['max_depth']}), "
+        f"enqueued {stats['enqueued']}, processed {stats['processed']}, "
+        f"dropped {stats['dropped']}, conflated {stats['conflated']}, "
+        f"age p50 {stats['age_p50_ms']:.2f}ms p99 {stats['age_p99_ms']:.2f}ms max {stats['age_max_ms']:.2f}ms"
+    )
+
+
+async def report_queue(queue, interval):
+    # Prints the queue stats every interval seconds, so drops and conflation during bursts are visible
+    while True:
+        await asyncio.sleep(interval)
+        print(format_queue_report(queue.stats()))
+
+
+async def run(import_sec=None):
     # Load configuration
     config = Config()
 
     # Initialize modules
-    ingestion = DataIngestion(config)
-    features = FeatureEngineer(config)
-    alpha_model = AlphaModel(config)
-    decision_model = DecisionModel(config)
-    execution_module = ExecutionModule(config)
-    # Position management RL model (after first entry)
-    pos_model = PositionModel(config)
-
-    async def on_tick(tick):
-        # Update features and compute
-        features.update(tick)
-        feat_vec = features.compute_features()
-        # Choose decision logic: initial entry vs. position management
-        if execution_module.position != 0 and config.use_position_rl:
-            # After first entry, use RL-based position management
-            decision = pos_model.decide(feat_vec)
-        else:
-            # Initial trade decision using alpha model and threshold/RL
-            prediction = alpha_model.predict(feat_vec)
-            decision = decision_model.decide(prediction, feat_vec)
-        # Execute orders based on decision
-        await execution_module.execute(decision, tick)
+    symbols = config.instruments
+    if config.data_source == 'zmq':
+        ingestions = [ZmqDataIngestion(config, symbols)]
+    elif symbols:
+        ingestions = [DataIngestion(config, symbol) for symbol in symbols]
+    else:
+        ingestions = [DataIngestion(config)]
+    # Bounded queue so slow processing cannot make the feed fall behind
+    queue = TickQueue(config.tick_queue_size, config.tick_queue_policy)
+    # Optional order gateway per traded symbol (None = the single instrument)
+    gateways = {}
+    if config.order_gateway:
+        broker = await connect_broker(config)
+        for symbol in symbols or [None]:
+            gateways[symbol] = await create_order_gateway(broker, config, symbol)
+    # Models load in the background while ingestion warms up the features
+    if symbols:
+        pipeline = MultiInstrumentPipeline(config, symbols, load_models=False, gateways=gateways)
+    else:
+        execution_module = ExecutionModule(config, gateway=gateways.get(None))
+        pipeline = TradingPipeline(config, execution_module, load_models=False)
+        # Unless every tick must be processed, a decision is stale once newer ticks are waiting
+        if config.tick_queue_policy != 'block':
+            pipeline.is_stale = lambda: len(queue) > 0
+    # Queue counters also go into the latency snapshot file, when there is one
+    if getattr(pipeline, 'latency', None) is not None:
+        pipeline.latency.gauges['tick_queue'] = queue.stats
+    tasks = [
+        load_models(pipeline, import_sec),
+        *[ingestion.start(queue.put) for ingestion in ingestions],
+        queue.consume(pipeline.on_tick),
+    ]
+    if config.tick_queue_report_interval:
+        tasks.append(report_queue(queue, config.tick_queue_report_interval))
 
     print("Starting trading system...")
-    await ingestion.start(on_tick)
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        # Joins the inference thread and writes out the journal
+        pipeline.close()
+        print(format_queue_report(queue.stats()))
 
 if __name__ == '__main__':
-    asyncio.run(run())
\ No newline at end of file
+    # The imports above ran before any clock could start; the top-level
+    # run.py times them
+    asyncio.run(run())
@@ -0,0 +1,91 @@
+"""
+NumPy arrays placed in shared memory so worker processes can read them without copies.
+"""
+import threading
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+# Serializes the resource_tracker.register patch in _attach_block with
+# every other block this module opens or creates
+_register_lock = threading.Lock()
+
+
+def _attach_block(name):
+    """
+    Opens an existing block without making this process responsible for it.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 always registers the block with the resource tracker,
+        # which would unlink it when this process exits. Unregistering
+        # afterwards is not an option: forked workers share the creator's
+        # tracker, so that would drop the creator's registration as well.
+        with _register_lock:
+            register = resource_tracker.register
+            resource_tracker.register = lambda *args, **kwargs: None
+            try:
+                return shared_memory.SharedMemory(name=name)
+            finally:
+                resource_tracker.register = register
+
+
+class SharedArrays:
+    """
+    A named set of NumPy arrays backed by multiprocessing shared memory.
+
+    The creating process calls SharedArrays.create(arrays) and hands the
+    picklable `spec` to workers, which call SharedArrays.attach(spec). Both
+    sides read the arrays through the `arrays` dict. The creator must call
+    unlink() once all workers are done.
+    """
+    def __init__(self, spec, blocks, arrays, owner):
+        self.spec = spec
+        self.blocks = blocks
+        self.arrays = arrays
+        self.owner = owner
+
+    @classmethod
+    def create(cls, arrays):
+        spec, blocks, views = {}, [], {}
+        for name, values in arrays.items():
+            values = np.ascontiguousarray(values)
+            with _register_lock:
+                block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+            view = np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)
+            view[...] = values
+            spec[name] = (block.name, values.shape, values.dtype.str)
+            blocks.append(block)
+            views[name] = view
+        return cls(spec, blocks, views, owner=True)
+
+    @classmethod
+    def attach(cls, spec):
+        blocks, views = [], {}
+        for name, (block_name, shape, dtype) in spec.items():
+            block = _attach_block(block_name)
+            view = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+            view.flags.writeable = False
+            blocks.append(block)
+            views[name] = view
+        return cls(spec, blocks, views, owner=False)
+
+    def close(self):
+        """
+        Releases this process's mapping of the shared blocks. Views taken
+        from `arrays` must not be used afterwards.
+        """
+        self.arrays = {}
+        for block in self.blocks:
+            block.close()
+
+    def unlink(self):
+        """
+        Closes and destroys the shared blocks (creator only).
+        """
+        self.close()
+        if self.owner:
+            for block in self.blocks:
+                block.unlink()
+        self.blocks = []
@@ -0,0 +1,142 @@
+"""
+Out-of-core training batches streamed from memory-mapped feature matrices.
+"""
+import mmap
+
+import numpy as np
+import torch
+from torch.utils.data import IterableDataset, get_worker_info
+
+from trading_system.windowing import sliding_windows
+
+
+def _reopen(array):
+    """
+    Pickle-friendly stand-in for a contiguous memmap (reopened by workers
+    instead of copied).
+    """
+    mm = getattr(array, '_mmap', None)
+    if not isinstance(array, np.memmap) or mm is None or not array.flags.c_contiguous:
+        return array
+    # Slices keep the parent's offset attribute: locate the data in the mapping instead
+    map_start = array.offset - array.offset % mmap.ALLOCATIONGRANULARITY
+    offset = map_start + array.ctypes.data - np.frombuffer(mm, dtype=np.uint8).ctypes.data
+    return ('memmap', array.filename, offset, array.dtype.str, array.shape)
+
+
+def _restore(state):
+    if isinstance(state, tuple) and state and state[0] == 'memmap':
+        _, filename, offset, dtype, shape = state
+        return np.memmap(filename, dtype=np.dtype(dtype), mode='r', offset=offset, shape=shape)
+    return state
+
+
+class ShardedWindowDataset(IterableDataset):
+    """
+    Yields shuffled (windows, labels) training batches without holding the
+    dataset in memory.
+
+    Window k covers features[k:k + sequence_length] and has label labels[k]
+    (see windowing.build_sequences). Windows are grouped into contiguous
+    shards of `shard_size` windows. Each epoch visits the shards in a
+    shuffled order and the windows of a shard in a shuffled order, so reads
+    from a memory-mapped feature matrix are sequential, one shard at a
+    time, and the page cache only needs to hold the shards in use. With
+    DataLoader workers, worker i streams every num_workers-th shard of the
+    epoch's order.
+
+    Batches are gathered into a small ring of preallocated tensors instead
+    of new ones: in DataLoader workers the ring lives in shared memory, so
+    batches are not copied into fresh shared memory on every step; in the
+    main process it is pinned when `pin_memory` is set and CUDA is
+    available. A yielded batch stays valid until `prefetch + 2` more
+    batches have been drawn, which covers the batches DataLoader keeps in
+    flight when created with prefetch_factor=prefetch. Use it with
+    DataLoader(dataset, batch_size=None) and call set_epoch() before each
+    epoch for a new order.
+    """
+    def __init__(self, features, labels, sequence_length, batch_size, shard_size=65536,
+                 seed=0, prefetch=2, pin_memory=False):
+        if len(features) < len(labels) + sequence_length - 1:
+            raise ValueError("features must cover every labelled window")
+        self.features = features
+        self.labels = labels
+        self.sequence_length = sequence_length
+        self.batch_size = batch_size
+        # Whole batches per shard
+        self.shard_size = max(batch_size, shard_size // batch_size * batch_size)
+        self.seed = seed
+        self.prefetch = prefetch
+        self.pin_memory = pin_memory
+        self.epoch = 0
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        state['features'] = _reopen(self.features)
+        state['labels'] = _reopen(self.labels)
+        return state
+
+    def __setstate__(self, state):
+        state['features'] = _restore(state['features'])
+        state['labels'] = _restore(state['labels'])
+        self.__dict__.update(state)
+
+    def __len__(self):
+        """
+        Number of windows per epoch.
+        """
+        return len(self.labels)
+
+    @property
+    def num_shards(self):
+        return -(-len(self.labels) // self.shard_size)
+
+    def set_epoch(self, epoch):
+        self.epoch = epoch
+
+    def shard_order(self):
+        """
+        Shard indices of the current epoch, in visiting order.
+        """
+        return np.random.default_rng((self.seed, self.epoch)).permutation(self.num_shards)
+
+    def _batch_ring(self, in_worker):
+        n_features = self.features.shape[1]
+        pin = self.pin_memory and not in_worker and torch.cuda.is_available()
+        ring = []
+        for _ in range(self.prefetch + 2):
+            x = torch.empty((self.batch_size, self.sequence_length, n_features), dtype=torch.float32, pin_memory=pin)
+            y = torch.empty(self.batch_size, dtype=torch.float32, pin_memory=pin)
+            if in_worker:
+                x.share_memory_()
+                y.share_memory_()
+            ring.append((x, y))
+        return ring
+
+    def __iter__(self):
+        worker = get_worker_info()
+        shards = self.shard_order()
+        if worker is not None:
+            shards = shards[worker.id::worker.num_workers]
+        ring = self._batch_ring(worker is not None)
+        rows = np.empty((self.shard_size + self.sequence_length - 1, self.features.shape[1]), dtype=np.float32)
+        slot = 0
+        for shard in shards.tolist():
+            start = shard * self.shard_size
+            stop = min(start + self.shard_size, len(self.labels))
+            count = stop - start
+            # One sequential read of the rows the shard's windows cover
+            shard_rows = rows[:count + self.sequence_length - 1]
+            shard_rows[:] = self.features[start:stop + self.sequence_length - 1]
+            shard_labels = np.asarray(self.labels[start:stop], dtype=np.float32)
+            windows = sliding_windows(shard_rows, self.sequence_length)
+            order = np.random.default_rng((self.seed, self.epoch, shard)).permutation(count)
+            for begin in range(0, count, self.batch_size):
+                index = order[begin:begin + self.batch_size]
+                x, y = ring[slot]
+                slot = (slot + 1) % len(ring)
+                n = len(index)
+                # (np.take with out= would copy the whole strided view first)
+                x.numpy()[:n] = windows[index]
+                y.numpy()[:n] = shard_labels[index]
+                yield x[:n], y[:n]
@@ -0,0 +1,139 @@
+"""
+Parallel parameter sweeps of decision/execution settings over precomputed alpha predictions.
+"""
+import itertools
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from trading_system.config import Config
+from trading_system.execution_sim import signals_from_predictions, simulate_execution, EXIT_OPEN
+from trading_system.metrics import trade_stats
+from trading_system.shared_arrays import SharedArrays
+
+# Config attributes a sweep may vary
+SWEEP_PARAMS = [
+    'alpha_threshold_up', 'alpha_threshold_down', 'profit_target',
+    'stop_loss', 'prediction_horizon', 'max_positions',
+]
+
+# Arrays of the worker process, attached once by the pool initializer
+_worker_shared = None
+
+
+def precompute_market(df, config, alpha_model=None, batch_size=4096):
+    """
+    Computes features and alpha predictions for every tick once.
+
+    Returns a dict with 'prices', 'timestamps' and 'predictions' arrays. The
+    first sequence_length - 1 ticks get the neutral 0.5 prediction, as in
+    AlphaModel's warm-up.
+    """
+    from trading_system.alpha_model import AlphaModel
+    from trading_system.feature_engineering import FeatureEngineer
+    from trading_system.windowing import sliding_windows
+
+    alpha_model = alpha_model or AlphaModel(config)
+    engineer = FeatureEngineer(config)
+    features = engineer.compute_features_batch(df)
+    matrix = np.column_stack([features[name] for name in engineer.feature_names]).astype(np.float32)
+    predictions = np.full(len(matrix), 0.5, dtype=np.float32)
+    windows = sliding_windows(matrix, config.sequence_length)
+    predictions[config.sequence_length - 1:] = alpha_model.predict_windows(windows, batch_size)
+    return {
+        'prices': np.asarray(df['last_price'], dtype=np.float64),
+        'timestamps': np.asarray(df['timestamp'], dtype=np.float64),
+        'predictions': predictions,
+    }
+
+
+def parameter_grid(space):
+    """
+    Expands {name: [values]} into the list of all combinations.
+    """
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+
+def random_search(space, n_samples, seed=None):
+    """
+    Draws n_samples parameter sets. Each entry of `space` is either a list
+    of choices or a (low, high) tuple sampled uniformly (as integers when
+    both bounds are ints).
+    """
+    rng = random.Random(seed)
+    samples = []
+    for _ in range(n_samples):
+        params = {}
+        for name, values in space.items():
+            if isinstance(values, tuple):
+                low, high = values
+                if isinstance(low, int) and isinstance(high, int):
+                    params[name] = rng.randint(low, high)
+                else:
+                    params[name] = rng.uniform(low, high)
+            else:
+                params[name] = rng.choice(values)
+        samples.append(params)
+    return samples
+
+
+def evaluate_params(params, arrays):
+    """
+    Simulates one parameter set over precomputed arrays and returns a
+    result row with the parameters and trade statistics.
+    """
+    config = Config()
+    for name, value in params.items():
+        setattr(config, name, value)
+    signals = signals_from_predictions(
+        arrays['predictions'], config.alpha_threshold_up, config.alpha_threshold_down
+    )
+    result = simulate_execution(arrays['prices'], arrays['timestamps'], signals, config)
+    closed = result['reason'] != EXIT_OPEN
+    row = dict(params)
+    row.update(trade_stats(result['pnl'][closed], result['exit_time'][closed]))
+    return row
+
+
+def _init_worker(spec):
+    global _worker_shared
+    _worker_shared = SharedArrays.attach(spec)
+
+
+def _evaluate_in_worker(params):
+    return evaluate_params(params, _worker_shared.arrays)
+
+
+def run_sweep(arrays, param_sets, workers=None, chunksize=None):
+    """
+    Evaluates every parameter set and returns a pandas DataFrame ranked by
+    Sharpe ratio (then total PnL). With more than one worker, the arrays
+    are placed in shared memory once and the sets are spread over a
+    process pool.
+    """
+    import pandas as pd
+
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    if workers == 1:
+        rows = [evaluate_params(params, arrays) for params in param_sets]
+    else:
+        shared = SharedArrays.create(arrays)
+        try:
+            chunksize = chunksize or max(1, len(param_sets) // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(shared.spec,)) as pool:
+                rows = list(pool.map(_evaluate_in_worker, param_sets, chunksize=chunksize))
+        finally:
+            shared.unlink()
+    elapsed = time.perf_counter() - start
+    results = pd.DataFrame(rows)
+    if len(results):
+        results = results.sort_values(['sharpe', 'total_pnl'], ascending=False).reset_index(drop=True)
+    results.attrs['elapsed_sec'] = elapsed
+    results.attrs['evals_per_sec'] = len(rows) / elapsed if elapsed > 0 else 0.0
+    return results
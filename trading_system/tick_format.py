@@ -0,0 +1,57 @@
+"""
+Compact binary wire format for market data ticks.
+
+Each tick is a fixed 44-byte little-endian record:
+    timestamp (f64), best_bid (f64), best_ask (f64), bid_size (u32),
+    ask_size (u32), last_price (f64), last_size (u32)
+A message may carry several records back to back. With several
+instruments on one feed, each message starts with the symbol and a NUL
+byte, which doubles as the ZeroMQ subscription topic.
+"""
+import struct
+
+TICK_FIELDS = ('timestamp', 'best_bid', 'best_ask', 'bid_size', 'ask_size', 'last_price', 'last_size')
+TICK_STRUCT = struct.Struct('<dddIIdI')
+TICK_SIZE = TICK_STRUCT.size
+
+
+def encode_tick(tick):
+    """
+    Packs a tick dict into one binary record.
+    """
+    return TICK_STRUCT.pack(
+        tick['timestamp'], tick['best_bid'], tick['best_ask'], int(tick['bid_size']),
+        int(tick['ask_size']), tick['last_price'], int(tick.get('last_size', 0)),
+    )
+
+
+def encode_ticks(ticks):
+    """
+    Packs an iterable of tick dicts into one message.
+    """
+    return b''.join(encode_tick(tick) for tick in ticks)
+
+
+def decode_ticks(data):
+    """
+    Unpacks a buffer of back-to-back records into a list of tick dicts.
+    """
+    if len(data) % TICK_SIZE:
+        raise ValueError(f"Tick message length {len(data)} is not a multiple of {TICK_SIZE}")
+    fields = TICK_FIELDS
+    return [dict(zip(fields, values)) for values in TICK_STRUCT.iter_unpack(data)]
+
+
+def symbol_topic(symbol):
+    """
+    Message prefix (and subscription topic) for an instrument's ticks.
+    """
+    return symbol.encode() + b'\0'
+
+
+def split_symbol_topic(message):
+    """
+    Splits a symbol-prefixed message into (symbol, tick records).
+    """
+    symbol, _, payload = message.partition(b'\0')
+    return symbol.decode(), payload
@@ -0,0 +1,134 @@
+"""
+Bounded tick queue between market data ingestion and the trading pipeline.
+"""
+import asyncio
+import time
+from collections import deque
+
+from trading_system.latency import LatencyHistogram
+
+POLICIES = ('block', 'drop_oldest', 'conflate')
+
+
+class TickQueue:
+    """
+    Decouples the feed from tick processing with a bounded queue.
+
+    When the queue is full, put() applies the overflow policy:
+     - 'block': waits for the consumer to make room (the feed falls behind)
+     - 'drop_oldest': discards the oldest queued tick
+     - 'conflate': merges the new tick into the newest queued tick of the
+       same symbol, keeping the latest book state and summing traded volume
+       (last_size); if none of that symbol is queued, the oldest is dropped
+    With 'conflate' and maxsize=1 the consumer always sees the latest book.
+
+    consume() feeds queued ticks to a callback and records each tick's age
+    (time from enqueue to the end of the callback, i.e. when the decision
+    on it was made) in the `age` histogram (nanoseconds).
+    """
+    def __init__(self, maxsize=1000, policy='block'):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown tick queue policy: {policy}")
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.items = deque()
+        self.not_empty = asyncio.Event()
+        self.not_full = asyncio.Event()
+        self.not_full.set()
+        # Newest queued entry per symbol (None for untagged ticks), for 'conflate'
+        self.newest = {}
+        # Counters
+        self.enqueued = 0
+        self.processed = 0
+        self.dropped = 0
+        self.conflated = 0
+        self.max_depth = 0
+        self.age = LatencyHistogram()
+
+    def __len__(self):
+        return len(self.items)
+
+    async def put(self, tick):
+        """
+        Enqueues a tick (usable directly as an ingestion callback).
+        """
+        self.enqueued += 1
+        if len(self.items) >= self.maxsize:
+            if self.policy == 'block':
+                while len(self.items) >= self.maxsize:
+                    self.not_full.clear()
+                    await self.not_full.wait()
+            elif self.policy == 'drop_oldest':
+                self.items.popleft()
+                self.dropped += 1
+            else:
+                entry = self.newest.get(tick.get('symbol'))
+                if entry is not None:
+                    merged = dict(tick)
+                    merged['last_size'] = entry[1].get('last_size', 0) + tick.get('last_size', 0)
+                    # The merged tick is as fresh as its newest part
+                    entry[0] = time.perf_counter_ns()
+                    entry[1] = merged
+                    self.conflated += 1
+                    return
+                self._forget(self.items.popleft())
+                self.dropped += 1
+        entry = [time.perf_counter_ns(), tick]
+        self.items.append(entry)
+        if self.policy == 'conflate':
+            self.newest[tick.get('symbol')] = entry
+        if len(self.items) > self.max_depth:
+            self.max_depth = len(self.items)
+        self.not_empty.set()
+
+    async def get(self):
+        """
+        Removes and returns the oldest (enqueue time in ns, tick) entry.
+        """
+        while not self.items:
+            self.not_empty.clear()
+            await self.not_empty.wait()
+        entry = self.items.popleft()
+        if self.policy == 'conflate':
+            self._forget(entry)
+        self.not_full.set()
+        return entry
+
+    def _forget(self, entry):
+        # Stops conflating into an entry that left the queue
+        symbol = entry[1].get('symbol')
+        if self.newest.get(symbol) is entry:
+            del self.newest[symbol]
+
+    async def consume(self, callback):
+        """
+        Passes queued ticks to callback forever, yielding to the event loop
+        between ticks so the feed can keep enqueueing (and conflating).
+        """
+        clock = time.perf_counter_ns
+        record_age = self.age.record
+        while True:
+            enqueued_ns, tick = await self.get()
+            await callback(tick)
+            record_age(clock() - enqueued_ns)
+            self.processed += 1
+            await asyncio.sleep(0)
+
+    def stats(self):
+        """
+        Queue counters plus tick age percentiles in milliseconds.
+        """
+        age = self.age.summary()
+        return {
+            'depth': len(self.items),
+            'max_depth': self.max_depth,
+            'enqueued': self.enqueued,
+            'processed': self.processed,
+            'dropped': self.dropped,
+            'conflated': self.conflated,
+            'age_p50_ms': age['p50'] / 1e6,
+            'age_p99_ms': age['p99'] / 1e6,
+            'age_max_ms': age['max'] / 1e6,
+        }
@@ -0,0 +1,190 @@
+"""
+Columnar on-disk tick store: one .npy file per column, partitioned by trading date.
+
+Layout:
+    <root>/manifest.json
+    <root>/date=YYYY-MM-DD/<column>.npy
+
+A trading date covers one session, which opens at SESSION_OPEN_HOUR the
+evening before (ES Globex: 17:00 CT), so a date is never split in half.
+"""
+import json
+import os
+
+import numpy as np
+
+MANIFEST_NAME = 'manifest.json'
+STORE_VERSION = 1
+# Hour of day, in the time zone of the tick timestamps, at which the session
+# of the next trading date opens (ES Globex opens at 17:00 CT)
+SESSION_OPEN_HOUR = 17
+
+
+def trading_dates(timestamps, session_open_hour=SESSION_OPEN_HOUR):
+    """
+    'YYYY-MM-DD' trading date of each timestamp: ticks at or after
+    session_open_hour belong to the next date's session. With
+    session_open_hour None (or 0) this is the calendar date.
+    """
+    shift = (24 - session_open_hour) % 24 * 3600 if session_open_hour else 0
+    seconds = np.asarray(timestamps, dtype=np.float64) + shift
+    return seconds.astype('datetime64[s]').astype('datetime64[D]').astype(str)
+
+
+def is_tick_store(path):
+    """
+    True if path is a directory containing a tick store manifest.
+    """
+    return os.path.isfile(os.path.join(path, MANIFEST_NAME))
+
+
+class TickStoreWriter:
+    """
+    Writes tick columns into a date-partitioned store.
+
+    Rows can be appended in chunks; rows of each date are buffered until a
+    different date arrives (input is expected in time order) and then
+    written as one partition. A date seen again later is appended to its
+    existing partition. close() writes the manifest, which records the
+    session_open_hour the dates were derived with (see trading_dates).
+    """
+    def __init__(self, root, session_open_hour=SESSION_OPEN_HOUR):
+        self.root = root
+        self.session_open_hour = session_open_hour
+        os.makedirs(root, exist_ok=True)
+        self.columns = None
+        self.partitions = {}
+        self.pending_date = None
+        self.pending = []
+
+    def append(self, columns, dates):
+        """
+        Adds rows given a dict of equal-length column arrays and an array of
+        'YYYY-MM-DD' date strings, one per row.
+        """
+        columns = {name: np.asarray(values) for name, values in columns.items()}
+        if self.columns is None:
+            self.columns = {name: values.dtype.str for name, values in columns.items()}
+        elif set(columns) != set(self.columns):
+            raise ValueError("All chunks must have the same columns")
+        dates = np.asarray(dates)
+        if len(dates) == 0:
+            return
+        # Split the chunk into runs of equal dates
+        breaks = np.flatnonzero(dates[1:] != dates[:-1]) + 1
+        bounds = np.concatenate(([0], breaks, [len(dates)]))
+        for lo, hi in zip(bounds[:-1], bounds[1:]):
+            date = str(dates[lo])
+            if date != self.pending_date:
+                self._flush()
+                self.pending_date = date
+            self.pending.append({name: values[lo:hi] for name, values in columns.items()})
+
+    def _flush(self):
+        if self.pending_date is None or not self.pending:
+            return
+        date = self.pending_date
+        rel_dir = f'date={date}'
+        part_dir = os.path.join(self.root, rel_dir)
+        os.makedirs(part_dir, exist_ok=True)
+        rows = sum(len(next(iter(chunk.values()))) for chunk in self.pending)
+        for name, dtype in self.columns.items():
+            values = np.concatenate([chunk[name] for chunk in self.pending]).astype(dtype, copy=False)
+            path = os.path.join(part_dir, f'{name}.npy')
+            if date in self.partitions:
+                values = np.concatenate([np.load(path), values])
+            np.save(path, values)
+        previous = self.partitions.get(date, {'rows': 0})
+        self.partitions[date] = {'date': date, 'path': rel_dir, 'rows': previous['rows'] + rows}
+        self.pending = []
+        self.pending_date = None
+
+    def close(self):
+        """
+        Flushes buffered rows and writes the manifest.
+        """
+        self._flush()
+        manifest = {
+            'version': STORE_VERSION,
+            'session_open_hour': self.session_open_hour,
+            'columns': self.columns or {},
+            'partitions': [self.partitions[date] for date in sorted(self.partitions)],
+        }
+        with open(os.path.join(self.root, MANIFEST_NAME), 'w') as f:
+            json.dump(manifest, f, indent=2)
+        return manifest
+
+
+class TickStore:
+    """
+    Read access to a tick store; columns are memory-mapped on demand.
+    """
+    def __init__(self, root):
+        self.root = root
+        with open(os.path.join(root, MANIFEST_NAME)) as f:
+            self.manifest = json.load(f)
+        self.columns = list(self.manifest['columns'])
+        # Stores written before the field existed used calendar dates
+        self.session_open_hour = self.manifest.get('session_open_hour')
+
+    def dates(self, start=None, end=None):
+        """
+        Partition dates within [start, end] (inclusive 'YYYY-MM-DD' strings).
+        """
+        return [
+            part['date'] for part in self.manifest['partitions']
+            if (start is None or part['date'] >= start) and (end is None or part['date'] <= end)
+        ]
+
+    def _partition(self, date):
+        return next(part for part in self.manifest['partitions'] if part['date'] == date)
+
+    def iter_partitions(self, start=None, end=None, columns=None):
+        """
+        Yields (date, {column: memmap}) for each partition in the range.
+        """
+        columns = columns or self.columns
+        unknown = [name for name in columns if name not in self.manifest['columns']]
+        if unknown:
+            raise KeyError(f"Tick store at {self.root} has no columns {unknown}")
+        for date in self.dates(start, end):
+            part_dir = os.path.join(self.root, self._partition(date)['path'])
+            yield date, {
+                name: np.load(os.path.join(part_dir, f'{name}.npy'), mmap_mode='r') for name in columns
+            }
+
+    def load(self, start=None, end=None, columns=None):
+        """
+        Returns {column: array} for the date range. A single partition is
+        returned as memory maps; several partitions are concatenated.
+        """
+        parts = [arrays for _, arrays in self.iter_partitions(start, end, columns)]
+        columns = columns or self.columns
+        if not parts:
+            return {name: np.empty(0, dtype=np.dtype(self.manifest['columns'][name])) for name in columns}
+        if len(parts) == 1:
+            return parts[0]
+        return {name: np.concatenate([part[name] for part in parts]) for name in columns}
+
+
+def load_tick_frame(path, start=None, end=None, columns=None, session_open_hour=SESSION_OPEN_HOUR):
+    """
+    Loads historical ticks as a pandas DataFrame from either a tick store
+    directory or a processed CSV file, optionally limited to trading dates
+    within [start, end] ('YYYY-MM-DD', inclusive). CSV rows are dated with
+    session_open_hour; a store uses the dates it was written with.
+    """
+    import pandas as pd
+
+    if is_tick_store(path):
+        return pd.DataFrame(TickStore(path).load(start, end, columns))
+    df = pd.read_csv(path, usecols=columns)
+    if start is not None or end is not None:
+        days = trading_dates(df['timestamp'].to_numpy(), session_open_hour)
+        mask = np.ones(len(df), dtype=bool)
+        if start is not None:
+            mask &= days >= start
+        if end is not None:
+            mask &= days <= end
+        df = df[mask].reset_index(drop=True)
+    return df
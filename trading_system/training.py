@@ -0,0 +1,147 @@
+"""
+Training loop support: validation split, evaluation, early stopping,
+checkpoints and metrics logging.
+"""
+import json
+import os
+import random
+import time
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+from trading_system.windowing import sliding_windows
+
+
+def chronological_split(n_windows, validation_fraction, gap=0):
+    """
+    Splits window indices by time: returns (train_stop, validation_start)
+    so windows [0, train_stop) train and [validation_start, n_windows)
+    validate. `gap` windows are dropped in between because the labels of
+    the last training windows look ahead into the validation period.
+    """
+    n_validation = int(n_windows * validation_fraction)
+    if n_validation <= 0:
+        return n_windows, n_windows
+    validation_start = n_windows - n_validation
+    train_stop = max(validation_start - gap, 0)
+    if train_stop == 0:
+        raise ValueError("Not enough windows for the validation split")
+    return train_stop, validation_start
+
+
+def evaluate(model, features, labels, sequence_length, batch_size=1024):
+    """
+    Mean BCE loss and accuracy of the model over windows of `features`
+    (window k = features[k:k + sequence_length], label labels[k]), read in
+    time order.
+    """
+    windows = sliding_windows(features, sequence_length)[:len(labels)]
+    criterion = nn.BCEWithLogitsLoss(reduction='sum')
+    total_loss = 0.0
+    correct = 0
+    model.eval()
+    with torch.no_grad():
+        for start in range(0, len(labels), batch_size):
+            # Copies: the inputs may be read-only memory maps
+            x = torch.from_numpy(np.array(windows[start:start + batch_size], dtype=np.float32))
+            y = torch.from_numpy(np.array(labels[start:start + batch_size], dtype=np.float32))
+            logits = model(x)
+            total_loss += criterion(logits, y).item()
+            correct += ((logits > 0).float() == y).sum().item()
+    model.train()
+    count = max(len(labels), 1)
+    return total_loss / count, correct / count
+
+
+class EarlyStopping:
+    """
+    Tracks the best validation loss; should_stop becomes True after
+    `patience` evaluations without an improvement of more than min_delta.
+    """
+    def __init__(self, patience=3, min_delta=0.0):
+        self.patience = patience
+        self.min_delta = min_delta
+        self.best_loss = float('inf')
+        self.best_epoch = None
+        self.bad_epochs = 0
+
+    def update(self, loss, epoch):
+        """
+        Records one validation loss; returns True if it is a new best.
+        """
+        if loss < self.best_loss - self.min_delta:
+            self.best_loss = loss
+            self.best_epoch = epoch
+            self.bad_epochs = 0
+            return True
+        self.bad_epochs += 1
+        return False
+
+    @property
+    def should_stop(self):
+        return self.patience is not None and self.bad_epochs >= self.patience
+
+    def state_dict(self):
+        return {'best_loss': self.best_loss, 'best_epoch': self.best_epoch, 'bad_epochs': self.bad_epochs}
+
+    def load_state_dict(self, state):
+        self.best_loss = state['best_loss']
+        self.best_epoch = state['best_epoch']
+        self.bad_epochs = state['bad_epochs']
+
+
+def rng_state():
+    """
+    Python, NumPy and torch random generator states.
+    """
+    return {'python': random.getstate(), 'numpy': np.random.get_state(), 'torch': torch.get_rng_state()}
+
+
+def set_rng_state(state):
+    random.setstate(state['python'])
+    np.random.set_state(state['numpy'])
+    torch.set_rng_state(state['torch'])
+
+
+def save_checkpoint(path, state):
+    """
+    Writes a checkpoint atomically (a crash mid-write keeps the previous one).
+    """
+    tmp_path = f'{path}.tmp'
+    torch.save(state, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(path):
+    return torch.load(path, map_location=torch.device('cpu'), weights_only=False)
+
+
+class MetricsLog:
+    """
+    Appends one JSON object per line to `path` (a resumed run continues the file).
+    """
+    def __init__(self, path):
+        self.path = path
+
+    def write(self, **record):
+        record.setdefault('time', time.time())
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(record) + '\n')
+
+    def truncate(self, epochs_done):
+        """
+        Drops records of epochs after `epochs_done`, e.g. the epochs a resumed
+        run repeats because they ran after the last checkpoint.
+        """
+        if not os.path.exists(self.path):
+            return
+        records = [record for record in read_metrics(self.path) if record['epoch'] <= epochs_done]
+        with open(self.path, 'w') as f:
+            f.writelines(json.dumps(record) + '\n' for record in records)
+
+
+def read_metrics(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
@@ -0,0 +1,340 @@
+"""
+Vectorized trading environment: steps many TradingEnv-equivalent
+environments in one NumPy call, exposed as a Stable-Baselines3 VecEnv.
+"""
+import logging
+import time
+
+import numpy as np
+from gymnasium import spaces
+from stable_baselines3.common.callbacks import BaseCallback
+from stable_baselines3.common.vec_env.base_vec_env import VecEnv
+
+from trading_system.observation import build_observation, observation_size
+from trading_system.rl_env import ACTION_DELTAS, apply_trades, compute_env_arrays
+
+logger = logging.getLogger(__name__)
+
+
+class VecTradingEnv(VecEnv):
+    """
+    num_envs trading environments over one shared dataset.
+
+    Observations, rewards and trade accounting match TradingEnv, but each
+    environment starts at a random offset and, if episode_length is set,
+    is truncated after that many steps (otherwise it runs to the end of the
+    data). Finished environments are reset automatically, following the
+    VecEnv convention: the returned observation is the first of the next
+    episode and the final one is in info['terminal_observation'].
+
+    `data` is a DataFrame of ticks (features computed with `config`) or
+    the dict from compute_env_arrays (e.g. arrays attached from shared
+    memory).
+    """
+    def __init__(self, data, num_envs=1, window_size=50, fee=0.0001, risk_lambda=0.0,
+                 max_position=1, episode_length=None, seed=None, config=None):
+        if not (isinstance(data, dict) and 'features' in data):
+            data = compute_env_arrays(data, config)
+        self.features = data['features']
+        self.prices = data['price']
+        self.length = len(self.prices)
+        self.window_size = window_size
+        if self.length < window_size + 1:
+            raise ValueError("Need at least window_size + 1 ticks to step the environment")
+        self.fee = fee
+        self.risk_lambda = risk_lambda
+        self.max_position = max_position
+        self.episode_length = episode_length
+        obs_dim = observation_size(window_size, self.features.shape[1])
+        self.render_mode = None
+        super().__init__(
+            num_envs,
+            spaces.Box(low=-np.inf, high=np.inf, shape=(obs_dim,), dtype=np.float32),
+            spaces.Discrete(3),
+        )
+        self.rng = np.random.default_rng(seed)
+        # Offsets of the window rows relative to the current step
+        self.window_offsets = np.arange(-window_size + 1, 1)
+        self.current_step = np.zeros(num_envs, dtype=np.int64)
+        self.episode_steps = np.zeros(num_envs, dtype=np.int64)
+        self.position = np.zeros(num_envs, dtype=np.int64)
+        self.entry_price = np.zeros(num_envs)
+        self.cash = np.zeros(num_envs)
+        self.actions = None
+        self.obs = np.empty((num_envs, obs_dim), dtype=np.float32)
+
+    def _reset_envs(self, idx):
+        # Random start leaving room for at least one step (or a full episode)
+        last_start = self.length - 2
+        if self.episode_length:
+            last_start = max(self.length - 1 - self.episode_length, self.window_size - 1)
+        self.current_step[idx] = self.rng.integers(self.window_size - 1, last_start + 1, size=len(idx))
+        self.episode_steps[idx] = 0
+        self.position[idx] = 0
+        self.entry_price[idx] = 0.0
+        self.cash[idx] = 0.0
+
+    def _observe(self):
+        window = self.features[self.current_step[:, None] + self.window_offsets]
+        build_observation(window, self.position, self.entry_price, self.cash, self.max_position, out=self.obs)
+        return self.obs.copy()
+
+    def reset(self):
+        if self._seeds[0] is not None:
+            self.rng = np.random.default_rng(self._seeds[0])
+            self._reset_seeds()
+        self._reset_envs(np.arange(self.num_envs))
+        return self._observe()
+
+    def step_async(self, actions):
+        self.actions = np.asarray(actions, dtype=np.int64).reshape(self.num_envs)
+
+    def step_wait(self):
+        t = self.current_step
+        price = self.prices[t]
+        next_price = self.prices[t + 1]
+        self.position, traded, self.entry_price, self.cash = apply_trades(
+            self.position, self.entry_price, self.cash, ACTION_DELTAS[self.actions], price, self.max_position
+        )
+        rewards = (
+            self.position * (next_price - price)
+            - self.fee * np.abs(traded)
+            - self.risk_lambda * self.position ** 2
+        ).astype(np.float32)
+        self.current_step += 1
+        self.episode_steps += 1
+        end_of_data = self.current_step >= self.length - 1
+        truncated = ~end_of_data & (self.episode_steps >= (self.episode_length or np.inf))
+        dones = end_of_data | truncated
+        obs = self._observe()
+        infos = [{} for _ in range(self.num_envs)]
+        finished = np.flatnonzero(dones)
+        if len(finished):
+            for i in finished:
+                infos[i]['terminal_observation'] = obs[i].copy()
+                infos[i]['TimeLimit.truncated'] = bool(truncated[i])
+            self._reset_envs(finished)
+            obs = self._observe()
+        return obs, rewards, dones, infos
+
+    def close(self):
+        pass
+
+    def get_attr(self, attr_name, indices=None):
+        return [getattr(self, attr_name) for _ in self._get_indices(indices)]
+
+    def set_attr(self, attr_name, value, indices=None):
+        # Attributes are shared by every environment, so they can only be set for all of them
+        if sorted(set(self._get_indices(indices))) != list(range(self.num_envs)):
+            raise ValueError(f"set_attr({attr_name!r}) applies to all {self.num_envs} environments, "
+                             f"got indices {indices}")
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        method = getattr(self, method_name)
+        return [method(*method_args, **method_kwargs) for _ in self._get_indices(indices)]
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._get_indices(indices)]
+
+
+def _shard_worker(remote, parent_remote, spec, num_envs, env_kwargs, seed):
+    """
+    Runs a VecTradingEnv shard over feature arrays attached from shared memory.
+    """
+    from trading_system.shared_arrays import SharedArrays
+
+    parent_remote.close()
+    shared = SharedArrays.attach(spec)
+    data = dict(shared.arrays)
+    env = VecTradingEnv(data, num_envs=num_envs, seed=seed, **env_kwargs)
+    try:
+        while True:
+            cmd, payload = remote.recv()
+            if cmd == 'step':
+                env.step_async(payload)
+                remote.send(env.step_wait())
+            elif cmd == 'reset':
+                if payload is not None:
+                    env.seed(payload)
+                remote.send(env.reset())
+            elif cmd == 'get_attr':
+                remote.send(getattr(env, payload))
+            elif cmd == 'set_attr':
+                setattr(env, *payload)
+                remote.send(None)
+            elif cmd == 'env_method':
+                name, args, kwargs = payload
+                remote.send(getattr(env, name)(*args, **kwargs))
+            elif cmd == 'close':
+                break
+    except (KeyboardInterrupt, EOFError):
+        pass
+    finally:
+        env = None
+        data = None
+        shared.close()
+        remote.close()
+
+
+class SubprocTradingEnv(VecEnv):
+    """
+    VecTradingEnv split across worker processes.
+
+    The feature arrays are placed in shared memory once; each of
+    num_workers processes attaches to them (no per-worker copy of the data)
+    and steps its own shard of the num_envs environments with the batched
+    VecTradingEnv logic. Observations, rewards and infos are concatenated
+    in environment order. close() stops the workers and frees the shared
+    memory.
+    """
+    def __init__(self, data, num_envs=1, num_workers=None, seed=None, start_method=None, **env_kwargs):
+        import multiprocessing as mp
+        from trading_system.shared_arrays import SharedArrays
+
+        config = env_kwargs.pop('config', None)
+        if not (isinstance(data, dict) and 'features' in data):
+            data = compute_env_arrays(data, config)
+        num_workers = min(num_workers or mp.cpu_count(), num_envs)
+        self.shard_sizes = [len(shard) for shard in np.array_split(np.arange(num_envs), num_workers)]
+        self.shared = SharedArrays.create({'features': data['features'], 'price': data['price']})
+        ctx = mp.get_context(start_method or ('forkserver' if 'forkserver' in mp.get_all_start_methods() else 'spawn'))
+        self.remotes, self.processes = [], []
+        base_seed = seed if seed is not None else int(np.random.randint(0, 2 ** 31 - 1))
+        for i, size in enumerate(self.shard_sizes):
+            remote, work_remote = ctx.Pipe()
+            process = ctx.Process(
+                target=_shard_worker,
+                args=(work_remote, remote, self.shared.spec, size, env_kwargs, base_seed + i),
+                daemon=True,
+            )
+            process.start()
+            work_remote.close()
+            self.remotes.append(remote)
+            self.processes.append(process)
+        self.closed = False
+        self.actions = None
+        window_size = env_kwargs.get('window_size', 50)
+        obs_dim = observation_size(window_size, data['features'].shape[1])
+        self.render_mode = None
+        super().__init__(
+            num_envs,
+            spaces.Box(low=-np.inf, high=np.inf, shape=(obs_dim,), dtype=np.float32),
+            spaces.Discrete(3),
+        )
+
+    def reset(self):
+        # Each shard is seeded with the seed of its first environment
+        starts = np.cumsum([0] + self.shard_sizes[:-1])
+        for remote, start in zip(self.remotes, starts):
+            remote.send(('reset', self._seeds[start]))
+        self._reset_seeds()
+        return np.concatenate([remote.recv() for remote in self.remotes])
+
+    def step_async(self, actions):
+        actions = np.asarray(actions).reshape(self.num_envs)
+        start = 0
+        for remote, size in zip(self.remotes, self.shard_sizes):
+            remote.send(('step', actions[start:start + size]))
+            start += size
+
+    def step_wait(self):
+        results = [remote.recv() for remote in self.remotes]
+        obs, rewards, dones, infos = zip(*results)
+        return np.concatenate(obs), np.concatenate(rewards), np.concatenate(dones), [i for shard in infos for i in shard]
+
+    def close(self):
+        if self.closed:
+            return
+        for remote in self.remotes:
+            remote.send(('close', None))
+        for process in self.processes:
+            process.join()
+        self.shared.unlink()
+        self.closed = True
+
+    def _shard_values(self, cmd, payload, indices):
+        # One value per environment, gathered from the shard workers
+        values = []
+        for remote, size in zip(self.remotes, self.shard_sizes):
+            remote.send((cmd, payload))
+            values.extend([remote.recv()] * size)
+        return [values[i] for i in self._get_indices(indices)]
+
+    def get_attr(self, attr_name, indices=None):
+        return self._shard_values('get_attr', attr_name, indices)
+
+    def set_attr(self, attr_name, value, indices=None):
+        # Applied per shard: indices must cover whole shards (see VecTradingEnv.set_attr)
+        selected = set(self._get_indices(indices))
+        targets = []
+        start = 0
+        for remote, size in zip(self.remotes, self.shard_sizes):
+            covered = len(selected.intersection(range(start, start + size)))
+            if covered == size:
+                targets.append(remote)
+            elif covered:
+                raise ValueError(f"set_attr({attr_name!r}) applies to whole shards of environments "
+                                 f"{self.shard_sizes}, got indices {indices}")
+            start += size
+        for remote in targets:
+            remote.send(('set_attr', (attr_name, value)))
+        for remote in targets:
+            remote.recv()
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        return self._shard_values('env_method', (method_name, method_args, method_kwargs), indices)
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._get_indices(indices)]
+
+
+def make_trading_vec_env(data, num_envs=1, backend='native', num_workers=None, seed=None, **env_kwargs):
+    """
+    Builds the training VecEnv: 'native' steps all environments in this
+    process, 'subproc' shards them across worker processes.
+    """
+    if backend == 'native':
+        return VecTradingEnv(data, num_envs=num_envs, seed=seed, **env_kwargs)
+    if backend == 'subproc':
+        return SubprocTradingEnv(data, num_envs=num_envs, num_workers=num_workers, seed=seed, **env_kwargs)
+    raise ValueError(f"Unknown vec env backend: {backend}")
+
+
+class ThroughputCallback(BaseCallback):
+    """
+    Logs training throughput: env-steps/sec and wall-clock seconds per
+    `report_every` timesteps, plus totals when training ends (also kept in
+    `steps_per_sec` and `elapsed_sec`).
+    """
+    def __init__(self, report_every=100_000, verbose=0):
+        super().__init__(verbose)
+        self.report_every = report_every
+        self.steps_per_sec = None
+        self.elapsed_sec = None
+
+    def _on_training_start(self):
+        self.start_time = self.last_time = time.perf_counter()
+        self.start_steps = self.last_steps = self.num_timesteps
+
+    def _on_step(self):
+        steps = self.num_timesteps - self.last_steps
+        if steps >= self.report_every:
+            now = time.perf_counter()
+            elapsed = now - self.last_time
+            logger.info(
+                f"{self.num_timesteps} timesteps: {steps / elapsed:.0f} env-steps/sec, "
+                f"{elapsed * self.report_every / steps:.1f}s per {self.report_every} timesteps"
+            )
+            self.last_time, self.last_steps = now, self.num_timesteps
+        return True
+
+    def _on_training_end(self):
+        self.elapsed_sec = time.perf_counter() - self.start_time
+        steps = self.num_timesteps - self.start_steps
+        self.steps_per_sec = steps / self.elapsed_sec if self.elapsed_sec > 0 else float('inf')
+        per_report = self.elapsed_sec * self.report_every / steps if steps else float('nan')
+        logger.info(
+            f"Trained {steps} timesteps in {self.elapsed_sec:.1f}s: {self.steps_per_sec:.0f} env-steps/sec, "
+            f"{per_report:.1f}s per {self.report_every} timesteps"
+        )
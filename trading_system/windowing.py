@@ -0,0 +1,72 @@
+"""
+Sliding-window sequence construction for sequence model training.
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def sliding_windows(features, sequence_length):
+    """
+    Returns a read-only strided view of shape
+    (n_rows - sequence_length + 1, sequence_length, n_features) over a 2-D
+    feature matrix. Window k covers rows k..k + sequence_length - 1; no
+    feature data is copied.
+    """
+    features = np.ascontiguousarray(features)
+    if features.ndim != 2:
+        raise ValueError("features must be a 2-D (rows, features) matrix")
+    if len(features) < sequence_length:
+        return np.empty((0, sequence_length, features.shape[1]), dtype=features.dtype)
+    # sliding_window_view puts the window axis last; swap it in front of features
+    return sliding_window_view(features, sequence_length, axis=0).transpose(0, 2, 1)
+
+
+def horizon_labels(prices, n_shift):
+    """
+    Returns float32 labels where entry t is 1.0 if prices[t + n_shift] >
+    prices[t], else 0.0, for t in 0..len(prices) - n_shift - 1.
+    """
+    prices = np.asarray(prices)
+    n = len(prices) - n_shift
+    if n <= 0:
+        return np.empty(0, dtype=np.float32)
+    return (prices[n_shift:] > prices[:n]).astype(np.float32)
+
+
+def build_sequences(features, prices, sequence_length, n_shift):
+    """
+    Builds (windows, labels) for up/down classification over a prediction
+    horizon of n_shift rows.
+
+    windows[k] ends at row t = k + sequence_length - 1 and labels[k] tells
+    whether the price n_shift rows after t is above the price at t. Windows
+    are a strided view over `features`, so memory stays at one copy of the
+    feature matrix regardless of sequence_length.
+    """
+    windows = sliding_windows(features, sequence_length)
+    labels = horizon_labels(prices, n_shift)[sequence_length - 1:]
+    count = max(min(len(windows), len(labels)), 0)
+    return windows[:count], labels[:count]
+
+
+class WindowDataset:
+    """
+    Map-style dataset over strided windows and labels.
+
+    Indexing with an integer returns one (window, label) pair; indexing with
+    a sequence of indices gathers a whole batch in one copy, so it can be
+    used with a BatchSampler and DataLoader(batch_size=None).
+    """
+    def __init__(self, windows, labels):
+        if len(windows) != len(labels):
+            raise ValueError("windows and labels must have the same length")
+        self.windows = windows
+        self.labels = labels
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __getitem__(self, index):
+        if not np.isscalar(index):
+            index = np.asarray(index)
+        return self.windows[index], self.labels[index]